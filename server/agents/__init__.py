@@ -5,4 +5,8 @@ This package contains specialized AI agents for different aspects of the ScioScr
 - dataclean: Data cleaning and processing agents
 - planning: Experiment planning agents  
 - analysis: Data analysis and visualization agents
+
+Shared modules:
+- profiling: Bulk per-column statistics used by the analysis and dataclean agents
+- llm_cache: Content-addressed cache of LLM responses for repeated prompts
 """
\ No newline at end of file
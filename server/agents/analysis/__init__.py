@@ -14,6 +14,7 @@ The agent follows a 6-node pipeline:
 """
 
 from .agent import AnalysisAgent, AnalysisState, ChartSpecification, create_analysis_agent
+from .dataset import DatasetHandle
 from .config import (
     AnalysisAgentConfig,
     load_config_from_env,
@@ -30,6 +31,7 @@ __all__ = [
     "AnalysisState", 
     "ChartSpecification",
     "create_analysis_agent",
+    "DatasetHandle",
     
     # Configuration
     "AnalysisAgentConfig",
@@ -26,9 +26,13 @@ from dataclasses import dataclass, asdict
 
 from dotenv import load_dotenv
 from langchain.chat_models import init_chat_model
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 
+from ..llm_cache import with_response_cache
+from .dataset import DatasetHandle
+
 # Import modular nodes
 from .nodes import (
     InputLoaderNode,
@@ -88,8 +92,9 @@ class AnalysisState(TypedDict):
     - messages: Conversation history and agent communications
     - user_prompt: Original analytical question or visualization request
     - experiment_plan_content: Experiment plan content as text
-    - csv_data_content: CSV data content as text
+    - csv_data_content: CSV data content as text (cleared once parsed)
     - memory: Context for iterative refinement and learning
+    - dataset: Parsed dataset handle shared by all later specialists
     
     Research Methodology Analyst → Statistical Data Profiling Expert:
     - plan_text: Raw experiment plan content for context
@@ -119,6 +124,7 @@ class AnalysisState(TypedDict):
     experiment_plan_content: str
     csv_data_content: str
     memory: Dict[str, Any]
+    dataset: Optional[DatasetHandle]
     plan_text: str
     structured_plan: Dict[str, Any]
     data_schema: Dict[str, Any]
@@ -222,9 +228,10 @@ class AnalysisAgent:
             }
         )
         
-        # Experiment Plan Analyst
+        # Experiment Plan Analyst (plan extraction is repeated verbatim for
+        # the same plan and request, so its responses are cached)
         self.plan_parser = PlanParserNode(
-            llm=self.llm,
+            llm=with_response_cache(self.llm),
             role_context={
                 "role": "Research Methodology Analyst",
                 "goal": "Extract and structure experimental context to guide visualization decisions",
@@ -281,13 +288,21 @@ class AnalysisAgent:
         """Build the LangGraph 6-node visualization pipeline"""
         graph_builder = StateGraph(AnalysisState)
         
-        # Add the 6 nodes using modular implementations
-        graph_builder.add_node("input_loader", self._input_loader_wrapper)
-        graph_builder.add_node("plan_parser", self._plan_parser_wrapper)
-        graph_builder.add_node("data_profiler", self._data_profiler_wrapper)
-        graph_builder.add_node("chart_chooser", self._chart_chooser_wrapper)
-        graph_builder.add_node("renderer", self._renderer_wrapper)
-        graph_builder.add_node("response_composer", self._response_composer_wrapper)
+        # Add the 6 nodes using modular implementations. Each node has a sync
+        # wrapper (used by invoke/stream) and an async wrapper (used by
+        # ainvoke/astream) that runs the node off the event loop.
+        graph_builder.add_node("input_loader", RunnableLambda(
+            self._input_loader_wrapper, afunc=self._ainput_loader_wrapper, name="input_loader"))
+        graph_builder.add_node("plan_parser", RunnableLambda(
+            self._plan_parser_wrapper, afunc=self._aplan_parser_wrapper, name="plan_parser"))
+        graph_builder.add_node("data_profiler", RunnableLambda(
+            self._data_profiler_wrapper, afunc=self._adata_profiler_wrapper, name="data_profiler"))
+        graph_builder.add_node("chart_chooser", RunnableLambda(
+            self._chart_chooser_wrapper, afunc=self._achart_chooser_wrapper, name="chart_chooser"))
+        graph_builder.add_node("renderer", RunnableLambda(
+            self._renderer_wrapper, afunc=self._arenderer_wrapper, name="renderer"))
+        graph_builder.add_node("response_composer", RunnableLambda(
+            self._response_composer_wrapper, afunc=self._aresponse_composer_wrapper, name="response_composer"))
         
         # Add edges - linear pipeline
         graph_builder.add_edge(START, "input_loader")
@@ -379,6 +394,42 @@ class AnalysisAgent:
         
         return result
     
+    # Async coordination methods (used by ainvoke/astream)
+    async def _ainput_loader_wrapper(self, state: AnalysisState) -> Dict[str, Any]:
+        """Async counterpart of _input_loader_wrapper"""
+        logger.info("🔍 Input Validation Specialist: Ensuring data integrity and experiment plan validity")
+        return await self.input_loader.aprocess(state)
+    
+    async def _aplan_parser_wrapper(self, state: AnalysisState) -> Dict[str, Any]:
+        """Async counterpart of _plan_parser_wrapper"""
+        logger.info("📋 Research Methodology Analyst: Extracting experimental context and research objectives")
+        return await self.plan_parser.aprocess(state)
+    
+    async def _adata_profiler_wrapper(self, state: AnalysisState) -> Dict[str, Any]:
+        """Async counterpart of _data_profiler_wrapper"""
+        logger.info("📊 Statistical Data Profiling Expert: Analyzing dataset structure and statistical properties")
+        return await self.data_profiler.aprocess(state)
+    
+    async def _achart_chooser_wrapper(self, state: AnalysisState) -> Dict[str, Any]:
+        """Async counterpart of _chart_chooser_wrapper"""
+        logger.info("🎨 Visualization Design Strategist: Selecting optimal chart specification and design approach")
+        return await self.chart_chooser.aprocess(state)
+    
+    async def _arenderer_wrapper(self, state: AnalysisState) -> Dict[str, Any]:
+        """Async counterpart of _renderer_wrapper"""
+        logger.info("⚡ Plotly Code Generation Expert: Generating interactive visualization code")
+        result = await self.renderer.aprocess(state)
+        logger.info(f"📊 Renderer returned HTML content length: {len(result.get('html_content', ''))}")
+        return result
+    
+    async def _aresponse_composer_wrapper(self, state: AnalysisState) -> Dict[str, Any]:
+        """Async counterpart of _response_composer_wrapper"""
+        logger.info("✍️ Scientific Communication Expert: Crafting insightful explanations and managing context")
+        logger.info(f"📊 Response composer received HTML content length: {len(state.get('html_content', ''))}")
+        result = await self.response_composer.aprocess(state)
+        logger.info(f"📊 Response composer returning HTML content length: {len(result.get('html_content', ''))}")
+        return result
+    
     def _build_specific_response_message(self,
                                        user_prompt: str,
                                        chart_spec: Dict[str, Any],
@@ -501,12 +552,57 @@ class AnalysisAgent:
         logger.info("🚀 Initializing specialized agent coordination pipeline")
         
         # Initialize comprehensive state with clear objectives for each agent
-        initial_state = {
+        initial_state = self._build_initial_state(user_prompt, experiment_plan_content, csv_data_content, memory)
+        
+        # Execute coordinated agent pipeline
+        logger.info("🔄 Executing specialized agent coordination pipeline")
+        result = self.graph.invoke(initial_state)
+        
+        return self._build_result(user_prompt, result)
+    
+    async def agenerate_visualization(self,
+                                      user_prompt: str,
+                                      experiment_plan_content: str,
+                                      csv_data_content: str,
+                                      memory: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Async version of generate_visualization for use inside the API server
+        
+        Runs the graph with ainvoke so every node executes on a bounded worker
+        pool instead of the event loop; concurrent requests and WebSocket
+        traffic keep being served while LLM calls and the sandbox run.
+        
+        Args:
+            user_prompt: Natural language analytical question or visualization request
+            experiment_plan_content: Experiment plan content as text
+            csv_data_content: CSV data content as text for analysis
+            memory: Optional memory object for iterative refinement and context retention
+            
+        Returns:
+            Same dictionary as generate_visualization
+        """
+        logger.info(f"🎯 MISSION: Generating publication-quality visualization for: {user_prompt}")
+        
+        initial_state = self._build_initial_state(user_prompt, experiment_plan_content, csv_data_content, memory)
+        
+        logger.info("🔄 Executing specialized agent coordination pipeline (async)")
+        result = await self.graph.ainvoke(initial_state)
+        
+        return self._build_result(user_prompt, result)
+    
+    def _build_initial_state(self,
+                             user_prompt: str,
+                             experiment_plan_content: str,
+                             csv_data_content: str,
+                             memory: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the initial graph state for a visualization request"""
+        return {
             "messages": [],
             "user_prompt": user_prompt,
             "experiment_plan_content": experiment_plan_content,
             "csv_data_content": csv_data_content,
             "memory": memory or {},
+            "dataset": None,
             "plan_text": "",
             "structured_plan": {},
             "data_schema": {},
@@ -521,11 +617,9 @@ class AnalysisAgent:
             "explanation": "",
             "error_message": ""
         }
-        
-        # Execute coordinated agent pipeline
-        logger.info("🔄 Executing specialized agent coordination pipeline")
-        result = self.graph.invoke(initial_state)
-        
+    
+    def _build_result(self, user_prompt: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the visualization result from the final graph state"""
         # Build specific response message based on agent state
         html_content = result.get("html_content", "")
         chart_spec = result.get("chart_specification", {})
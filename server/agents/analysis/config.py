@@ -7,7 +7,7 @@ for the LangGraph-based visualization agent.
 
 import os
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -30,6 +30,17 @@ class AnalysisAgentConfig:
     enable_streaming: bool = True
     enable_debug: bool = False
     
+    # Async execution settings (worker pools used by ainvoke/astream)
+    max_io_workers: int = 16
+    max_cpu_workers: int = field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    
+    # Sandbox settings (warm worker pool used by the sandbox runner)
+    sandbox_pool_enabled: bool = True
+    sandbox_pool_size: int = field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    sandbox_max_jobs_per_worker: int = 50
+    sandbox_timeout_seconds: int = 5
+    sandbox_memory_limit_mb: int = 2048
+    
     # Visualization settings
     max_csv_size_mb: int = 50
     plot_width: int = 10
@@ -58,6 +69,15 @@ class AnalysisAgentConfig:
         if self.max_iterations < 1:
             raise ValueError("Max iterations must be at least 1")
         
+        if self.max_io_workers < 1 or self.max_cpu_workers < 1:
+            raise ValueError("Worker pool sizes must be at least 1")
+        
+        if self.sandbox_pool_size < 1 or self.sandbox_max_jobs_per_worker < 1:
+            raise ValueError("Sandbox pool size and jobs per worker must be at least 1")
+        
+        if self.sandbox_timeout_seconds < 1 or self.sandbox_memory_limit_mb < 64:
+            raise ValueError("Sandbox timeout must be at least 1s and memory limit at least 64MB")
+        
         if self.max_csv_size_mb < 1:
             raise ValueError("Max CSV size must be at least 1MB")
         
@@ -100,6 +120,17 @@ def load_config_from_env() -> AnalysisAgentConfig:
     config.enable_streaming = os.getenv("ANALYSIS_ENABLE_STREAMING", "true").lower() == "true"
     config.enable_debug = os.getenv("ANALYSIS_ENABLE_DEBUG", "false").lower() == "true"
     
+    # Async execution settings
+    config.max_io_workers = int(os.getenv("ANALYSIS_MAX_IO_WORKERS", str(config.max_io_workers)))
+    config.max_cpu_workers = int(os.getenv("ANALYSIS_MAX_CPU_WORKERS", str(config.max_cpu_workers)))
+    
+    # Sandbox settings
+    config.sandbox_pool_enabled = os.getenv("ANALYSIS_SANDBOX_POOL_ENABLED", "true").lower() == "true"
+    config.sandbox_pool_size = int(os.getenv("ANALYSIS_SANDBOX_POOL_SIZE", str(config.sandbox_pool_size)))
+    config.sandbox_max_jobs_per_worker = int(os.getenv("ANALYSIS_SANDBOX_MAX_JOBS_PER_WORKER", str(config.sandbox_max_jobs_per_worker)))
+    config.sandbox_timeout_seconds = int(os.getenv("ANALYSIS_SANDBOX_TIMEOUT", str(config.sandbox_timeout_seconds)))
+    config.sandbox_memory_limit_mb = int(os.getenv("ANALYSIS_SANDBOX_MEMORY_LIMIT_MB", str(config.sandbox_memory_limit_mb)))
+    
     # Visualization settings
     config.max_csv_size_mb = int(os.getenv("ANALYSIS_MAX_CSV_SIZE_MB", str(config.max_csv_size_mb)))
     config.plot_width = int(os.getenv("ANALYSIS_PLOT_WIDTH", str(config.plot_width)))
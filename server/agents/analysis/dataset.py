@@ -0,0 +1,160 @@
+"""
+Dataset Handle for the Analysis Agent
+
+The analysis graph receives the dataset as CSV text. The input loader parses it
+once into a DatasetHandle, which is shared by all later nodes through the
+analysis state instead of each node re-parsing the CSV string. The handle
+holds the DataFrame, its schema and lazily computed, cached summary
+statistics.
+
+The frame is shared between nodes and must be treated as read-only; copy it
+before modifying.
+"""
+
+import io
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ..profiling import profile_frame
+
+
+class DatasetHandle:
+    """Parsed dataset shared across the analysis pipeline"""
+
+    def __init__(self, frame: pd.DataFrame, source_size_bytes: int = 0):
+        """
+        Initialize the handle
+
+        Args:
+            frame: Parsed dataset
+            source_size_bytes: Size of the CSV text the frame was parsed from
+        """
+        self.frame = frame
+        self.source_size_bytes = source_size_bytes
+        self._cache: Dict[str, Any] = {}
+
+    @classmethod
+    def from_csv(cls, csv_content: str) -> "DatasetHandle":
+        """
+        Parse CSV text into a handle
+
+        Args:
+            csv_content: CSV data content as text
+
+        Returns:
+            DatasetHandle wrapping the parsed frame
+        """
+        # Parse from UTF-8 bytes: io.StringIO would hold the whole text as
+        # 4-byte code points, quadrupling the transient memory of the parse
+        data = csv_content.encode('utf-8')
+        return cls(pd.read_csv(io.BytesIO(data)), len(data))
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows"""
+        return len(self.frame)
+
+    @property
+    def column_count(self) -> int:
+        """Number of columns"""
+        return len(self.frame.columns)
+
+    @property
+    def size_mb(self) -> float:
+        """Size of the source CSV in megabytes"""
+        return self.source_size_bytes / (1024 * 1024)
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names"""
+        return list(self.frame.columns)
+
+    @property
+    def dtypes(self) -> Dict[str, str]:
+        """Column dtypes as strings"""
+        if "dtypes" not in self._cache:
+            self._cache["dtypes"] = self.frame.dtypes.astype(str).to_dict()
+        return self._cache["dtypes"]
+
+    def sample(self, n: int = 5) -> List[Dict[str, Any]]:
+        """First `n` rows as records"""
+        return self.frame.head(n).to_dict('records')
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Column types and summary statistics (computed once, then cached)
+
+        Returns:
+            Data schema with row/column counts and per-column statistics
+        """
+        if "summary" not in self._cache:
+            self._cache["summary"] = self._compute_summary()
+        return self._cache["summary"]
+
+    def to_csv(self) -> str:
+        """Serialize the frame back to CSV text (cached)"""
+        if "csv" not in self._cache:
+            self._cache["csv"] = self.frame.to_csv(index=False)
+        return self._cache["csv"]
+
+    def _compute_summary(self) -> Dict[str, Any]:
+        """Analyze column types and statistics in one bulk profiling pass"""
+        profile = profile_frame(self.frame, first_k=10, top_k=0)
+        data_schema = {
+            "columns": {},
+            "row_count": profile.row_count,
+            "column_count": profile.column_count
+        }
+
+        for col, stats in profile.columns.items():
+            col_info = {
+                "type": stats.dtype,
+                "non_null_count": stats.count,
+                "null_count": stats.null_count,
+                "unique_count": stats.distinct_count
+            }
+
+            # Add type-specific statistics
+            if stats.kind == "numeric":
+                empty = profile.row_count == 0
+                col_info.update({
+                    "mean": 0 if empty else stats.mean,
+                    "std": 0 if empty else stats.std,
+                    "min": 0 if empty else stats.min,
+                    "max": 0 if empty else stats.max,
+                    "data_type": "numeric"
+                })
+            elif stats.kind == "categorical":
+                col_info.update({
+                    "unique_values": stats.first_values,  # First 10 unique values
+                    "data_type": "categorical"
+                })
+            else:
+                col_info["data_type"] = "other"
+
+            data_schema["columns"][col] = col_info
+
+        return data_schema
+
+
+def text_size_bytes(text: str) -> int:
+    """UTF-8 size of a string without encoding a copy of ASCII text"""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def get_dataset(state: Dict[str, Any]) -> Optional[DatasetHandle]:
+    """
+    Get the dataset handle from an analysis state, parsing the CSV text only
+    if the input loader has not produced a handle (e.g. a node run standalone)
+
+    Args:
+        state: Analysis state
+
+    Returns:
+        DatasetHandle, or None if the state holds no data
+    """
+    dataset = state.get("dataset")
+    if dataset is None and state.get("csv_data_content"):
+        dataset = DatasetHandle.from_csv(state["csv_data_content"])
+    return dataset
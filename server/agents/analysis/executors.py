@@ -0,0 +1,93 @@
+"""
+Node Executors for the Analysis Agent
+
+This module provides the bounded worker pools used when the analysis graph runs
+in async mode (ainvoke/astream). Node work is synchronous (LLM round trips,
+pandas parsing, sandbox subprocesses), so each node is dispatched to a worker
+thread instead of running on the event loop:
+
+- I/O pool: LLM-bound nodes that mostly wait on the network
+- CPU pool: data parsing, profiling and sandbox execution, sized to the machine
+  so concurrent requests cannot oversubscribe the CPU
+
+Pool sizes come from the analysis configuration (ANALYSIS_MAX_IO_WORKERS and
+ANALYSIS_MAX_CPU_WORKERS).
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .config import load_config_from_env
+
+logger = logging.getLogger(__name__)
+
+_executor_lock = threading.Lock()
+_io_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_node_executor(cpu_bound: bool = False) -> ThreadPoolExecutor:
+    """
+    Get the shared executor for a class of node work
+
+    Args:
+        cpu_bound: Whether the work is CPU-bound (parsing, profiling, sandbox)
+
+    Returns:
+        ThreadPoolExecutor: The bounded pool for that work class
+    """
+    global _io_executor, _cpu_executor
+
+    with _executor_lock:
+        if cpu_bound:
+            if _cpu_executor is None:
+                workers = load_config_from_env().max_cpu_workers
+                _cpu_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-cpu")
+                logger.info(f"Initialized analysis CPU pool with {workers} workers")
+            return _cpu_executor
+
+        if _io_executor is None:
+            workers = load_config_from_env().max_io_workers
+            _io_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-io")
+            logger.info(f"Initialized analysis I/O pool with {workers} workers")
+        return _io_executor
+
+
+async def run_in_node_executor(func: Callable[..., Any], *args: Any, cpu_bound: bool = False) -> Any:
+    """
+    Run a synchronous node function on a worker pool without blocking the event loop
+
+    The caller's context variables (LangChain callbacks, tracing) are carried
+    over to the worker thread.
+
+    Args:
+        func: Synchronous function to run
+        *args: Positional arguments for the function
+        cpu_bound: Whether to use the CPU pool instead of the I/O pool
+
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_node_executor(cpu_bound),
+        functools.partial(context.run, func, *args)
+    )
+
+
+def shutdown_node_executors(wait: bool = True) -> None:
+    """Shut down the shared node executors (e.g. on application shutdown)"""
+    global _io_executor, _cpu_executor
+
+    with _executor_lock:
+        for executor in (_io_executor, _cpu_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        _io_executor = None
+        _cpu_executor = None
@@ -9,6 +9,8 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 
+from ..executors import run_in_node_executor
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -19,8 +21,15 @@ class BaseNode(ABC):
     
     Provides common functionality and enforces consistent interface
     for all nodes in the analysis pipeline.
+    
+    Nodes implement the synchronous ``process``; ``aprocess`` is used when the
+    graph runs in async mode and dispatches ``process`` to a worker pool.
+    Subclasses doing CPU-heavy work set ``cpu_bound = True``.
     """
     
+    # Whether async execution should use the bounded CPU pool
+    cpu_bound: bool = False
+    
     def __init__(self, llm: Optional[Any] = None, role_context: Optional[Dict[str, Any]] = None):
         """
         Initialize the base node
@@ -46,6 +55,18 @@ class BaseNode(ABC):
         """
         pass
     
+    async def aprocess(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process the state without blocking the event loop
+        
+        Args:
+            state: Current analysis state
+            
+        Returns:
+            Dictionary containing state updates
+        """
+        return await run_in_node_executor(self.process, state, cpu_bound=self.cpu_bound)
+    
     def log_info(self, message: str):
         """Log info message with node name prefix"""
         logger.info(f"{self.node_name}: {message}")
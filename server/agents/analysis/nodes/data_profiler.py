@@ -1,24 +1,25 @@
 """
 Data Profiler Node for Analysis Agent
 
-This module implements the data profiler node that loads CSV data from text content
-and analyzes their structure, types, and summary statistics.
+This module implements the data profiler node that analyzes the structure, types,
+and summary statistics of the dataset parsed by the input loader.
 """
 
-import io
-import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any
 
 from .base_node import BaseNode
+from ..dataset import get_dataset
 
 
 class DataProfilerNode(BaseNode):
     """
     Data Profiler Node
     
-    Loads CSV from text content and analyzes structure, types, and summary statistics.
+    Analyzes dataset structure, types, and summary statistics.
     """
     
+    cpu_bound = True
+    
     def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process data profiling and analysis
@@ -35,48 +36,17 @@ class DataProfilerNode(BaseNode):
             return {"data_schema": {}, "data_sample": []}
         
         try:
-            # Load CSV from text content into pandas
-            csv_content = state["csv_data_content"]
-            df = pd.read_csv(io.StringIO(csv_content))
-            self.log_info(f"Loaded CSV with {len(df)} rows, {len(df.columns)} columns")
-            
-            # Analyze column types and statistics
-            data_schema = {
-                "columns": {},
-                "row_count": len(df),
-                "column_count": len(df.columns)
-            }
+            # Use the dataset parsed by the input loader
+            dataset = get_dataset(state)
+            if dataset is None:
+                raise ValueError("No dataset available for profiling")
+            self.log_info(f"Profiling dataset with {dataset.row_count} rows, {dataset.column_count} columns")
             
-            for col in df.columns:
-                col_info = {
-                    "type": str(df[col].dtype),
-                    "non_null_count": df[col].count(),
-                    "null_count": df[col].isnull().sum(),
-                    "unique_count": df[col].nunique()
-                }
-                
-                # Add type-specific statistics
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    col_info.update({
-                        "mean": float(df[col].mean()) if not df[col].empty else 0,
-                        "std": float(df[col].std()) if not df[col].empty else 0,
-                        "min": float(df[col].min()) if not df[col].empty else 0,
-                        "max": float(df[col].max()) if not df[col].empty else 0,
-                        "data_type": "numeric"
-                    })
-                elif pd.api.types.is_categorical_dtype(df[col]) or df[col].dtype == 'object':
-                    col_info.update({
-                        "unique_values": df[col].unique().tolist()[:10],  # First 10 unique values
-                        "data_type": "categorical"
-                    })
-                else:
-                    col_info["data_type"] = "other"
-                
-                data_schema["columns"][col] = col_info
+            # Analyze column types and statistics (cached on the handle)
+            data_schema = dataset.summary()
             
             # Get sample data
-            sample_size = min(5, len(df))
-            data_sample = df.head(sample_size).to_dict('records')
+            data_sample = dataset.sample(5)
             
             self.log_info(f"Generated schema for {len(data_schema['columns'])} columns")
             
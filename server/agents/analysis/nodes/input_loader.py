@@ -3,13 +3,13 @@ Input Loader Node for Analysis Agent
 
 This module implements the input loader node that validates experiment plan
 and CSV data content, performing immediate validation and failing fast on errors.
+The CSV is parsed here once; later nodes share the resulting dataset handle.
 """
 
-import io
-import pandas as pd
 from typing import Dict, Any
 
 from .base_node import BaseNode
+from ..dataset import DatasetHandle, text_size_bytes
 
 # Constants
 MAX_CSV_SIZE_MB = 50
@@ -21,8 +21,11 @@ class InputLoaderNode(BaseNode):
     
     Validates experiment plan content and CSV data content.
     Performs immediate validation and fails fast on errors.
+    Produces the dataset handle used by the rest of the pipeline.
     """
     
+    cpu_bound = True
+    
     def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process input validation and loading
@@ -31,7 +34,7 @@ class InputLoaderNode(BaseNode):
             state: Current analysis state
             
         Returns:
-            Dictionary containing plan text and error status
+            Dictionary containing plan text, dataset handle and error status
         """
         self.log_info("Starting content validation")
         
@@ -49,23 +52,26 @@ class InputLoaderNode(BaseNode):
                 raise ValueError("CSV data content is empty or invalid")
             
             # Check CSV content size
-            csv_size_mb = len(csv_content.encode('utf-8')) / (1024 * 1024)
+            csv_size_mb = text_size_bytes(csv_content) / (1024 * 1024)
             if csv_size_mb > MAX_CSV_SIZE_MB:
                 raise ValueError(f"CSV content too large: {csv_size_mb:.1f}MB (max: {MAX_CSV_SIZE_MB}MB)")
             
-            # Validate CSV format by attempting to parse it
+            # Validate CSV format by parsing it (the only parse in the pipeline)
             try:
-                df = pd.read_csv(io.StringIO(csv_content))
-                if df.empty:
+                dataset = DatasetHandle.from_csv(csv_content)
+                if dataset.frame.empty:
                     raise ValueError("CSV content produces empty dataframe")
-                if len(df.columns) == 0:
+                if dataset.column_count == 0:
                     raise ValueError("CSV content has no columns")
-                self.log_info(f"Validated CSV content ({len(df)} rows, {len(df.columns)} columns, {csv_size_mb:.1f}MB)")
+                self.log_info(f"Validated CSV content ({dataset.row_count} rows, {dataset.column_count} columns, {csv_size_mb:.1f}MB)")
             except Exception as e:
                 raise ValueError(f"Invalid CSV format: {str(e)}")
             
             return {
                 "plan_text": plan_content,
+                "dataset": dataset,
+                # The text is no longer needed once parsed; don't carry it through the graph
+                "csv_data_content": "",
                 "error_message": ""
             }
             
@@ -13,7 +13,7 @@ import os
 from typing import Dict, Any, List, Annotated, Optional
 from typing_extensions import TypedDict
 
-import pandas as pd
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 
@@ -21,6 +21,8 @@ from .base_node import BaseNode
 from .draft_or_fix_code import DraftOrFixCodeNode
 from .sandbox_runner import SandboxRunnerNode
 from .output_assembler import OutputAssemblerNode
+from ..dataset import get_dataset
+from ..executors import run_in_node_executor
 
 # Constants
 MAX_RETRIES = 3
@@ -84,10 +86,13 @@ class RendererNode(BaseNode):
         """Build the 3-node renderer graph with conditional edges"""
         graph_builder = StateGraph(RendererState)
         
-        # Add nodes
-        graph_builder.add_node("draft_or_fix_code", self._draft_or_fix_wrapper)
-        graph_builder.add_node("sandbox_runner", self._sandbox_runner_wrapper)
-        graph_builder.add_node("output_assembler", self._output_assembler_wrapper)
+        # Add nodes (sync wrappers for invoke, async wrappers for ainvoke)
+        graph_builder.add_node("draft_or_fix_code", RunnableLambda(
+            self._draft_or_fix_wrapper, afunc=self._adraft_or_fix_wrapper, name="draft_or_fix_code"))
+        graph_builder.add_node("sandbox_runner", RunnableLambda(
+            self._sandbox_runner_wrapper, afunc=self._asandbox_runner_wrapper, name="sandbox_runner"))
+        graph_builder.add_node("output_assembler", RunnableLambda(
+            self._output_assembler_wrapper, afunc=self._aoutput_assembler_wrapper, name="output_assembler"))
         
         # Add edges
         # Start -> DraftOrFixCode
@@ -136,41 +141,46 @@ class RendererNode(BaseNode):
             return {"plot_image_path": "", "llm_code_used": "", "warnings": []}
         
         try:
-            # Gather ingredients for the sub-graph
-            ingredients = self._gather_ingredients(state)
+            initial_state = self._build_initial_state(state)
             
-            # Initialize renderer state
-            initial_state = {
-                "ingredients": ingredients,
-                "generated_code": "",
-                "error_msg": None,
-                "retry_count": 0,
-                "warnings": [],
+            # Run the sub-graph
+            result = self.graph.invoke(initial_state)
+            
+            return self._build_result(result)
+                
+        except Exception as e:
+            self.log_error(f"Renderer graph failed: {str(e)}")
+            return {
                 "html_content": "",
-                "llm_code_used": ""
+                "llm_code_used": "",
+                "warnings": [f"Renderer error: {str(e)}"]
             }
+    
+    async def aprocess(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process visualization rendering with the async sub-graph
+        
+        Each sub-node is dispatched to its own worker pool, so the LLM step and
+        the sandbox step do not hold the same worker.
+        
+        Args:
+            state: Current analysis state
+            
+        Returns:
+            Dictionary containing plot_image_path, llm_code_used, and warnings
+        """
+        self.log_info("Starting LLM-powered renderer graph (async)")
+        
+        if state["error_message"] or not state["chart_specification"]:
+            return {"plot_image_path": "", "llm_code_used": "", "warnings": []}
+        
+        try:
+            initial_state = await run_in_node_executor(self._build_initial_state, state, cpu_bound=True)
             
             # Run the sub-graph
-            result = self.graph.invoke(initial_state)
+            result = await self.graph.ainvoke(initial_state)
             
-            # Handle final result
-            if result.get("html_content"):
-                # Success path - return HTML content
-                return {
-                    "html_content": result["html_content"],
-                    "llm_code_used": result["llm_code_used"],
-                    "warnings": result.get("warnings", [])
-                }
-            else:
-                # Failed after all retries
-                error_msg = result.get("error_msg", "Unknown error")
-                self.log_error(f"Renderer failed after {result.get('retry_count', 0)} retries: {error_msg}")
-                
-                return {
-                    "html_content": "",
-                    "llm_code_used": result.get("generated_code", ""),
-                    "warnings": [f"Visualization failed after {result.get('retry_count', 0)} retries: {error_msg}"]
-                }
+            return self._build_result(result)
                 
         except Exception as e:
             self.log_error(f"Renderer graph failed: {str(e)}")
@@ -180,6 +190,41 @@ class RendererNode(BaseNode):
                 "warnings": [f"Renderer error: {str(e)}"]
             }
     
+    def _build_initial_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the renderer sub-graph state from the analysis state"""
+        # Gather ingredients for the sub-graph
+        ingredients = self._gather_ingredients(state)
+        
+        return {
+            "ingredients": ingredients,
+            "generated_code": "",
+            "error_msg": None,
+            "retry_count": 0,
+            "warnings": [],
+            "html_content": "",
+            "llm_code_used": ""
+        }
+    
+    def _build_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the final sub-graph state into analysis state updates"""
+        if result.get("html_content"):
+            # Success path - return HTML content
+            return {
+                "html_content": result["html_content"],
+                "llm_code_used": result["llm_code_used"],
+                "warnings": result.get("warnings", [])
+            }
+        
+        # Failed after all retries
+        error_msg = result.get("error_msg", "Unknown error")
+        self.log_error(f"Renderer failed after {result.get('retry_count', 0)} retries: {error_msg}")
+        
+        return {
+            "html_content": "",
+            "llm_code_used": result.get("generated_code", ""),
+            "warnings": [f"Visualization failed after {result.get('retry_count', 0)} retries: {error_msg}"]
+        }
+    
     def _gather_ingredients(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Gather all ingredients needed for code generation
@@ -191,14 +236,13 @@ class RendererNode(BaseNode):
         user_ask = state["user_prompt"]
         chart_spec = state["chart_specification"]
         
-        # Data snapshot - load from text content
-        import io
-        df = pd.read_csv(io.StringIO(state["csv_data_content"]))
+        # Data snapshot - from the dataset parsed by the input loader
+        dataset = get_dataset(state)
         data_snapshot = {
-            "columns": list(df.columns),
-            "dtypes": df.dtypes.astype(str).to_dict(),
-            "sample_values": df.head(3).to_dict('records'),
-            "shape": df.shape
+            "columns": dataset.columns,
+            "dtypes": dataset.dtypes,
+            "sample_values": dataset.sample(3),
+            "shape": dataset.frame.shape
         }
         
         return {
@@ -206,7 +250,8 @@ class RendererNode(BaseNode):
             "chart_specification": chart_spec,
             "data_snapshot": data_snapshot,
             "style_dictionary": STYLE_DICTIONARY,
-            "csv_data_content": state["csv_data_content"]
+            # Handed to the sandbox without re-serializing
+            "dataset": dataset
         }
     
     # Node wrappers to maintain state updates
@@ -228,6 +273,21 @@ class RendererNode(BaseNode):
         # Merge results into state
         return {**state, **result}
     
+    async def _adraft_or_fix_wrapper(self, state: RendererState) -> Dict[str, Any]:
+        """Async wrapper for draft_or_fix_code node"""
+        result = await self.draft_or_fix.aprocess(state)
+        return {**state, **result}
+    
+    async def _asandbox_runner_wrapper(self, state: RendererState) -> Dict[str, Any]:
+        """Async wrapper for sandbox_runner node"""
+        result = await self.sandbox_runner.aprocess(state)
+        return {**state, **result}
+    
+    async def _aoutput_assembler_wrapper(self, state: RendererState) -> Dict[str, Any]:
+        """Async wrapper for output_assembler node"""
+        result = await self.output_assembler.aprocess(state)
+        return {**state, **result}
+    
     # Conditional edge functions
     def _check_draft_result(self, state: RendererState) -> str:
         """
@@ -3,6 +3,11 @@ Sandbox Runner Node for LLM-Powered Renderer
 
 This node executes generated Plotly Express code in a secure sandboxed environment with
 timeout protection and performs post-execution safety checks on both HTML and PNG outputs.
+
+Code runs on a pool of pre-warmed, resource-limited worker processes (see
+sandbox_pool.py). The parsed dataset is handed to the worker through shared
+memory. If the pool is disabled or unavailable, each attempt falls back to
+spawning a fresh interpreter that reads the CSV from a temp file.
 """
 
 import os
@@ -15,9 +20,9 @@ from PIL import Image
 import numpy as np
 
 from .base_node import BaseNode
-
-# Constants
-EXECUTION_TIMEOUT = 5  # seconds
+from ..config import load_config_from_env
+from ..dataset import DatasetHandle
+from ..sandbox_pool import get_sandbox_pool, SandboxWorkerError
 
 
 class SandboxRunnerNode(BaseNode):
@@ -28,6 +33,8 @@ class SandboxRunnerNode(BaseNode):
     Performs post-execution checks on both HTML and PNG output files.
     """
     
+    cpu_bound = True
+    
     def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute code in sandbox and check results
@@ -47,10 +54,9 @@ class SandboxRunnerNode(BaseNode):
         try:
             ingredients = state["ingredients"]
             generated_code = state["generated_code"]
-            csv_data_content = ingredients["csv_data_content"]
             
             # Execute in sandboxed environment
-            execution_result = self._execute_sandboxed(generated_code, csv_data_content)
+            execution_result = self._execute_sandboxed(generated_code, ingredients["dataset"])
             
             if not execution_result["success"]:
                 self.log_warning(f"Execution failed: {execution_result['error']}")
@@ -82,9 +88,29 @@ class SandboxRunnerNode(BaseNode):
         indented_lines = [indent + line if line.strip() else line for line in lines]
         return '\n'.join(indented_lines)
     
-    def _execute_sandboxed(self, code: str, csv_data_content: str) -> Dict[str, Any]:
+    def _execute_sandboxed(self, code: str, dataset: DatasetHandle) -> Dict[str, Any]:
         """
-        Execute generated Plotly code in a sandboxed environment with timeout
+        Execute generated Plotly code on a warm sandbox worker
+        
+        Args:
+            code: Validated Python code
+            dataset: Parsed dataset, handed over without CSV serialization
+            
+        Returns:
+            Execution result with success flag, HTML content, and any warnings
+        """
+        pool = get_sandbox_pool()
+        if pool is not None:
+            try:
+                return pool.execute(code, dataframe=dataset.frame)
+            except SandboxWorkerError as e:
+                self.log_warning(f"Sandbox pool unavailable, spawning a fresh interpreter: {e}")
+        
+        return self._execute_cold(code, dataset.to_csv())
+    
+    def _execute_cold(self, code: str, csv_data_content: str) -> Dict[str, Any]:
+        """
+        Execute generated Plotly code in a freshly spawned interpreter with timeout
         
         Args:
             code: Validated Python code
@@ -93,6 +119,9 @@ class SandboxRunnerNode(BaseNode):
         Returns:
             Execution result with success flag, HTML content, and any warnings
         """
+        # Same limit as the warm pool, so both paths behave alike
+        timeout = load_config_from_env().sandbox_timeout_seconds
+        
         try:
             # Create temporary CSV file from content
             with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as csv_file:
@@ -118,7 +147,7 @@ def timeout_handler(signum, frame):
     raise TimeoutError("Execution timeout")
 
 signal.signal(signal.SIGALRM, timeout_handler)
-signal.alarm({EXECUTION_TIMEOUT})
+signal.alarm({timeout})
 
 try:
     # Load data from temporary CSV file
@@ -166,7 +195,7 @@ finally:
                 [sys.executable, script_path],
                 capture_output=True,
                 text=True,
-                timeout=EXECUTION_TIMEOUT + 1
+                timeout=timeout + 1
             )
             
             # Clean up temp files
@@ -225,7 +254,7 @@ finally:
         except subprocess.TimeoutExpired:
             return {
                 "success": False,
-                "error": f"Execution timeout after {EXECUTION_TIMEOUT} seconds"
+                "error": f"Execution timeout after {timeout} seconds"
             }
         except Exception as e:
             return {
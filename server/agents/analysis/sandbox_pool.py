@@ -0,0 +1,394 @@
+"""
+Warm Sandbox Worker Pool for the Analysis Agent
+
+Spawning a fresh interpreter per render re-imports plotly, pandas and numpy,
+which can use most of the sandbox timeout before any generated code runs. This
+module keeps a small pool of pre-warmed worker processes (see
+``sandbox_worker.py``) that already have those libraries loaded:
+
+- jobs are sent to an idle worker over its stdin/stdout pipe; an already
+  parsed DataFrame is handed over through shared memory instead of as CSV
+  text, and the chart HTML comes back as a raw length-prefixed payload
+- each worker runs with an address-space cap, and each job gets wall-clock
+  and CPU-time limits; a worker that overruns is killed by the pool
+- every job runs in a child forked from the worker, so jobs cannot leave
+  state behind for later ones; a job that overruns its limits only loses
+  its child
+- workers are recycled after a fixed number of jobs, or when they crash or
+  stop answering, and replaced in the background
+
+Pool size, jobs per worker, timeout and memory limit come from the analysis
+configuration (ANALYSIS_SANDBOX_*).
+"""
+
+import json
+import logging
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .config import load_config_from_env
+from .sandbox_worker import HEADER, export_frame, write_message
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+STARTUP_TIMEOUT = 30  # seconds to import libraries and warm up
+
+
+class SandboxWorkerError(Exception):
+    """Raised when a sandbox worker dies, hangs or breaks the protocol"""
+
+
+class SandboxWorker:
+    """A single pre-warmed sandbox process"""
+
+    def __init__(self, memory_limit_mb: int):
+        """Start the worker process (does not wait for it to be ready)"""
+        env = dict(os.environ)
+        # One render per worker at a time; keep BLAS from reserving a thread pool each
+        for var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            env.setdefault(var, "1")
+
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, str(memory_limit_mb)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            close_fds=True,
+        )
+        self.jobs_run = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is still running"""
+        return self.process.poll() is None
+
+    def wait_ready(self, timeout: float = STARTUP_TIMEOUT) -> None:
+        """Block until the worker has finished importing and warming up"""
+        message, _ = self._receive(timeout)
+        if message.get("status") != "ready":
+            raise SandboxWorkerError(f"Unexpected worker handshake: {message}")
+
+    def run(self,
+            code: str,
+            timeout: int,
+            csv_data_content: str = "",
+            frame_layout: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute one job on this worker
+
+        Args:
+            code: Generated code defining draw_chart(df)
+            timeout: Per-job time limit in seconds
+            csv_data_content: CSV text, used when no frame layout is given
+            frame_layout: Shared-memory DataFrame written by export_frame
+
+        Raises:
+            SandboxWorkerError: If the worker dies or does not answer within the timeout
+        """
+        payload = b"" if frame_layout else csv_data_content.encode("utf-8")
+        try:
+            write_message(self.process.stdin, {
+                "code": code,
+                "timeout": timeout,
+                "frame": frame_layout,
+            }, payload)
+        except (BrokenPipeError, OSError) as e:
+            raise SandboxWorkerError(f"Sandbox worker is not accepting jobs: {e}")
+
+        self.jobs_run += 1
+        # The worker enforces the timeout itself and kills a job child one
+        # second past it; allow another second for it to report
+        result, html = self._receive(timeout + 2)
+        result["html_content"] = html.decode("utf-8")
+        return result
+
+    def _receive(self, timeout: float) -> Tuple[Dict[str, Any], bytes]:
+        """Read one (header, payload) message from the worker, waiting at most `timeout` seconds"""
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+
+        header = self._read_frame(fd, deadline)
+        payload = self._read_frame(fd, deadline)
+        return json.loads(header.decode("utf-8")), payload
+
+    def _read_frame(self, fd: int, deadline: float) -> bytes:
+        """Read one length-prefixed frame from fd before the deadline"""
+        (length,) = HEADER.unpack(self._read_exact(fd, HEADER.size, deadline))
+        return self._read_exact(fd, length, deadline)
+
+    def _read_exact(self, fd: int, size: int, deadline: float) -> bytes:
+        """Read exactly `size` bytes from fd before the deadline"""
+        chunks = []
+        remaining = size
+        while remaining:
+            wait = deadline - time.monotonic()
+            if wait <= 0:
+                raise SandboxWorkerError("Execution timeout: sandbox worker did not respond in time")
+            ready, _, _ = select.select([fd], [], [], wait)
+            if not ready:
+                continue
+            chunk = os.read(fd, min(remaining, 1 << 20))
+            if not chunk:
+                raise SandboxWorkerError(
+                    "Sandbox worker exited unexpectedly, likely after exceeding its CPU or memory limit")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def kill(self) -> None:
+        """Terminate the worker"""
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+        except OSError:
+            pass
+        if self.alive:
+            self.process.kill()
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
+class SandboxWorkerPool:
+    """
+    Pool of pre-warmed sandbox workers
+
+    ``execute`` is thread-safe and blocks while all workers are busy, so the
+    number of concurrent renders is bounded by the pool size.
+    """
+
+    def __init__(self,
+                 size: int = 2,
+                 max_jobs_per_worker: int = 50,
+                 timeout: int = 5,
+                 memory_limit_mb: int = 2048):
+        """
+        Initialize the pool (workers are started by `start` or on first use)
+
+        Args:
+            size: Number of worker processes
+            max_jobs_per_worker: Jobs after which a worker is replaced
+            timeout: Per-job wall-clock and CPU-time limit in seconds
+            memory_limit_mb: Address-space cap per worker
+        """
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+
+        # LIFO keeps reusing the most recent worker, so workers reach their
+        # recycle limit one at a time instead of all together
+        self._idle: "queue.LifoQueue[SandboxWorker]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._worker_count = 0  # live plus starting workers
+        self._closed = False
+        self.stats = {"jobs": 0, "workers_started": 0, "workers_recycled": 0, "worker_failures": 0}
+
+    def start(self) -> None:
+        """Start all workers in the background so they are warm before the first job"""
+        for _ in range(self.size):
+            if not self._reserve_slot():
+                break
+            self._spawn_in_background()
+
+    def wait_until_warm(self, timeout: float = STARTUP_TIMEOUT) -> bool:
+        """Wait until every worker is started and idle; returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self._idle.qsize() < self.size:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def execute(self,
+                code: str,
+                csv_data_content: str = "",
+                dataframe: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Execute generated code on a warm worker
+
+        Args:
+            code: Validated Python code defining draw_chart(df)
+            csv_data_content: CSV data the chart is drawn from
+            dataframe: Already parsed data; handed over through shared memory
+                instead of the CSV text when given
+
+        Returns:
+            Execution result with success flag, error, HTML content and warnings
+        """
+        frame_layout = None
+        if dataframe is not None:
+            try:
+                frame_layout = export_frame(dataframe)
+            except Exception as e:
+                logger.warning(f"Shared-memory handoff unavailable, sending CSV text: {e}")
+                if not csv_data_content:
+                    csv_data_content = dataframe.to_csv(index=False)
+
+        worker = None
+        healthy = False
+        try:
+            worker = self._acquire()
+            result = worker.run(code, self.timeout, csv_data_content, frame_layout)
+            healthy = not result.pop("recycle", False)
+            return result
+        except SandboxWorkerError as e:
+            if worker is None:
+                # No worker could be started; let the caller fall back
+                raise
+            with self._lock:
+                self.stats["worker_failures"] += 1
+            logger.warning(f"Sandbox worker {worker.process.pid} failed: {e}")
+            return {"success": False, "error": str(e), "html_content": "", "warnings": []}
+        finally:
+            if frame_layout is not None:
+                os.unlink(frame_layout["path"])
+            if worker is not None:
+                with self._lock:
+                    self.stats["jobs"] += 1
+                self._release(worker, healthy)
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy workers are stopped when released"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.kill()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                "size": self.size,
+                "workers": self._worker_count,
+                "idle": self._idle.qsize(),
+            }
+
+    def _reserve_slot(self) -> bool:
+        """Reserve capacity for one more worker, if the pool is not full"""
+        with self._lock:
+            if self._closed or self._worker_count >= self.size:
+                return False
+            self._worker_count += 1
+            return True
+
+    def _spawn(self) -> SandboxWorker:
+        """Start a worker and wait for it to be ready (slot must be reserved)"""
+        worker = None
+        try:
+            worker = SandboxWorker(self.memory_limit_mb)
+            worker.wait_ready()
+        except Exception:
+            if worker is not None:
+                worker.kill()
+            with self._lock:
+                self._worker_count -= 1
+            raise
+        with self._lock:
+            self.stats["workers_started"] += 1
+        return worker
+
+    def _spawn_in_background(self) -> None:
+        """Start a worker on a background thread and add it to the idle queue"""
+        def _target():
+            try:
+                self._idle.put(self._spawn())
+            except Exception as e:
+                logger.error(f"Failed to start sandbox worker: {e}")
+
+        threading.Thread(target=_target, name="sandbox-pool-spawn", daemon=True).start()
+
+    def _acquire(self) -> SandboxWorker:
+        """Take an idle worker, starting one if the pool has spare capacity"""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    return self._spawn()
+                try:
+                    worker = self._idle.get(timeout=STARTUP_TIMEOUT)
+                except queue.Empty:
+                    raise SandboxWorkerError("No sandbox worker became available")
+
+            if worker.alive:
+                return worker
+            # Died while idle; drop it and try again
+            self._retire(worker, replace=False)
+
+    def _release(self, worker: SandboxWorker, healthy: bool) -> None:
+        """Return a worker to the pool, or recycle it"""
+        with self._lock:
+            closed = self._closed
+        if healthy and not closed and worker.alive and worker.jobs_run < self.max_jobs_per_worker:
+            self._idle.put(worker)
+        else:
+            self._retire(worker, replace=not closed)
+
+    def _retire(self, worker: SandboxWorker, replace: bool = True) -> None:
+        """Kill a worker and optionally start its replacement in the background"""
+        worker.kill()
+        with self._lock:
+            self._worker_count -= 1
+            self.stats["workers_recycled"] += 1
+        if replace and self._reserve_slot():
+            self._spawn_in_background()
+
+
+# Global instance
+_sandbox_pool: Optional[SandboxWorkerPool] = None
+_sandbox_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> Optional[SandboxWorkerPool]:
+    """
+    Get the global sandbox worker pool
+
+    Returns:
+        SandboxWorkerPool, or None if the pool is disabled or unsupported on this platform
+    """
+    global _sandbox_pool
+
+    with _sandbox_pool_lock:
+        if _sandbox_pool is None:
+            config = load_config_from_env()
+            if not config.sandbox_pool_enabled or os.name != "posix":
+                return None
+            _sandbox_pool = SandboxWorkerPool(
+                size=config.sandbox_pool_size,
+                max_jobs_per_worker=config.sandbox_max_jobs_per_worker,
+                timeout=config.sandbox_timeout_seconds,
+                memory_limit_mb=config.sandbox_memory_limit_mb,
+            )
+            _sandbox_pool.start()
+            logger.info(f"Started sandbox worker pool with {config.sandbox_pool_size} workers")
+        return _sandbox_pool
+
+
+def shutdown_sandbox_pool() -> None:
+    """Stop the global sandbox worker pool"""
+    global _sandbox_pool
+
+    with _sandbox_pool_lock:
+        if _sandbox_pool is not None:
+            _sandbox_pool.shutdown()
+            _sandbox_pool = None
@@ -0,0 +1,326 @@
+"""
+Sandbox Worker Process for the Analysis Agent
+
+This script runs as a long-lived child process of the sandbox worker pool.
+It imports plotly, pandas and numpy once at startup, then executes generated
+``draw_chart`` code for one job at a time, so each render skips interpreter
+start-up and library imports. Each job runs in a child forked from the warm
+worker and discarded afterwards, so nothing a job changes (module
+attributes, ``px.defaults``, ``pio.templates``) carries over to the next.
+
+Protocol (over stdin/stdout): every message is a JSON header followed by a
+binary payload, each prefixed with its 4-byte big-endian length. The worker
+sends a ``{"status": "ready"}`` header once warmed up, then answers each
+``{"code", "timeout", "frame"}`` job with a
+``{"success", "error", "warnings", "recycle"}`` header whose payload is the
+UTF-8 HTML of the chart.
+
+Data handoff: the parent pickles the already-parsed DataFrame with protocol 5
+into a file in shared memory (/dev/shm), with the column buffers stored
+out-of-band, and sends only the file layout in ``frame``. The worker maps the
+file copy-on-write and unpickles the columns as views of the mapping, so no
+CSV text is produced or parsed. Without a frame, the job payload is the CSV
+text and the worker parses it.
+
+Limits: the address space is capped at start-up (RLIMIT_AS), each job gets a
+wall-clock alarm and a CPU-time budget (RLIMIT_CPU), the worker kills a job
+child that does not answer in time, and the pool kills the worker if it does
+not answer in time. Only the standard library is imported at module level so
+the pool can reuse the framing helpers.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+HEADER = struct.Struct(">I")
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def write_message(stream: BinaryIO, header: Dict[str, Any], payload: bytes = b"") -> None:
+    """Write one message: a length-prefixed JSON header and a length-prefixed binary payload"""
+    encoded = json.dumps(header).encode("utf-8")
+    stream.write(HEADER.pack(len(encoded)))
+    stream.write(encoded)
+    stream.write(HEADER.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+def _read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """Read one length-prefixed frame, or None on EOF"""
+    prefix = stream.read(HEADER.size)
+    if len(prefix) < HEADER.size:
+        return None
+    (length,) = HEADER.unpack(prefix)
+    data = stream.read(length)
+    if len(data) < length:
+        return None
+    return data
+
+
+def read_message(stream: BinaryIO) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """Read one message as (header, payload), or None on EOF"""
+    header = _read_frame(stream)
+    payload = _read_frame(stream) if header is not None else None
+    if payload is None:
+        return None
+    return json.loads(header.decode("utf-8")), payload
+
+
+def export_frame(df: Any) -> Dict[str, Any]:
+    """
+    Write a DataFrame to a shared-memory file for a sandbox worker
+
+    The caller owns the file and must remove it (``os.unlink(layout["path"])``)
+    once the job has finished.
+
+    Returns:
+        Frame layout: file path, size of the pickle stream and buffer offsets
+    """
+    buffers = []
+    stream = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    with tempfile.NamedTemporaryFile(prefix="scioscribe-frame-", dir=SHM_DIR, delete=False) as f:
+        try:
+            f.write(stream)
+            offset = len(stream)
+            layout = []
+            for raw in raw_buffers:
+                f.write(raw)
+                layout.append([offset, raw.nbytes])
+                offset += raw.nbytes
+        except BaseException:
+            os.unlink(f.name)
+            raise
+
+    return {"path": f.name, "pickle_size": len(stream), "buffers": layout}
+
+
+def import_frame(layout: Dict[str, Any]) -> Tuple[Any, mmap.mmap]:
+    """
+    Map a DataFrame written by export_frame
+
+    Column data stays in the copy-on-write mapping; the returned mmap can only
+    be closed once the DataFrame and all views of it are gone.
+    """
+    with open(layout["path"], "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    view = memoryview(mapping)
+    buffers = [view[offset:offset + size] for offset, size in layout["buffers"]]
+    df = pickle.loads(view[:layout["pickle_size"]], buffers=buffers)
+    view.release()
+    return df, mapping
+
+
+def _apply_memory_limit(memory_limit_mb: int) -> None:
+    """Cap the worker's address space"""
+    import resource
+
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow this job `seconds` more CPU time; SIGXCPU terminates the worker beyond that"""
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + seconds + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _warm_up(px, pd) -> None:
+    """Render a tiny figure so plotly's lazy imports and templates are loaded"""
+    fig = px.scatter(pd.DataFrame({"x": [0, 1], "y": [1, 0]}), x="x", y="y")
+    fig.to_html(include_plotlyjs="cdn", full_html=False)
+
+
+def _run_job(job: Dict[str, Any], payload: bytes, timeout: int) -> Tuple[Dict[str, Any], str]:
+    """Run one job in the current (forked) process; returns the result header and chart HTML"""
+    import io
+    import signal
+    import warnings
+
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    def timeout_handler(signum, frame):
+        raise TimeoutError("Execution timeout")
+
+    result: Dict[str, Any] = {"success": False, "error": None, "warnings": [], "recycle": False}
+    html_content = ""
+
+    signal.signal(signal.SIGALRM, timeout_handler)
+    _set_cpu_budget(timeout)
+    signal.alarm(timeout)
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+
+            # Load data, then run the generated code in a fresh namespace
+            if job.get("frame"):
+                df, _ = import_frame(job["frame"])
+            else:
+                df = pd.read_csv(io.BytesIO(payload))
+            namespace = {
+                "__name__": "__sandbox__",
+                "px": px, "go": go, "pio": pio,
+                "np": np, "pd": pd, "sys": sys,
+            }
+            exec(compile(job["code"], "<generated>", "exec"), namespace)
+
+            if "draw_chart" not in namespace:
+                raise ValueError("Generated code must define draw_chart(df)")
+
+            # Execute the function (should return fig, html_content)
+            chart_result = namespace["draw_chart"](df)
+
+            # Verify the result is a tuple with figure and HTML content
+            if not isinstance(chart_result, tuple) or len(chart_result) != 2:
+                raise ValueError("draw_chart must return a tuple: (fig, html_content)")
+
+            fig, html_content = chart_result
+
+            # Verify first element is a Plotly figure
+            if not isinstance(fig, go.Figure):
+                raise ValueError("First return value must be a plotly.graph_objects.Figure")
+
+            # Verify second element is HTML content string
+            if not isinstance(html_content, str) or not html_content.strip():
+                raise ValueError("Second return value must be non-empty HTML content string")
+
+        result["success"] = True
+        if caught:
+            result["warnings"] = [f"Runtime warnings: {'; '.join(str(w.message) for w in caught)}"]
+
+    except SyntaxError as e:
+        result["error"] = f"SyntaxError: {e.msg} (line {e.lineno})"
+    except TimeoutError:
+        result["error"] = f"Execution timeout after {timeout} seconds"
+    except MemoryError:
+        result["error"] = "Execution exceeded the sandbox memory limit"
+    except BaseException as e:
+        if isinstance(e, Exception):
+            result["error"] = str(e) or type(e).__name__
+        else:
+            # SystemExit/KeyboardInterrupt raised by user code
+            result["error"] = f"Generated code raised {type(e).__name__}: {e}"
+    finally:
+        signal.alarm(0)
+
+    return result, html_content if result["success"] else ""
+
+
+def _fork_job(job: Dict[str, Any], payload: bytes, timeout: int) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Run one job in a child forked from this warm process
+
+    The child shares the loaded libraries copy-on-write and exits after the
+    job, so nothing user code changes (module attributes, plotly defaults and
+    templates, globals) reaches the next job.
+    """
+    import select
+    import signal
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        status = 1
+        try:
+            result, html_content = _run_job(job, payload, timeout)
+            with os.fdopen(write_fd, "wb") as out:
+                write_message(out, result, html_content.encode("utf-8"))
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    message = None
+    with os.fdopen(read_fd, "rb") as reader:
+        # The child enforces the timeout itself; allow a second for it to report
+        ready, _, _ = select.select([reader], [], [], timeout + 1)
+        if ready:
+            message = read_message(reader)
+        if message is None:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    _, status = os.waitpid(pid, 0)
+
+    if message is not None:
+        return message
+    if not ready:
+        error = f"Execution timeout after {timeout} seconds"
+    elif os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGXCPU:
+        error = f"Execution exceeded the CPU time limit of {timeout} seconds"
+    else:
+        error = "Generated code crashed the sandbox, likely after exceeding its memory limit"
+    return {"success": False, "error": error, "warnings": [], "recycle": False}, b""
+
+
+def main() -> None:
+    """Worker entry point"""
+    memory_limit_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+    # Keep the protocol channel private: user code printing to stdout must not
+    # corrupt the framing, so fd 1 is pointed at /dev/null.
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    requests = sys.stdin.buffer
+
+    # Import the libraries once; forked jobs share them copy-on-write
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    _warm_up(px, pd)
+
+    if memory_limit_mb:
+        _apply_memory_limit(memory_limit_mb)
+
+    write_message(channel, {"status": "ready", "pid": os.getpid()})
+
+    while True:
+        message = read_message(requests)
+        if message is None:
+            break
+
+        job, payload = message
+        timeout = int(job.get("timeout", 5))
+        try:
+            result, html = _fork_job(job, payload, timeout)
+        except OSError as e:
+            # Could not fork (e.g. out of memory): answer, then retire
+            result, html = {"success": False, "error": f"Could not start sandbox job: {e}",
+                            "warnings": [], "recycle": True}, b""
+
+        try:
+            write_message(channel, result, html)
+        except (BrokenPipeError, OSError):
+            break
+
+        if result["recycle"]:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ This module contains the data cleaning and processing agents for ScioScribe:
 - OCR capabilities for extracting data from images
 - Data quality analysis and suggestions
 - Conversation-based data cleaning workflows
-- Memory storage for data artifacts
+- Memory or persistent (SQLite) storage for data artifacts
 """
 
 from .file_processor import FileProcessingAgent
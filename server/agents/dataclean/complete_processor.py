@@ -35,7 +35,9 @@ from .file_processor import FileProcessingAgent
 from .quality_agent import DataQualityAgent
 from .suggestion_converter import SuggestionConverter
 from .transformation_engine import TransformationEngine
+from .transformation_pipeline import TransformationPipeline
 from .memory_store import get_data_store
+from .cow_frame import derive_frame
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +128,7 @@ class CompleteFileProcessor:
             )
             
             # Step 3: Apply suggestions automatically (if enabled)
-            final_df = df.copy()
+            final_df = df
             if request.auto_apply_suggestions and suggestions:
                 final_df = await self._apply_suggestions_step(
                     final_df, suggestions, artifact_id, request, 
@@ -244,15 +246,9 @@ class CompleteFileProcessor:
         # Extract DataFrame
         df = None
         if result.success and result.data_preview:
-            # Load full DataFrame
+            # Reuse the DataFrame parsed for the preview
             try:
-                if file_path.endswith('.csv'):
-                    df = pd.read_csv(file_path)
-                elif file_path.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file_path)
-                else:
-                    # Fallback to sample data
-                    df = pd.DataFrame(result.data_preview['sample_rows'])
+                df = result.dataframe
                 
                 # Store DataFrame
                 await self.data_store.save_dataframe(artifact_id, df)
@@ -333,7 +329,8 @@ class CompleteFileProcessor:
         """Apply AI suggestions automatically based on configuration."""
         logger.info("Step 3: Applying suggestions automatically")
         
-        current_df = df.copy()
+        # The transformation engine never modifies the frame it is given
+        current_df = df
         applied_count = 0
         skipped_count = 0
         transformations_performed = []
@@ -351,29 +348,61 @@ class CompleteFileProcessor:
         
         logger.info(f"Applying {len(applicable_suggestions)} suggestions")
         
-        for suggestion in applicable_suggestions:
+        # Suggestions are applied in batches: one pipeline pass and one data
+        # version per batch instead of per suggestion
+        pipeline = TransformationPipeline()
+        suggestions_by_transformation: Dict[str, Suggestion] = {}
+        
+        async def run_pipeline(df: pd.DataFrame) -> pd.DataFrame:
+            nonlocal applied_count, skipped_count
+            if not len(pipeline):
+                return df
             try:
-                # Convert suggestion to transformation
-                transformation = await self.suggestion_converter.convert_suggestion_to_transformation(
-                    suggestion, current_df, request.user_id
+                result = await self.transformation_engine.apply_pipeline(
+                    df, pipeline, artifact_id, request.user_id
                 )
-                
-                # Apply transformation
-                transformed_df, data_version = await self.transformation_engine.apply_transformation(
-                    current_df, transformation, artifact_id, request.user_id
+            except Exception as e:
+                logger.error(f"Failed to apply batch of {len(pipeline)} suggestions: {str(e)}")
+                skipped_count += len(pipeline)
+                warnings.extend(
+                    f"Failed to apply suggestion: {suggestions_by_transformation[t.transformation_id].description}"
+                    for t in pipeline.transformations
                 )
-                
-                current_df = transformed_df
+                return df
+            
+            for transformation in result.applied:
                 applied_count += 1
                 transformations_performed.append(transformation.description)
+                logger.info(f"Applied suggestion: {suggestions_by_transformation[transformation.transformation_id].description}")
+            for transformation, error in result.failed:
+                suggestion = suggestions_by_transformation[transformation.transformation_id]
+                logger.error(f"Failed to apply suggestion {suggestion.suggestion_id}: {error}")
+                skipped_count += 1
+                warnings.append(f"Failed to apply suggestion: {suggestion.description}")
+            return result.dataframe
+        
+        for suggestion in applicable_suggestions:
+            try:
+                # A suggestion is converted against the current state of its
+                # column: apply the batch first if it changes that column
+                if pipeline.depends_on(suggestion.column):
+                    current_df = await run_pipeline(current_df)
+                    pipeline = TransformationPipeline()
                 
-                logger.info(f"Applied suggestion: {suggestion.description}")
+                # Convert suggestion to transformation
+                transformation = await self.suggestion_converter.convert_suggestion_to_transformation(
+                    suggestion, current_df, request.user_id
+                )
+                pipeline.add(transformation)
+                suggestions_by_transformation[transformation.transformation_id] = suggestion
                 
             except Exception as e:
                 logger.error(f"Failed to apply suggestion {suggestion.suggestion_id}: {str(e)}")
                 skipped_count += 1
                 warnings.append(f"Failed to apply suggestion: {suggestion.description}")
         
+        current_df = await run_pipeline(current_df)
+        
         # Update processing summary
         processing_summary.suggestions_applied = applied_count
         processing_summary.suggestions_skipped = skipped_count
@@ -405,7 +434,7 @@ class CompleteFileProcessor:
         """Prepare DataFrame for JSON response."""
         try:
             # Clean data for JSON serialization
-            df_clean = df.copy()
+            df_clean = derive_frame(df)
             
             # Handle different data types appropriately
             for col in df_clean.columns:
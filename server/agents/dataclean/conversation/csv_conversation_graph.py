@@ -23,6 +23,8 @@ from ..models import (
 from ..csv_processor import CSVDirectProcessor
 from ..quality_agent import DataQualityAgent
 from ..memory_store import get_data_store
+from ..frame_cache import FrameHandle, get_frame_cache
+from database import get_experiment_repository, ExperimentNotFoundError
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,8 @@ class CSVConversationGraph:
         self.csv_processor = CSVDirectProcessor(openai_client)
         self.quality_agent = DataQualityAgent(openai_client) if openai_client else None
         self.data_store = get_data_store()
+        self.frame_cache = get_frame_cache()
+        self.experiment_repository = get_experiment_repository()
         self.sessions: Dict[str, Union[CSVConversationState, Dict[str, Any]]] = {}
         
         # Build and compile the graph
@@ -69,7 +73,7 @@ class CSVConversationGraph:
             session_id: str
             user_id: str
             original_csv: str
-            current_csv: str
+            current_frame: Optional[FrameHandle]
             user_message: str
             intent: str
             response: str
@@ -191,16 +195,16 @@ class CSVConversationGraph:
                 if request.approved:
                     # Apply pending transformations
                     pending_transformations = state.get("pending_transformations", [])
-                    if pending_transformations:
-                        state["current_csv"] = await self.csv_processor.apply_csv_transformations(
-                            state["current_csv"], pending_transformations
+                    current_frame = state.get("current_frame")
+                    if pending_transformations and current_frame is not None:
+                        cleaned_df = await self.csv_processor.apply_frame_transformations(
+                            current_frame.frame, pending_transformations
                         )
+                        state["current_frame"] = self.frame_cache.from_frame(cleaned_df)
                         
                         # Save cleaned data to data store for persistence
-                        cleaned_df = self.csv_processor._parse_csv_string(state["current_csv"])
-                        if cleaned_df is not None:
-                            await self.data_store.save_dataframe(state["session_id"], cleaned_df)
-                            logger.info(f"Saved cleaned data to data store for session {state['session_id']}")
+                        await self.data_store.save_dataframe(state["session_id"], cleaned_df)
+                        logger.info(f"Saved cleaned data to data store for session {state['session_id']}")
                         
                         applied = state.get("applied_transformations", [])
                         applied.extend(pending_transformations)
@@ -226,7 +230,7 @@ class CSVConversationGraph:
                 return CSVProcessingResponse(
                     success=True,
                     original_csv=state["original_csv"],
-                    cleaned_csv=state["current_csv"],
+                    cleaned_csv=self._current_csv_text(state),
                     changes_made=state.get("applied_transformations", []),
                     session_id=request.session_id,
                     conversation_active=True,
@@ -293,8 +297,8 @@ class CSVConversationGraph:
     async def _parse_csv_message(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Parse and validate the CSV message."""
         try:
-            # Basic validation
-            if not state["current_csv"].strip():
+            # Basic validation - the handle is None when the CSV could not be parsed
+            if state.get("current_frame") is None:
                 state["response"] = "I need CSV data to work with. Please provide your data."
                 return state
             
@@ -346,20 +350,21 @@ class CSVConversationGraph:
             cleaned_df = await self.data_store.get_dataframe(state["session_id"])
             if cleaned_df is not None:
                 # Use cleaned data for analysis
-                csv_data = self.csv_processor._dataframe_to_csv_string(cleaned_df)
                 logger.info(f"Using cleaned data from data store for analysis (session {state['session_id']})")
+                analysis = await self.csv_processor.analyze_frame_quality(cleaned_df)
             else:
                 # Try loading from database
                 cleaned_csv_from_db = await self._load_cleaned_data_from_database(state["session_id"])
                 if cleaned_csv_from_db:
-                    csv_data = cleaned_csv_from_db
                     logger.info(f"Using cleaned data from database for analysis (session {state['session_id']})")
+                    analysis = await self.csv_processor.analyze_csv_quality(cleaned_csv_from_db)
                 else:
-                    # Fall back to current CSV
-                    csv_data = state["current_csv"]
+                    # Fall back to the current frame
                     logger.info(f"Using current CSV for analysis (session {state['session_id']})")
-            
-            analysis = await self.csv_processor.analyze_csv_quality(csv_data)
+                    current_frame = state.get("current_frame")
+                    analysis = await self.csv_processor.analyze_frame_quality(
+                        current_frame.frame if current_frame is not None else None
+                    )
             
             # Update state with analysis results
             state["quality_issues"] = analysis.quality_issues
@@ -447,13 +452,16 @@ class CSVConversationGraph:
         try:
             pending_transformations = state.get("pending_transformations", [])
             if pending_transformations:
-                # Apply transformations
-                state["current_csv"] = await self.csv_processor.apply_csv_transformations(
-                    state["current_csv"], pending_transformations
-                )
+                # Apply transformations to the parsed frame
+                current_frame = state.get("current_frame")
+                cleaned_df = None
+                if current_frame is not None:
+                    cleaned_df = await self.csv_processor.apply_frame_transformations(
+                        current_frame.frame, pending_transformations
+                    )
+                    state["current_frame"] = self.frame_cache.from_frame(cleaned_df)
                 
                 # Save cleaned data to both data store and database for persistence
-                cleaned_df = self.csv_processor._parse_csv_string(state["current_csv"])
                 if cleaned_df is not None:
                     # Save to in-memory data store
                     await self.data_store.save_dataframe(state["session_id"], cleaned_df)
@@ -465,7 +473,7 @@ class CSVConversationGraph:
                         try:
                             await self._update_experiment_csv_with_versioning(
                                 experiment_id, 
-                                state["current_csv"],
+                                state["current_frame"].to_csv(),
                                 is_agent_update=True
                             )
                             logger.info(f"Updated experiment {experiment_id} with agent versioning")
@@ -474,7 +482,7 @@ class CSVConversationGraph:
                     
                     # Fallback: Save to database for persistent storage (legacy method)
                     try:
-                        await self._save_cleaned_data_to_database(state["session_id"], state["current_csv"])
+                        await self._save_cleaned_data_to_database(state["session_id"], state["current_frame"].to_csv())
                         logger.info(f"Saved cleaned data to database for session {state['session_id']}")
                     except Exception as e:
                         logger.warning(f"Failed to save to database for session {state['session_id']}: {str(e)}")
@@ -529,21 +537,18 @@ class CSVConversationGraph:
             user_message = state["user_message"]
             session_id = state["session_id"]
             
-            # STEP 0: Preserve original CSV for rollback on errors
-            original_csv = state["current_csv"]
+            # STEP 0: Preserve original frame handle for rollback on errors
+            original_frame = state.get("current_frame")
             
             # Get current DataFrame
             cleaned_df = await self.data_store.get_dataframe(session_id)
             if cleaned_df is not None:
                 current_df = cleaned_df
             else:
-                current_df = self.csv_processor._parse_csv_string(state["current_csv"])
+                current_df = original_frame.frame if original_frame is not None else None
                 
             if current_df is None:
                 state["response"] = "I couldn't parse your CSV data. Please ensure it's properly formatted."
-                # Ensure state["current_csv"] remains valid
-                if not state.get("current_csv"):
-                    state["current_csv"] = original_csv
                 return state
             
             # STEP 1: Get available columns for later error messaging (but don't block execution)
@@ -552,7 +557,7 @@ class CSVConversationGraph:
             # STEP 2: Use quality agent to detect and handle row operations
             if not self.quality_agent:
                 state["response"] = "Row operations are not available - AI agent not configured."
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 return state
             
             # STEP 3: Detect if this is a row operation
@@ -560,14 +565,14 @@ class CSVConversationGraph:
             
             if not detection_result.get("operation_detected", False):
                 state["response"] = "I couldn't detect a row operation in your message. Please be more specific about what you'd like to add or delete."
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 return state
             
             operation_type = detection_result.get("operation_type", "none")
             
             if operation_type == "none":
                 state["response"] = "I couldn't understand the specific row operation you want to perform."
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 return state
             
             # STEP 4: Parse operation details
@@ -582,7 +587,7 @@ class CSVConversationGraph:
                 response_msg += "\n\n**Please try a more specific request like:**\n• \"Delete rows where [column_name] equals [value]\""
                 
                 state["response"] = response_msg
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 return state
             
             # STEP 5: Validate the operation
@@ -604,7 +609,7 @@ class CSVConversationGraph:
                         response_msg += f"\n{i}. {rec}"
                 
                 state["response"] = response_msg
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 return state
             
             # STEP 6: Execute the operation
@@ -618,25 +623,26 @@ class CSVConversationGraph:
                 response_msg += f"\n\n📋 **Available columns:** {', '.join(available_columns)}"
                 
                 state["response"] = response_msg
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 return state
             
             # STEP 7: Update state with modified data (with defensive checks)
             modified_df = execution_result.get("modified_df")
             if modified_df is not None:
                 try:
-                    # Convert back to CSV string with validation
-                    modified_csv = self.csv_processor._dataframe_to_csv_string(modified_df)
+                    # Register the new frame and convert it to CSV once for validation
+                    modified_frame = self.frame_cache.from_frame(modified_df)
+                    modified_csv = modified_frame.to_csv()
                     
                     # Defensive check: ensure modified_csv is valid
                     if not modified_csv or not modified_csv.strip():
                         logger.error("Modified CSV is empty or invalid, preserving original")
-                        state["current_csv"] = original_csv
+                        state["current_frame"] = original_frame
                         state["response"] = f"❌ The {operation_type.replace('_', ' ')} operation failed to produce valid data. Original data preserved."
                         return state
                     
                     # Update state with valid data
-                    state["current_csv"] = modified_csv
+                    state["current_frame"] = modified_frame
                     
                     # Save to data store
                     await self.data_store.save_dataframe(session_id, modified_df)
@@ -695,13 +701,13 @@ class CSVConversationGraph:
                         
                 except Exception as e:
                     logger.error(f"Error processing modified DataFrame: {str(e)}")
-                    state["current_csv"] = original_csv
+                    state["current_frame"] = original_frame
                     state["response"] = f"❌ The {operation_type.replace('_', ' ')} operation failed during data processing. Original data preserved."
                     return state
                     
             else:
                 # Operation completed but no data was modified - preserve original
-                state["current_csv"] = original_csv
+                state["current_frame"] = original_frame
                 state["response"] = f"The {operation_type.replace('_', ' ')} operation completed but no data was modified. This might mean no rows matched your criteria."
                 state["response"] += f"\n\n📋 **Available columns:** {', '.join(available_columns)}"
             
@@ -711,7 +717,7 @@ class CSVConversationGraph:
         except Exception as e:
             logger.error(f"Error handling row operations: {str(e)}")
             # Ensure original data is preserved on any unexpected error
-            state["current_csv"] = original_csv
+            state["current_frame"] = original_frame
             state["response"] = f"❌ I encountered an error while handling the row operation: {str(e)}\n\nYour original data has been preserved."
             return state
     
@@ -867,7 +873,7 @@ class CSVConversationGraph:
                     "session_id": existing_state.session_id,
                     "user_id": existing_state.user_id,
                     "original_csv": existing_state.original_csv,
-                    "current_csv": existing_state.current_csv,  # Keep existing CSV if not updating
+                    "current_frame": self.frame_cache.parse(existing_state.current_csv),  # Keep existing CSV if not updating
                     "user_message": request.user_message,
                     "intent": getattr(existing_state, 'intent', ''),
                     "response": getattr(existing_state, 'response', ''),
@@ -884,7 +890,7 @@ class CSVConversationGraph:
                 "session_id": request.session_id,
                 "user_id": request.user_id,
                 "original_csv": request.csv_data,
-                "current_csv": request.csv_data,
+                "current_frame": self.frame_cache.parse(request.csv_data),
                 "user_message": request.user_message,
                 "intent": "",
                 "response": "",
@@ -903,12 +909,8 @@ class CSVConversationGraph:
         # Store state as dictionary for consistency
         self.sessions[state["session_id"]] = state.copy()
         
-        # Use cleaned data from data store if available
-        cleaned_csv = state["current_csv"]
-        if state.get("applied_transformations"):
-            # If transformations were applied, the cleaned data should be in the data store
-            # For now, we'll use the current_csv which should contain the cleaned data
-            cleaned_csv = state["current_csv"]
+        # The current frame handle holds the cleaned data once transformations are applied
+        cleaned_csv = self._current_csv_text(state)
         
         return CSVProcessingResponse(
             success=True,
@@ -925,6 +927,13 @@ class CSVConversationGraph:
             pending_transformations=state.get("pending_transformations", [])
         )
     
+    def _current_csv_text(self, state: Dict[str, Any]) -> str:
+        """Get the CSV text for the session's current frame (serialized at most once)."""
+        current_frame = state.get("current_frame")
+        if current_frame is None:
+            return state.get("original_csv", "")
+        return current_frame.to_csv()
+    
     async def _generate_greeting_response(self, state: Dict[str, Any]) -> str:
         """Generate greeting response with basic data overview."""
         try:
@@ -934,7 +943,8 @@ class CSVConversationGraph:
                 df = cleaned_df
                 data_status = "cleaned"
             else:
-                df = self.csv_processor._parse_csv_string(state["current_csv"])
+                current_frame = state.get("current_frame")
+                df = current_frame.frame if current_frame is not None else None
                 data_status = "original"
                 
             if df is not None:
@@ -993,7 +1003,8 @@ class CSVConversationGraph:
                 df = cleaned_df
                 data_status = "cleaned"
             else:
-                df = self.csv_processor._parse_csv_string(state["current_csv"])
+                current_frame = state.get("current_frame")
+                df = current_frame.frame if current_frame is not None else None
                 data_status = "original"
                 
             if df is None:
@@ -1042,73 +1053,43 @@ class CSVConversationGraph:
             return f"I encountered an error describing your data: {str(e)}"
     
     async def _update_experiment_csv_with_versioning(self, experiment_id: str, cleaned_csv: str, is_agent_update: bool = True) -> bool:
-        """Update experiment CSV data with proper versioning via HTTP API."""
+        """Update experiment CSV data with proper versioning via the experiment repository."""
         try:
-            import httpx
+            await self.experiment_repository.update_csv(
+                experiment_id,
+                cleaned_csv,
+                is_agent_update=is_agent_update,
+                expected_version=None  # Let the repository handle versioning
+            )
+            logger.info(f"Successfully updated experiment {experiment_id} with agent versioning")
+            return True
             
-            # Use httpx to call our database API endpoint
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"http://localhost:8000/api/database/experiments/{experiment_id}/csv",
-                    json={
-                        "csv_data": cleaned_csv,
-                        "is_agent_update": is_agent_update,
-                        "expected_version": None  # Let the API handle versioning
-                    }
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"Successfully updated experiment {experiment_id} with agent versioning")
-                    return True
-                else:
-                    logger.error(f"Failed to update experiment {experiment_id}: {response.status_code} - {response.text}")
-                    return False
-                    
+        except ExperimentNotFoundError as e:
+            logger.error(f"Failed to update experiment {experiment_id}: {str(e)}")
+            return False
         except Exception as e:
             logger.error(f"Error updating experiment {experiment_id}: {str(e)}")
             return False
 
     async def _save_cleaned_data_to_database(self, session_id: str, cleaned_csv: str) -> bool:
-        """Save cleaned CSV data to database via HTTP API."""
+        """Save cleaned CSV data to database via the experiment repository."""
         try:
-            import httpx
+            await self.experiment_repository.save_cleaned_csv(session_id, cleaned_csv)
+            return True
             
-            # Use httpx to call our own API endpoint
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "http://localhost:8000/api/dataclean/csv-conversation/save-cleaned-data",
-                    params={"session_id": session_id},
-                    json={"cleaned_csv": cleaned_csv}
-                )
-                
-                if response.status_code == 200:
-                    return True
-                else:
-                    logger.error(f"Database save failed: {response.status_code} - {response.text}")
-                    return False
-                    
         except Exception as e:
             logger.error(f"Error saving to database: {str(e)}")
             return False
     
     async def _load_cleaned_data_from_database(self, session_id: str) -> Optional[str]:
-        """Load cleaned CSV data from database via HTTP API."""
+        """Load cleaned CSV data from database via the experiment repository."""
         try:
-            import httpx
+            cleaned_csv = await self.experiment_repository.get_csv(session_id)
+            if not cleaned_csv:
+                logger.info(f"No cleaned data in database for session {session_id}")
+                return None
+            return cleaned_csv
             
-            # Use httpx to call our own API endpoint
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"http://localhost:8000/api/dataclean/csv-conversation/get-cleaned-data/{session_id}"
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("cleaned_csv")
-                else:
-                    logger.info(f"No cleaned data in database for session {session_id}")
-                    return None
-                    
         except Exception as e:
             logger.info(f"Could not load from database for session {session_id}: {str(e)}")
             return None
@@ -0,0 +1,181 @@
+"""
+Copy-on-Write Frames for ScioScribe Data Cleaning System.
+
+A DataFrame passes through the data store, the transformation engine and the
+version history several times for every applied suggestion. Instead of each
+of them taking a defensive full copy, frames in the data cleaning flow are
+copy-on-write:
+
+- a *frozen* column is backed by arrays that nobody writes into, so any
+  number of frames, stored DataFrames and versions can reference it
+- freeze_frame() returns a frame whose columns are all frozen, copying only
+  the columns that are not frozen yet; a frame that came out of the store or
+  a previous transformation is frozen already and costs nothing
+- derive_frame() gives a transformation a shallow frame to work on:
+  assigning ``df[column] = ...`` replaces the column in the derived frame
+  only, so a transformation materializes just the columns it touches
+
+Frozen numeric, boolean and datetime buffers are marked read-only, so
+writing into such a column in place (``df.loc[i, column] = value``,
+``fillna(inplace=True)``) raises ``ValueError: assignment destination is
+read-only`` instead of silently changing stored data; assign a new column
+instead. Object buffers are not marked, since some pandas functions (e.g.
+``memory_usage(deep=True)``) cannot read read-only object arrays; for them,
+as for pandas' own shallow copies, sharing relies on nobody writing in place.
+
+Column copies made here, and new columns frozen in place, are counted
+(get_copy_stats) so benchmarks can check how much a code path copies.
+"""
+
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_copy_stats = {"frames_frozen": 0, "columns_copied": 0, "bytes_copied": 0, "columns_adopted": 0}
+
+# Root arrays of frozen columns by id; entries disappear with their arrays
+_frozen_roots: "weakref.WeakValueDictionary[int, np.ndarray]" = weakref.WeakValueDictionary()
+
+
+def freeze_frame(df: pd.DataFrame, adopt: bool = False) -> pd.DataFrame:
+    """
+    Return a frame with the same data whose columns are all frozen.
+
+    Args:
+        df: Frame to freeze
+        adopt: Freeze writable columns in place instead of copying them; only
+            for frames whose writable columns nobody else references (e.g. the
+            result of a transformation on a derived frame)
+
+    Returns:
+        New frame sharing every frozen column of ``df`` (and its index)
+    """
+    arrays = [freeze_array(df.iloc[:, position].array, adopt) for position in range(df.shape[1])]
+    _copy_stats["frames_frozen"] += 1
+    return frame_from_arrays(df.index, df.columns, arrays)
+
+
+def freeze_array(array: Any, adopt: bool = False) -> Any:
+    """
+    Return a frozen version of a column array.
+
+    Args:
+        array: Column array (``Series.array``)
+        adopt: Freeze the array in place instead of copying it
+
+    Returns:
+        ``array`` itself if it is frozen (or adopted), otherwise a frozen copy
+    """
+    if is_frozen(array):
+        return array
+    if adopt and _buffers(array):
+        _freeze_buffers(array)
+        _copy_stats["columns_adopted"] += 1
+        return array
+
+    copied = array.copy()
+    _freeze_buffers(copied)
+    _copy_stats["columns_copied"] += 1
+    _copy_stats["bytes_copied"] += int(getattr(copied, "nbytes", 0))
+    return copied
+
+
+def is_frozen(array: Any) -> bool:
+    """Whether a column array is backed only by frozen memory."""
+    if hasattr(array, "_pa_array"):
+        # Arrow-backed arrays are immutable
+        return True
+    buffers = _buffers(array)
+    return bool(buffers) and all(_is_frozen_buffer(buffer) for buffer in buffers)
+
+
+def frozen_identity(array: Any) -> Optional[Tuple[Tuple, List[np.ndarray]]]:
+    """
+    Identity of a frozen column's data, for caching values derived from it.
+
+    Arrays viewing the same frozen memory with the same layout and dtype get
+    equal identities. Frozen memory never changes, so a cached value stays
+    valid for as long as the returned root arrays are alive.
+
+    Returns:
+        (hashable identity, root arrays), or None if the array is not frozen
+    """
+    buffers = _buffers(array)
+    if not buffers or not is_frozen(array):
+        return None
+    identity = (str(array.dtype),) + tuple(
+        (buffer.__array_interface__["data"][0], buffer.shape, buffer.strides, buffer.dtype.str)
+        for buffer in buffers
+    )
+    return identity, [_root(buffer) for buffer in buffers]
+
+
+def derive_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shallow frame for a transformation to work on.
+
+    Columns assigned on the derived frame replace the column there only; the
+    arrays of ``df`` are never written.
+    """
+    return df.copy(deep=False)
+
+
+def frame_from_arrays(index: pd.Index, columns: pd.Index, arrays: List[Any]) -> pd.DataFrame:
+    """Build a frame that references the given column arrays without copying them."""
+    frame = pd.DataFrame(dict(zip(range(len(arrays)), arrays)), index=index, copy=False)
+    frame.columns = columns
+    return frame
+
+
+def get_copy_stats() -> Dict[str, int]:
+    """Counters of frames frozen, columns (and bytes) copied while freezing and columns adopted."""
+    return dict(_copy_stats)
+
+
+def reset_copy_stats() -> None:
+    """Reset the copy counters."""
+    for key in _copy_stats:
+        _copy_stats[key] = 0
+
+
+def _buffers(array: Any) -> List[np.ndarray]:
+    """The numpy buffers holding a column array's data."""
+    if isinstance(array, np.ndarray):
+        return [array]
+    # NumpyExtensionArray, datetime/timedelta arrays and Categorical codes keep
+    # an ``_ndarray``; masked (nullable) arrays keep ``_data`` and ``_mask``
+    buffers = []
+    for name in ("_ndarray", "_data", "_mask"):
+        value = getattr(array, name, None)
+        if isinstance(value, np.ndarray):
+            buffers.append(value)
+    return buffers
+
+
+def _root(buffer: np.ndarray) -> np.ndarray:
+    """The array a buffer is ultimately a view of (the buffer itself if it owns its data)."""
+    while isinstance(buffer.base, np.ndarray):
+        buffer = buffer.base
+    return buffer
+
+
+def _is_frozen_buffer(buffer: np.ndarray) -> bool:
+    """Whether a buffer is a view of a frozen root, and read-only unless it holds objects."""
+    root = _root(buffer)
+    if _frozen_roots.get(id(root)) is not root:
+        return False
+    return buffer.dtype == object or not buffer.flags.writeable
+
+
+def _freeze_buffers(array: Any) -> None:
+    """Register a column array's buffers as frozen, marking non-object ones read-only."""
+    for buffer in _buffers(array):
+        root = _root(buffer)
+        if buffer.dtype != object:
+            view = buffer
+            while isinstance(view, np.ndarray):
+                view.flags.writeable = False
+                view = view.base
+        _frozen_roots[id(root)] = root
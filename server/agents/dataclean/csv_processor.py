@@ -5,7 +5,6 @@ This module provides direct CSV string processing without the complexity
 of data artifacts, enabling streamlined conversation-based data cleaning.
 """
 
-import io
 import uuid
 import pandas as pd
 from typing import List, Dict, Any, Optional
@@ -19,6 +18,8 @@ from .models import (
     CSVAnalysisResult
 )
 from .quality_agent import DataQualityAgent
+from .frame_cache import get_frame_cache
+from .cow_frame import derive_frame
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,7 @@ class CSVDirectProcessor:
         """Initialize the CSV processor."""
         self.openai_client = openai_client
         self.quality_agent = DataQualityAgent(openai_client) if openai_client else None
+        self.frame_cache = get_frame_cache()
         self.session_states: Dict[str, CSVConversationState] = {}
     
     async def process_csv_message(self, request: CSVMessageRequest) -> CSVProcessingResponse:
@@ -73,8 +75,8 @@ class CSVDirectProcessor:
             # Update or create session state
             state = self._get_or_create_session_state(request, df)
             
-            # Analyze CSV quality
-            analysis_result = await self.analyze_csv_quality(request.csv_data)
+            # Analyze CSV quality on the already parsed frame
+            analysis_result = await self.analyze_frame_quality(df)
             
             # Determine response based on user message
             if request.user_message.lower().strip() in ["hi", "hello", "hey"]:
@@ -127,19 +129,30 @@ class CSVDirectProcessor:
         Returns:
             CSVAnalysisResult with quality analysis
         """
-        try:
-            # Parse CSV
-            df = self._parse_csv_string(csv_data)
-            if df is None:
-                return CSVAnalysisResult(
-                    data_shape=[0, 0],
-                    column_names=[],
-                    quality_issues=["Invalid CSV format"],
-                    suggestions=["Please provide valid CSV data"],
-                    confidence_score=0.0,
-                    analysis_notes=["CSV parsing failed"]
-                )
+        # Parse CSV (cached by content hash)
+        return await self.analyze_frame_quality(self._parse_csv_string(csv_data))
+    
+    async def analyze_frame_quality(self, df: Optional[pd.DataFrame]) -> CSVAnalysisResult:
+        """
+        Analyze the quality of an already parsed DataFrame.
+        
+        Args:
+            df: Parsed DataFrame (treated as read-only), or None if parsing failed
             
+        Returns:
+            CSVAnalysisResult with quality analysis
+        """
+        if df is None:
+            return CSVAnalysisResult(
+                data_shape=[0, 0],
+                column_names=[],
+                quality_issues=["Invalid CSV format"],
+                suggestions=["Please provide valid CSV data"],
+                confidence_score=0.0,
+                analysis_notes=["CSV parsing failed"]
+            )
+        
+        try:
             # Basic analysis
             data_shape = [len(df), len(df.columns)]
             column_names = df.columns.tolist()
@@ -234,12 +247,41 @@ class CSVDirectProcessor:
         Returns:
             Transformed CSV data as string
         """
+        df = self._parse_csv_string(csv_data)
+        if df is None:
+            return csv_data
+        
         try:
-            df = self._parse_csv_string(csv_data)
-            if df is None:
-                return csv_data
+            transformed_df = await self.apply_frame_transformations(df, transformations)
             
+            # Convert back to CSV string
+            return self._dataframe_to_csv_string(transformed_df)
+            
+        except Exception as e:
+            logger.error(f"Error applying transformations: {str(e)}")
+            return csv_data
+    
+    async def apply_frame_transformations(self, df: pd.DataFrame, transformations: List[str]) -> pd.DataFrame:
+        """
+        Apply transformations to a parsed DataFrame.
+        
+        The input frame may be shared through the frame cache, so it is never
+        modified; a new DataFrame is returned instead.
+        
+        Args:
+            df: Parsed DataFrame
+            transformations: List of transformation descriptions
+            
+        Returns:
+            Transformed DataFrame, or the input frame unchanged if a
+            transformation fails
+        """
+        original_df = df
+        try:
+            # Transformations only replace whole columns, so a shallow frame suffices
+            df = derive_frame(df)
             original_shape = df.shape
+            
             applied_changes = []
             
             # Apply transformations in order
@@ -250,11 +292,11 @@ class CSVDirectProcessor:
                     after_count = len(df)
                     if before_count != after_count:
                         applied_changes.append(f"Removed {before_count - after_count} duplicate rows")
-                        
+                    
                 elif "fill missing" in transformation.lower():
                     # Count missing values before
                     missing_before = df.isnull().sum().sum()
-                    
+                
                     # Fill missing values with appropriate strategies
                     for col in df.columns:
                         if df[col].isnull().any():
@@ -268,18 +310,18 @@ class CSVDirectProcessor:
                                     df[col] = df[col].fillna(mode_val.iloc[0])
                                 else:
                                     df[col] = df[col].fillna("")
-                    
+                
                     missing_after = df.isnull().sum().sum()
                     if missing_before != missing_after:
                         applied_changes.append(f"Filled {missing_before - missing_after} missing values")
-                        
+                    
                 elif "remove empty rows" in transformation.lower():
                     before_count = len(df)
                     df = df.dropna(how='all')
                     after_count = len(df)
                     if before_count != after_count:
                         applied_changes.append(f"Removed {before_count - after_count} empty rows")
-                        
+                    
                 elif "clean whitespace" in transformation.lower():
                     # Trim whitespace from string columns
                     for col in df.columns:
@@ -310,31 +352,21 @@ class CSVDirectProcessor:
             logger.info(f"Applied {len(transformations)} transformations. Shape: {original_shape} → {new_shape}")
             logger.info(f"Changes applied: {applied_changes}")
             
-            # Convert back to CSV string
-            return self._dataframe_to_csv_string(df)
+            return df
             
         except Exception as e:
             logger.error(f"Error applying transformations: {str(e)}")
-            return csv_data
+            return original_df
     
     def _parse_csv_string(self, csv_data: str) -> Optional[pd.DataFrame]:
-        """Parse CSV string to DataFrame."""
-        try:
-            # Try different parsing options
-            for separator in [',', ';', '\t']:
-                try:
-                    df = pd.read_csv(io.StringIO(csv_data), sep=separator)
-                    if len(df.columns) > 1:  # Multiple columns indicate success
-                        return df
-                except:
-                    continue
-            
-            # Fallback to comma separator
-            return pd.read_csv(io.StringIO(csv_data))
-            
-        except Exception as e:
-            logger.error(f"Error parsing CSV: {str(e)}")
-            return None
+        """
+        Parse CSV string to DataFrame through the shared frame cache.
+        
+        The returned frame may be shared with other callers and must not be
+        modified in place.
+        """
+        handle = self.frame_cache.parse(csv_data)
+        return handle.frame if handle is not None else None
     
     def _dataframe_to_csv_string(self, df: pd.DataFrame) -> str:
         """Convert DataFrame to CSV string."""
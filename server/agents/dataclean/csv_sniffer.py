@@ -0,0 +1,156 @@
+"""
+CSV Dialect Sniffer for ScioScribe.
+
+Works out how to parse a CSV file or string from a bounded prefix of it, so
+the parser runs once with the right options instead of once per guessed
+encoding or separator:
+
+- encoding: UTF-8 if the prefix decodes as UTF-8 (plain ASCII included),
+  otherwise the guess of a charset detector (charset_normalizer when
+  installed, chardet otherwise)
+- delimiter and quote character: ``csv.Sniffer`` restricted to the
+  delimiters CSV exports actually use
+- header: the first row is always the header, as ``pd.read_csv`` assumes.
+  ``csv.Sniffer.has_header`` is not used: scientific exports often have
+  numeric header names (years, time points, wavelengths), which it takes
+  for data. Callers that know a file has no header can pass
+  ``has_header=False``; its columns are named column_1, column_2, ...
+
+The file prefix length is the encoding_sniff_bytes setting.
+"""
+
+import csv
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import chardet
+
+from config import get_settings
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+logger = logging.getLogger(__name__)
+
+# Delimiters the sniffer chooses from, in order of preference
+DELIMITERS = ',;\t|'
+
+# Characters of a CSV string looked at by sniff_text
+DEFAULT_SNIFF_CHARS = 64 * 1024
+
+
+@dataclass(frozen=True)
+class CSVDialect:
+    """How to parse a CSV file or string."""
+    encoding: str = 'utf-8'
+    delimiter: str = ','
+    quotechar: str = '"'
+    has_header: bool = True
+    field_count: int = 0
+
+    def read_csv_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for ``pd.read_csv`` (without the encoding)."""
+        kwargs: Dict[str, Any] = {'sep': self.delimiter, 'quotechar': self.quotechar}
+        if not self.has_header:
+            kwargs['header'] = None
+            kwargs['names'] = [f'column_{number}' for number in range(1, self.field_count + 1)]
+        return kwargs
+
+
+def sniff_file(file_path: str, sniff_bytes: Optional[int] = None,
+               has_header: bool = True) -> CSVDialect:
+    """
+    Sniff the encoding and dialect of a CSV file from its first bytes.
+
+    Args:
+        file_path: Path to the CSV file
+        sniff_bytes: Length of the prefix to look at (default: encoding_sniff_bytes setting)
+        has_header: Whether the first row is the header
+
+    Returns:
+        Sniffed CSVDialect
+    """
+    sniff_bytes = sniff_bytes or get_settings().encoding_sniff_bytes
+    with open(file_path, 'rb') as f:
+        prefix = f.read(sniff_bytes)
+        truncated = bool(f.read(1))
+    if truncated:
+        prefix = _complete_lines(prefix, b'\n')
+
+    encoding = detect_encoding(prefix)
+    text = prefix.decode(encoding, errors='replace')
+    return _sniff_dialect(text, encoding, has_header)
+
+
+def sniff_text(csv_text: str, sniff_chars: int = DEFAULT_SNIFF_CHARS,
+               has_header: bool = True) -> CSVDialect:
+    """
+    Sniff the dialect of CSV text from its first characters.
+
+    Args:
+        csv_text: CSV data as string
+        sniff_chars: Length of the prefix to look at
+        has_header: Whether the first row is the header
+
+    Returns:
+        Sniffed CSVDialect
+    """
+    text = csv_text
+    if len(text) > sniff_chars:
+        text = _complete_lines(text[:sniff_chars], '\n')
+    return _sniff_dialect(text, 'utf-8', has_header)
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """
+    Detect the encoding of a file from a prefix of its bytes.
+
+    Args:
+        prefix: First bytes of the file, cut at a line end
+
+    Returns:
+        Encoding name; 'utf-8' if the prefix is valid UTF-8 or undetermined
+    """
+    try:
+        prefix.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A character cut off at the end of the prefix is still UTF-8
+        if e.reason == 'unexpected end of data':
+            return 'utf-8'
+
+    if from_bytes is not None:
+        match = from_bytes(prefix).best()
+        encoding = match.encoding if match is not None else None
+    else:
+        encoding = chardet.detect(prefix)['encoding']
+    if not encoding or encoding.lower() == 'ascii':
+        return 'utf-8'
+    return encoding
+
+
+def _sniff_dialect(text: str, encoding: str, has_header: bool = True) -> CSVDialect:
+    """Sniff delimiter and quote character of decoded CSV text."""
+    if not text.strip():
+        return CSVDialect(encoding=encoding, has_header=has_header)
+
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=DELIMITERS)
+        delimiter, quotechar = dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        delimiter, quotechar = ',', '"'
+
+    first_row = next(csv.reader(text.splitlines()[:1], delimiter=delimiter, quotechar=quotechar), [])
+
+    logger.debug(f"Sniffed CSV dialect: encoding={encoding}, delimiter={delimiter!r}")
+    return CSVDialect(encoding=encoding, delimiter=delimiter, quotechar=quotechar,
+                      has_header=has_header, field_count=len(first_row))
+
+
+def _complete_lines(prefix, newline):
+    """Cut a prefix after its last line break, if it has one."""
+    end = prefix.rfind(newline)
+    return prefix[:end + 1] if end > 0 else prefix
@@ -15,7 +15,8 @@ from dataclasses import dataclass
 from enum import Enum
 import re
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+
+from .ocr_service import OCRError, OCRService
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -49,20 +50,25 @@ class EasyOCRProcessor:
     - No complex setup required
     """
     
-    def __init__(self, languages: Optional[List[str]] = None, gpu: bool = True):
+    def __init__(self, languages: Optional[List[str]] = None, gpu: bool = True,
+                 ocr_service: Optional[OCRService] = None):
         """
         Initialize the EasyOCR processor.
         
         Args:
             languages: List of language codes (e.g., ['en', 'es', 'fr'])
             gpu: Whether to use GPU acceleration (if available)
+            ocr_service: OCR worker pool to run text extraction on; if None,
+                an EasyOCR reader is loaded in this process
         """
         self.languages = languages or ['en']  # Default to English
         self.gpu = gpu
         self.reader = None
+        self.ocr_service = ocr_service
         
-        # Initialize EasyOCR reader
-        self._initialize_reader()
+        # Initialize EasyOCR reader, unless the service's workers have their own
+        if self.ocr_service is None:
+            self._initialize_reader()
         
         logger.info(f"EasyOCRProcessor initialized with languages: {self.languages}")
     
@@ -101,11 +107,11 @@ class EasyOCRProcessor:
             quality = await self._assess_image_quality(image)
             processing_notes = [f"Initial image quality: {quality.value}"]
             
-            # Convert PIL image to numpy array for EasyOCR
-            image_array = np.array(image)
+            # Convert PIL image to numpy array for EasyOCR (service workers load the file themselves)
+            image_array = np.array(image) if self.ocr_service is None else None
             
             # Extract text using EasyOCR
-            detected_text_boxes = await self._extract_text_easyocr(image_array)
+            detected_text_boxes = await self._extract_text_easyocr(image_array, image_path)
             processing_notes.append(f"Detected {len(detected_text_boxes)} text regions")
             
             # Process results into structured format
@@ -182,17 +188,16 @@ class EasyOCRProcessor:
             logger.warning(f"Image quality assessment failed: {str(e)}")
             return ImageQuality.FAIR
     
-    async def _extract_text_easyocr(self, image_array: np.ndarray) -> List[Dict[str, Any]]:
+    async def _extract_text_easyocr(self, image_array: Optional[np.ndarray],
+                                    image_path: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract text from image using EasyOCR"""
         try:
-            # Run EasyOCR in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                results = await loop.run_in_executor(
-                    executor,
-                    self.reader.readtext,
-                    image_array
-                )
+            if self.ocr_service is not None and image_path is not None:
+                # Run EasyOCR on the service's worker processes
+                results = await self.ocr_service.readtext(image_path)
+            else:
+                # Run EasyOCR in a worker thread to avoid blocking
+                results = await asyncio.to_thread(self.reader.readtext, image_array)
             
             # Process EasyOCR results
             detected_text_boxes = []
@@ -216,6 +221,9 @@ class EasyOCRProcessor:
             
             return detected_text_boxes
             
+        except OCRError:
+            # Timeouts and worker failures are reported with the result
+            raise
         except Exception as e:
             logger.error(f"EasyOCR extraction failed: {str(e)}")
             return []
@@ -370,8 +378,9 @@ class EasyOCRProcessor:
             return False
     
     def set_languages(self, languages: List[str]):
-        """Change the languages for OCR processing"""
+        """Change the languages for OCR processing (in this process, instead of on the OCR service)"""
         self.languages = languages
+        self.ocr_service = None
         self._initialize_reader()
         logger.info(f"Updated languages to: {self.languages}")
     
@@ -379,6 +388,7 @@ class EasyOCRProcessor:
         """Enable or disable GPU acceleration"""
         if self.gpu != gpu:
             self.gpu = gpu
+            self.ocr_service = None
             self._initialize_reader()
             logger.info(f"GPU acceleration: {'enabled' if gpu else 'disabled'}")
     
@@ -390,7 +400,7 @@ class EasyOCRProcessor:
                 return []
             
             image_array = np.array(image)
-            detected_text_boxes = await self._extract_text_easyocr(image_array)
+            detected_text_boxes = await self._extract_text_easyocr(image_array, image_path)
             
             return detected_text_boxes
             
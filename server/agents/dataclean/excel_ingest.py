@@ -0,0 +1,194 @@
+"""
+Excel Ingestion for ScioScribe.
+
+Instrument vendors ship multi-sheet workbooks, and the default openpyxl
+reader is slow on large ones. This module reads workbooks sheet by sheet:
+
+- the sheets of a workbook are read in parallel on a shared pool of worker
+  processes (excel_max_workers), each worker opening the file itself
+- the calamine engine (python-calamine package) is used when installed, or
+  when configured explicitly (excel_engine); it is much faster on large
+  sheets than openpyxl, which pandas already reads in read-only mode, row
+  by row
+
+shutdown_pool() stops the worker pool (on application shutdown).
+"""
+
+import asyncio
+import importlib.util
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SheetRef = Union[str, int]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def calamine_available() -> bool:
+    """Whether the python-calamine package is installed."""
+    return importlib.util.find_spec("python_calamine") is not None
+
+
+def resolve_engine(file_path: str, engine: Optional[str] = None) -> Optional[str]:
+    """
+    Engine to pass to pandas for a workbook.
+
+    Args:
+        file_path: Path to the workbook
+        engine: 'auto', 'default' or 'calamine' (default: excel_engine setting)
+
+    Returns:
+        'calamine', 'openpyxl' for XLSX files, or None for pandas' choice
+    """
+    engine = engine or get_settings().excel_engine
+    if engine == 'calamine' or (engine == 'auto' and calamine_available()):
+        return 'calamine'
+    if Path(file_path).suffix.lower() == '.xlsx':
+        return 'openpyxl'
+    return None
+
+
+def list_sheets(file_path: str, engine: Optional[str] = None) -> List[str]:
+    """
+    Names of the sheets of a workbook, in order.
+
+    Args:
+        file_path: Path to the workbook
+        engine: Reader engine setting (default: excel_engine setting)
+
+    Returns:
+        Sheet names
+    """
+    with pd.ExcelFile(file_path, engine=resolve_engine(file_path, engine)) as workbook:
+        return list(workbook.sheet_names)
+
+
+def select_sheets(file_path: str, sheets: Optional[Sequence[SheetRef]] = None,
+                  engine: Optional[str] = None) -> List[str]:
+    """
+    Names of selected sheets of a workbook.
+
+    Args:
+        file_path: Path to the workbook
+        sheets: Sheet names or positions (default: every sheet)
+        engine: Reader engine setting (default: excel_engine setting)
+
+    Returns:
+        Sheet names, in the order requested
+
+    Raises:
+        ValueError: If a selected sheet does not exist
+    """
+    sheet_names = list_sheets(file_path, engine)
+    if sheets is None:
+        return sheet_names
+    return list(dict.fromkeys(_sheet_name(sheet_names, sheet) for sheet in sheets))
+
+
+def read_sheet(file_path: str, sheet: SheetRef = 0, engine: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read one sheet of a workbook.
+
+    Args:
+        file_path: Path to the workbook
+        sheet: Sheet name or position
+        engine: Reader engine setting (default: excel_engine setting)
+
+    Returns:
+        Sheet contents with the first row as header
+    """
+    return pd.read_excel(file_path, sheet_name=sheet, engine=resolve_engine(file_path, engine))
+
+
+def read_sheets(file_path: str, sheets: Optional[Sequence[SheetRef]] = None,
+                engine: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Read several sheets of a workbook, in parallel when there is more than one.
+
+    Args:
+        file_path: Path to the workbook
+        sheets: Sheet names or positions (default: every sheet)
+        engine: Reader engine setting (default: excel_engine setting)
+
+    Returns:
+        Sheet contents by sheet name, in the order requested
+    """
+    names = select_sheets(file_path, sheets, engine)
+
+    if len(names) == 1 or get_settings().excel_max_workers == 1:
+        return {name: read_sheet(file_path, name, engine) for name in names}
+
+    pool = _get_pool()
+    futures = [pool.submit(read_sheet, file_path, name, engine) for name in names]
+    return {name: future.result() for name, future in zip(names, futures)}
+
+
+async def read_sheets_async(file_path: str, sheets: Optional[Sequence[SheetRef]] = None,
+                            engine: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """read_sheets() off the event loop."""
+    return await asyncio.to_thread(read_sheets, file_path, sheets, engine)
+
+
+def parse_sheet_selection(selection: Optional[str]) -> Optional[List[SheetRef]]:
+    """
+    Parse a sheet selection given as request parameter.
+
+    Args:
+        selection: 'all', or comma-separated sheet names or positions
+
+    Returns:
+        None for every sheet, otherwise the selected sheets
+    """
+    if selection is None or selection.strip().lower() == 'all':
+        return None
+    sheets: List[SheetRef] = []
+    for part in selection.split(','):
+        part = part.strip()
+        if part:
+            sheets.append(int(part) if part.isdigit() else part)
+    return sheets
+
+
+def shutdown_pool(wait: bool = True) -> None:
+    """Shut down the shared sheet reader pool (e.g. on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+        _pool = None
+
+
+def _sheet_name(sheet_names: List[str], sheet: SheetRef) -> str:
+    """Name of a sheet given by name or position."""
+    if isinstance(sheet, int):
+        if not 0 <= sheet < len(sheet_names):
+            raise ValueError(f"Worksheet index {sheet} is invalid, {len(sheet_names)} worksheets found")
+        return sheet_names[sheet]
+    if sheet not in sheet_names:
+        raise ValueError(f"Worksheet named '{sheet}' not found")
+    return sheet
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared pool of sheet reader processes, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: the server process runs threads
+            _pool = ProcessPoolExecutor(
+                max_workers=get_settings().excel_max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Started Excel reader pool with {get_settings().excel_max_workers} workers")
+        return _pool
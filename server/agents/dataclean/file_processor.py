@@ -5,16 +5,20 @@ This agent handles the initial processing of uploaded files, converting them
 to a standardized DataFrame format for further analysis.
 """
 
+import asyncio
 import os
 import uuid
 import pandas as pd
-import chardet
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import logging
 
+from ..profiling import profile_frame
 from .models import ProcessingResult, FileMetadata
 from .easyocr_processor import EasyOCRProcessor
+from .ocr_service import get_ocr_service
+from .ingest import read_csv_file
+from .excel_ingest import SheetRef, read_sheet, read_sheets_async
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +35,7 @@ class FileProcessingAgent:
         
         # Initialize EasyOCR processor for image processing
         try:
-            self.ocr_processor = EasyOCRProcessor(languages=['en'], gpu=False)
+            self.ocr_processor = EasyOCRProcessor(languages=['en'], gpu=False, ocr_service=get_ocr_service())
             logger.info("EasyOCR initialized successfully")
         except Exception as e:
             logger.error(f"EasyOCR initialization failed: {str(e)}")
@@ -48,7 +52,7 @@ class FileProcessingAgent:
             file_type: MIME type of the file
             
         Returns:
-            ProcessingResult with success status and processed data
+            ProcessingResult with success status, data preview and the parsed DataFrame
         """
         try:
             logger.info(f"Processing file: {file_path}, type: {file_type}")
@@ -76,18 +80,7 @@ class FileProcessingAgent:
                     error_message=f"Handler not implemented for: {file_extension}"
                 )
             
-            # Generate data preview
-            data_preview = self._generate_data_preview(dataframe)
-            
-            return ProcessingResult(
-                success=True,
-                data_preview=data_preview,
-                file_info={
-                    'shape': dataframe.shape,
-                    'columns': list(dataframe.columns),
-                    'dtypes': dataframe.dtypes.to_dict()
-                }
-            )
+            return self._frame_result(dataframe)
             
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {str(e)}")
@@ -96,9 +89,38 @@ class FileProcessingAgent:
                 error_message=f"Processing failed: {str(e)}"
             )
     
+    async def process_workbook(self, file_path: str,
+                               sheets: Optional[List[SheetRef]] = None) -> Dict[str, ProcessingResult]:
+        """
+        Process several sheets of an Excel workbook, reading them in parallel.
+        
+        Args:
+            file_path: Path to the workbook
+            sheets: Sheet names or positions (default: every sheet)
+            
+        Returns:
+            ProcessingResult for each sheet, by sheet name
+        """
+        logger.info(f"Processing workbook: {file_path}, sheets: {sheets or 'all'}")
+        frames = await read_sheets_async(file_path, sheets)
+        return {name: self._frame_result(dataframe) for name, dataframe in frames.items()}
+    
+    def _frame_result(self, dataframe: pd.DataFrame) -> ProcessingResult:
+        """Successful ProcessingResult for a parsed DataFrame, with its preview."""
+        return ProcessingResult(
+            success=True,
+            data_preview=self._generate_data_preview(dataframe),
+            dataframe=dataframe,
+            file_info={
+                'shape': dataframe.shape,
+                'columns': list(dataframe.columns),
+                'dtypes': dataframe.dtypes.to_dict()
+            }
+        )
+    
     async def _process_csv(self, file_path: str) -> pd.DataFrame:
         """
-        Process CSV files with encoding detection.
+        Process CSV files with encoding detection, in bounded memory.
         
         Args:
             file_path: Path to the CSV file
@@ -107,25 +129,8 @@ class FileProcessingAgent:
             Processed DataFrame
         """
         try:
-            # Detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                encoding_result = chardet.detect(raw_data)
-                encoding = encoding_result['encoding'] or 'utf-8'
-            
-            # Try to read with detected encoding
-            try:
-                df = pd.read_csv(file_path, encoding=encoding)
-            except UnicodeDecodeError:
-                # Fallback to common encodings
-                for enc in ['utf-8', 'latin-1', 'cp1252']:
-                    try:
-                        df = pd.read_csv(file_path, encoding=enc)
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    raise ValueError("Could not determine file encoding")
+            # Encoding is sniffed from a bounded prefix and the file is parsed in chunks
+            df = await asyncio.to_thread(read_csv_file, file_path)
             
             logger.info(f"Successfully processed CSV with shape: {df.shape}")
             return df
@@ -145,8 +150,8 @@ class FileProcessingAgent:
             Processed DataFrame
         """
         try:
-            # Read Excel file - use first sheet by default
-            df = pd.read_excel(file_path, sheet_name=0)
+            # Read the first sheet, with the fastest available engine
+            df = await asyncio.to_thread(read_sheet, file_path, 0)
             
             logger.info(f"Successfully processed Excel with shape: {df.shape}")
             return df
@@ -196,18 +201,15 @@ class FileProcessingAgent:
         Returns:
             Dictionary containing data preview information
         """
-        preview = {
+        # One bulk profiling pass for null counts and numeric statistics
+        profile = profile_frame(df, first_k=0, top_k=0, quantiles=(0.25, 0.5, 0.75))
+        
+        return {
             'shape': df.shape,
             'columns': list(df.columns),
             'sample_rows': df.head(5).to_dict('records'),
-            'column_types': df.dtypes.astype(str).to_dict(),
-            'null_counts': df.isnull().sum().to_dict(),
-            'basic_stats': {}
-        }
-        
-        # Add basic statistics for numeric columns
-        numeric_columns = df.select_dtypes(include=['number']).columns
-        if len(numeric_columns) > 0:
-            preview['basic_stats'] = df[numeric_columns].describe().to_dict()
-        
-        return preview 
\ No newline at end of file
+            'column_types': profile.dtypes(),
+            'null_counts': profile.null_counts(),
+            # Basic statistics for numeric columns, in describe() layout
+            'basic_stats': profile.numeric_stats()
+        } 
\ No newline at end of file
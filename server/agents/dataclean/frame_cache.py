@@ -0,0 +1,215 @@
+"""
+Parsed Frame Cache for the CSV conversation pipeline.
+
+This module keeps parsed DataFrames keyed by a hash of the CSV text they were
+parsed from, so the same CSV string is only run through ``pd.read_csv`` once
+no matter how many nodes in the conversation graph need it. Entries are
+evicted in least-recently-used order once a byte budget is exceeded.
+
+Frames handed out by the cache are shared and must be treated as read-only;
+callers that need to modify one should work on a copy and register the result
+with ``ParsedFrameCache.from_frame``.
+"""
+
+import io
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+from .csv_sniffer import sniff_text
+
+logger = logging.getLogger(__name__)
+
+# Default byte budget for cached frames (512MB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def hash_csv_text(csv_text: str) -> str:
+    """Return the content hash used as the cache key for a CSV string."""
+    return hashlib.blake2b(csv_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_csv_text(csv_text: str) -> Optional[pd.DataFrame]:
+    """
+    Parse CSV text to a DataFrame, sniffing the dialect from its first lines.
+
+    Args:
+        csv_text: CSV data as string
+
+    Returns:
+        Parsed DataFrame, or None if the text cannot be parsed
+    """
+    try:
+        try:
+            return pd.read_csv(io.StringIO(csv_text), **sniff_text(csv_text).read_csv_kwargs())
+        except Exception as e:
+            logger.info(f"Sniffed CSV dialect failed ({str(e)}), parsing as comma separated")
+
+        # Fallback to comma separator
+        return pd.read_csv(io.StringIO(csv_text))
+
+    except Exception as e:
+        logger.error(f"Error parsing CSV: {str(e)}")
+        return None
+
+
+@dataclass
+class FrameHandle:
+    """
+    Reference to a parsed DataFrame carried in conversation state.
+
+    The handle keeps the frame alive independently of the cache, so eviction
+    never loses session data. The CSV text is produced lazily and memoized.
+    """
+    key: str
+    frame: pd.DataFrame
+    _csv_text: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def shape(self):
+        """Shape of the underlying frame."""
+        return self.frame.shape
+
+    def to_csv(self) -> str:
+        """Return the CSV text for this frame, serializing at most once."""
+        if self._csv_text is None:
+            self._csv_text = self.frame.to_csv(index=False)
+        return self._csv_text
+
+
+class ParsedFrameCache:
+    """
+    Content-hash keyed cache of parsed DataFrames with LRU byte-budget eviction.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the frame cache.
+
+        Args:
+            max_bytes: Maximum total deep memory usage of cached frames
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        logger.info(f"Initialized parsed frame cache with {max_bytes} byte budget")
+
+    def parse(self, csv_text: str) -> Optional[FrameHandle]:
+        """
+        Get a handle for CSV text, parsing it only on a cache miss.
+
+        Args:
+            csv_text: CSV data as string
+
+        Returns:
+            FrameHandle if the text could be parsed, None otherwise
+        """
+        key = hash_csv_text(csv_text)
+
+        frame = self._lookup(key)
+        if frame is None:
+            frame = parse_csv_text(csv_text)
+            if frame is None:
+                return None
+            self._store(key, frame)
+
+        return FrameHandle(key=key, frame=frame, _csv_text=csv_text)
+
+    def from_frame(self, frame: pd.DataFrame) -> FrameHandle:
+        """
+        Register a newly produced DataFrame and return a handle to it.
+
+        The frame is serialized once so that a later request carrying the same
+        CSV text (e.g. the client echoing back cleaned data) is a cache hit.
+
+        Args:
+            frame: DataFrame to register; it must not be modified afterwards
+
+        Returns:
+            FrameHandle for the frame
+        """
+        csv_text = frame.to_csv(index=False)
+        key = hash_csv_text(csv_text)
+        self._store(key, frame)
+        return FrameHandle(key=key, frame=frame, _csv_text=csv_text)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame for a key, or None if absent."""
+        return self._lookup(key)
+
+    def clear(self) -> None:
+        """Drop all cached frames."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def _lookup(self, key: str) -> Optional[pd.DataFrame]:
+        """Look up a key and mark it as most recently used."""
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def _store(self, key: str, frame: pd.DataFrame) -> None:
+        """Insert a frame and evict least recently used entries over budget."""
+        size = int(frame.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            logger.info(f"Frame {key} ({size} bytes) exceeds cache budget, not cached")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = frame
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(evicted_key)
+                logger.debug(f"Evicted frame {evicted_key} from parsed frame cache")
+
+
+# Global instance
+_frame_cache = None
+
+
+def get_frame_cache() -> ParsedFrameCache:
+    """Get the global parsed frame cache instance."""
+    global _frame_cache
+    if _frame_cache is None:
+        _frame_cache = ParsedFrameCache()
+    return _frame_cache
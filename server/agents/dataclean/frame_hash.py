@@ -0,0 +1,175 @@
+"""
+Content Hashing of DataFrames for the ScioScribe Data Cleaning System.
+
+Every data version records a hash of its data for integrity checking. The
+hash is computed per column: ``pd.util.hash_pandas_object`` turns a column
+into one 64-bit hash per value (vectorized, no text rendering), and those are
+digested with xxHash (XXH3-128) when the ``xxhash`` package is installed, or
+BLAKE2b otherwise. The frame hash combines the shape, the index, the column
+labels and the column digests. Object columns holding unhashable values
+(lists, dicts, sets from JSON-like data) are hashed through the pickled
+bytes of each value instead.
+
+Column digests of frozen columns (see cow_frame.py) are cached: a frozen
+column never changes, and versions share the frozen columns a transformation
+did not touch, so hashing a new version only hashes the columns that
+changed. Cache entries are dropped when their column's memory is freed.
+"""
+
+import hashlib
+import logging
+import pickle
+import threading
+import weakref
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from .cow_frame import frozen_identity
+
+logger = logging.getLogger(__name__)
+
+
+def _new_digest() -> Any:
+    """A fresh 128-bit hasher: XXH3 if available, else BLAKE2b."""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_values(values: Any) -> bytes:
+    """
+    Digest of a column's (or an index's) values and dtype.
+
+    Args:
+        values: Series or Index
+
+    Returns:
+        16-byte digest
+    """
+    digest = _new_digest()
+    digest.update(str(values.dtype).encode("utf-8"))
+    try:
+        hashes = _hash_pandas(values)
+    except TypeError:
+        # Unhashable values (lists, dicts) cannot be hashed by pandas
+        hashes = _hash_pandas(values.map(_value_bytes))
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.digest()
+
+
+def _hash_pandas(values: Any) -> pd.Series:
+    """One 64-bit hash per value of a Series (without its index) or Index."""
+    if isinstance(values, pd.Series):
+        return pd.util.hash_pandas_object(values, index=False)
+    return pd.util.hash_pandas_object(values)
+
+
+def _value_bytes(value: Any) -> bytes:
+    """Bytes standing for a value that pandas cannot hash."""
+    try:
+        return pickle.dumps(value, protocol=4)
+    except Exception:
+        return repr(value).encode("utf-8")
+
+
+class ColumnHashCache:
+    """
+    Column digests keyed by the identity of frozen column memory.
+    """
+
+    def __init__(self):
+        self._digests: Dict[Tuple, Tuple[list, bytes]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "uncached": 0}
+
+    def column_digest(self, column: pd.Series) -> bytes:
+        """
+        Digest of a column, computed once per frozen column.
+
+        Args:
+            column: Column of a DataFrame
+
+        Returns:
+            16-byte digest
+        """
+        frozen = frozen_identity(column.array)
+        if frozen is None:
+            # Writable columns may change, so their digest is not reusable
+            self._stats["uncached"] += 1
+            return hash_values(column)
+
+        identity, roots = frozen
+        with self._lock:
+            entry = self._digests.get(identity)
+            if entry is not None and all(ref() is root for ref, root in zip(entry[0], roots)):
+                self._stats["hits"] += 1
+                return entry[1]
+
+        digest = hash_values(column)
+        refs = [weakref.ref(root, lambda _, identity=identity: self._forget(identity)) for root in roots]
+        with self._lock:
+            self._digests[identity] = (refs, digest)
+            self._stats["misses"] += 1
+        return digest
+
+    def _forget(self, identity: Tuple) -> None:
+        """Drop an entry whose column memory was freed"""
+        with self._lock:
+            self._digests.pop(identity, None)
+
+    def clear(self) -> None:
+        """Remove all cached digests."""
+        with self._lock:
+            self._digests.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Hit/miss counters and the number of cached digests
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._digests)}
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame.
+
+    Args:
+        df: DataFrame to hash
+
+    Returns:
+        Hex digest covering shape, index, column labels and values
+    """
+    digest = _new_digest()
+    digest.update(repr(df.shape).encode("utf-8"))
+    if isinstance(df.index, pd.RangeIndex):
+        digest.update(repr((df.index.start, df.index.stop, df.index.step)).encode("utf-8"))
+    else:
+        digest.update(hash_values(df.index))
+    digest.update(repr(list(df.columns)).encode("utf-8"))
+
+    cache = get_column_hash_cache()
+    for position in range(df.shape[1]):
+        digest.update(cache.column_digest(df.iloc[:, position]))
+    return digest.hexdigest()
+
+
+# Global cache instance
+_column_hash_cache = None
+
+
+def get_column_hash_cache() -> ColumnHashCache:
+    """Get the global column hash cache instance."""
+    global _column_hash_cache
+    if _column_hash_cache is None:
+        _column_hash_cache = ColumnHashCache()
+    return _column_hash_cache
@@ -0,0 +1,183 @@
+"""
+Streaming File Ingestion for ScioScribe.
+
+Uploads used to be read into memory whole (``await file.read()``) before being
+written to disk, and CSV ingestion read the whole file again for encoding
+detection before parsing it, so peak memory was several times the file size.
+This module keeps every step bounded:
+
+- uploads are copied to disk in fixed-size chunks
+- the encoding and CSV dialect are sniffed from a bounded prefix of the file
+  (csv_sniffer.py)
+- CSV files are parsed a fixed number of rows at a time, with one type per
+  column across chunks
+
+Chunk sizes come from the settings (upload_chunk_bytes, encoding_sniff_bytes,
+csv_chunk_rows). sample_frame() draws the bounded, representative sample that
+background quality analysis runs on.
+"""
+
+import logging
+from typing import List, Optional
+
+import aiofiles
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+from config import get_settings
+from .csv_sniffer import CSVDialect, sniff_file
+
+logger = logging.getLogger(__name__)
+
+# Encodings tried, in order, when the detected one cannot decode the file
+FALLBACK_ENCODINGS = ['utf-8', 'latin-1', 'cp1252']
+
+# Value kinds (as given by infer_dtype) that concatenate to one numeric column
+_NUMERIC_KINDS = {'integer': 'numeric', 'floating': 'numeric', 'mixed-integer-float': 'numeric'}
+
+# Leading rows always kept in a sample, as users see them first
+_SAMPLE_HEAD_ROWS = 5
+
+
+async def save_upload(upload, destination: str, chunk_bytes: Optional[int] = None) -> int:
+    """
+    Copy an uploaded file to disk one chunk at a time.
+
+    Args:
+        upload: FastAPI UploadFile
+        destination: Path of the file to write
+        chunk_bytes: Chunk size (default: upload_chunk_bytes setting)
+
+    Returns:
+        Size of the upload in bytes
+    """
+    chunk_bytes = chunk_bytes or get_settings().upload_chunk_bytes
+    size = 0
+    async with aiofiles.open(destination, 'wb') as f:
+        while True:
+            chunk = await upload.read(chunk_bytes)
+            if not chunk:
+                break
+            await f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def read_csv_chunked(file_path: str, encoding: str, dialect: Optional[CSVDialect] = None,
+                     chunk_rows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Parse a CSV file a fixed number of rows at a time.
+
+    Each chunk infers its own column types, so a column can come out numeric
+    in one chunk and text in another (an ``id`` column with a text value far
+    down the file). Such columns are read again as text, which is what a
+    single ``pd.read_csv`` over the whole file would give them. Parsing in
+    chunks bounds the parser's working memory; the chunks themselves are
+    held until they are concatenated, so peak memory is about twice the
+    parsed frame.
+
+    Args:
+        file_path: Path to the CSV file
+        encoding: Encoding of the file
+        dialect: Sniffed dialect (default: comma separated with a header)
+        chunk_rows: Rows per chunk (default: csv_chunk_rows setting)
+
+    Returns:
+        Parsed DataFrame
+    """
+    chunk_rows = chunk_rows or get_settings().csv_chunk_rows
+    options = (dialect or CSVDialect()).read_csv_kwargs()
+    chunks: List[pd.DataFrame] = []
+    # low_memory=False so the parser does not split a chunk into smaller ones with their own types
+    with pd.read_csv(file_path, encoding=encoding, chunksize=chunk_rows, low_memory=False, **options) as reader:
+        for chunk in reader:
+            chunks.append(chunk)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    mixed = _mixed_type_positions(chunks)
+    df = pd.concat(chunks, ignore_index=True)
+    chunks.clear()
+    if mixed:
+        with pd.read_csv(file_path, encoding=encoding, chunksize=chunk_rows, usecols=mixed,
+                         dtype=str, **options) as reader:
+            text = pd.concat(reader, ignore_index=True)
+        for offset, position in enumerate(mixed):
+            df.isetitem(position, text.iloc[:, offset].to_numpy())
+    return df
+
+
+def _mixed_type_positions(chunks: List[pd.DataFrame]) -> List[int]:
+    """
+    Positions of the columns whose chunks were parsed to incompatible types.
+
+    Chunks holding only missing values in a column do not count, and integer
+    and float chunks concatenate to float as a single parse would give them.
+    """
+    positions = []
+    for position in range(chunks[0].shape[1]):
+        if len({chunk.dtypes.iloc[position] for chunk in chunks}) == 1:
+            continue
+        columns = (chunk.iloc[:, position] for chunk in chunks)
+        kinds = {_NUMERIC_KINDS.get(kind, kind)
+                 for kind in (infer_dtype(column, skipna=True) for column in columns if column.notna().any())}
+        if len(kinds) > 1:
+            positions.append(position)
+    return positions
+
+
+def read_csv_file(file_path: str) -> pd.DataFrame:
+    """
+    Parse a CSV file with encoding and dialect detection, in bounded memory.
+
+    The encoding and dialect are sniffed from a prefix of the file; if the
+    encoding cannot decode the whole file, the fallback encodings are tried
+    in order.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        Parsed DataFrame
+    """
+    dialect = sniff_file(file_path)
+    detected = dialect.encoding
+    encodings = [detected] + [enc for enc in FALLBACK_ENCODINGS if enc != detected.lower()]
+    for encoding in encodings:
+        try:
+            return read_csv_chunked(file_path, encoding, dialect)
+        except UnicodeDecodeError:
+            logger.info(f"Encoding {encoding} could not decode {file_path}, trying the next one")
+            continue
+    raise ValueError("Could not determine file encoding")
+
+
+
+def sample_frame(df: pd.DataFrame, sample_rows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Take a representative, reproducible sample of a DataFrame.
+
+    The first rows are always included; the rest of the sample takes one
+    random row from each of equally sized strata of the remaining rows, so it
+    covers the whole frame in order.
+
+    Args:
+        df: Frame to sample
+        sample_rows: Sample size (default: quality_sample_rows setting)
+
+    Returns:
+        ``df`` itself if it has at most ``sample_rows`` rows, otherwise the
+        sampled rows with a fresh index
+    """
+    sample_rows = sample_rows or get_settings().quality_sample_rows
+    total_rows = len(df)
+    if total_rows <= sample_rows:
+        return df
+    head_rows = min(_SAMPLE_HEAD_ROWS, sample_rows)
+    strata = sample_rows - head_rows
+    bounds = np.linspace(head_rows, total_rows, strata + 1).astype(np.int64)
+    rng = np.random.default_rng(0)
+    offsets = (rng.random(strata) * (bounds[1:] - bounds[:-1])).astype(np.int64)
+    positions = np.concatenate([np.arange(head_rows), bounds[:-1] + offsets])
+    return df.iloc[positions].reset_index(drop=True)
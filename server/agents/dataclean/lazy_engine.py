@@ -0,0 +1,281 @@
+"""
+Lazy Polars Execution of Transformation Pipelines for ScioScribe.
+
+pandas applies transformations one operation at a time on a single thread.
+For very large frames (multi-GB instrument exports), a pipeline can instead
+be translated into a Polars LazyFrame plan: the transformed columns are
+handed to Polars, every transformation becomes an expression, and the plan
+is optimized and executed on all cores. Columns the pipeline does not touch
+never leave pandas; they are shared with the result (see cow_frame.py).
+
+The translation must give exactly what the pandas implementation in
+TransformationEngine gives, so it is limited to the operations and column
+types where Polars semantics match pandas:
+
+- columns of numbers (int/float) or of strings, with missing values
+- REPLACE_VALUES with keys and values of the column's kind (folded into one
+  mapping as in value_mapping.py)
+- CONVERT_TYPE to float of numeric columns
+- FILL_MISSING with a value of the column's kind, or mean/median (numeric),
+  mode, forward and backward fill
+- REMOVE_OUTLIERS with the IQR method
+- STANDARDIZE_FORMAT text (lower/upper case), phone and email
+
+supports() checks a pipeline against a frame; anything else runs on pandas.
+Polars is optional: without the ``polars`` package, supports() is False.
+"""
+
+import logging
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from .cow_frame import derive_frame
+from .models import CustomTransformation, TransformationAction
+from .transformation_pipeline import TransformationPipeline
+from .value_mapping import MISSING, CompiledValueMapping, value_key
+
+logger = logging.getLogger(__name__)
+
+# Row positions of the input, carried through the plan to rebuild the index
+_ROW_COLUMN = "__scioscribe_row__"
+
+# Column kinds the translation handles
+_NUMERIC, _INTEGER, _STRING = "numeric", "integer", "string"
+
+
+def is_available() -> bool:
+    """Whether the lazy engine can be used (Polars is installed)."""
+    return pl is not None
+
+
+def supports(df: pd.DataFrame, pipeline: TransformationPipeline) -> bool:
+    """
+    Whether every transformation of a pipeline can run on Polars with
+    results identical to pandas.
+
+    Args:
+        df: Frame the pipeline would run on
+        pipeline: Transformations to check
+    """
+    if pl is None or not len(pipeline) or not df.columns.is_unique:
+        return False
+    kinds = {}
+    for transformation in pipeline.transformations:
+        column = transformation.column
+        if not isinstance(column, str) or column not in df.columns or column == _ROW_COLUMN:
+            return False
+        if column not in kinds:
+            kinds[column] = _column_kind(df[column])
+        if kinds[column] is None or not _supports_transformation(transformation, kinds[column], df[column]):
+            return False
+    return True
+
+
+def execute(df: pd.DataFrame, pipeline: TransformationPipeline) -> pd.DataFrame:
+    """
+    Run a pipeline as one lazy Polars plan.
+
+    Args:
+        df: Frame to transform; it is not modified
+        pipeline: Transformations, all supported (see supports())
+
+    Returns:
+        Transformed frame sharing every untouched column of ``df``
+    """
+    columns = list(dict.fromkeys(transformation.column for transformation in pipeline.transformations))
+    source = pl.DataFrame([_to_polars(df[column]) for column in columns])
+    plan = source.lazy().with_row_index(_ROW_COLUMN)
+
+    for stage in pipeline.compile():
+        if stage.row_filter is not None:
+            plan = plan.filter(_row_filter(stage.row_filter))
+        else:
+            plan = plan.with_columns([
+                _chain_expression(pl.col(column), chain, source.schema[column]).alias(column)
+                for column, chain in stage.chains.items()
+            ])
+
+    collected = plan.collect()
+    rows = collected.get_column(_ROW_COLUMN).to_numpy()
+
+    if len(rows) == len(df):
+        result = derive_frame(df)
+    else:
+        result = df.take(rows)
+    for column in columns:
+        result[column] = pd.Series(
+            _to_pandas(collected.get_column(column), df[column]), index=result.index, name=column
+        )
+    return result
+
+
+def _column_kind(series: pd.Series) -> Optional[str]:
+    """Kind of a column the translation handles, or None."""
+    if pd.api.types.is_bool_dtype(series.dtype) or isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        return None
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return _INTEGER
+    if pd.api.types.is_float_dtype(series.dtype):
+        return _NUMERIC
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+        return _STRING
+    return None
+
+
+def _is_kind(value: Any, kind: str) -> bool:
+    """Whether a (non-missing) value fits a column kind without changing its dtype in pandas."""
+    if isinstance(value, (bool, np.bool_)):
+        return False
+    if kind == _STRING:
+        return isinstance(value, str)
+    if kind == _INTEGER:
+        return isinstance(value, (int, np.integer))
+    return isinstance(value, (int, float, np.integer, np.floating))
+
+
+def _supports_transformation(transformation: CustomTransformation, kind: str, series: pd.Series) -> bool:
+    """Whether one transformation translates exactly for a column of the given kind."""
+    action = transformation.action
+    parameters = transformation.parameters
+
+    if action == TransformationAction.REPLACE_VALUES:
+        compiled = CompiledValueMapping(transformation.value_mappings)
+        if compiled.final_values is None:
+            return False
+        for key, target in compiled.final_values.items():
+            if key is not MISSING and not _is_kind(key, kind):
+                return False
+            if value_key(target) is not MISSING and not _is_kind(target, kind):
+                return False
+            if kind == _INTEGER and value_key(target) is MISSING:
+                # pandas turns the column into floats (or objects)
+                return False
+        return True
+
+    if action == TransformationAction.CONVERT_TYPE:
+        return parameters.get('target_type', 'str') == 'float' and kind != _STRING
+
+    if action == TransformationAction.FILL_MISSING:
+        strategy = parameters.get('strategy', 'value')
+        if strategy == 'value':
+            return kind != _INTEGER and _is_kind(parameters.get('fill_value', 'Unknown'), kind)
+        if strategy in ('mean', 'median'):
+            return kind == _NUMERIC
+        if strategy == 'mode':
+            # With no values, pandas fills in 'Unknown', turning numbers into objects
+            return kind != _INTEGER and bool(series.notna().any())
+        return strategy in ('forward', 'backward') and kind != _INTEGER
+
+    if action == TransformationAction.REMOVE_OUTLIERS:
+        return parameters.get('method', 'iqr') == 'iqr' and kind != _STRING
+
+    if action == TransformationAction.STANDARDIZE_FORMAT:
+        format_type = parameters.get('format_type', 'text')
+        if kind != _STRING:
+            return False
+        if format_type == 'text':
+            return parameters.get('case', 'lower') in ('lower', 'upper')
+        return format_type in ('phone', 'email')
+
+    return False
+
+
+def _chain_expression(expression: Any, chain: List[CustomTransformation], dtype: Any) -> Any:
+    """Compose the expressions of a column's transformations, in order."""
+    for transformation in chain:
+        expression = _expression(expression, transformation, dtype)
+    return expression
+
+
+def _expression(expression: Any, transformation: CustomTransformation, dtype: Any) -> Any:
+    """Polars expression equivalent to one transformation of a column of the given Polars dtype."""
+    action = transformation.action
+    parameters = transformation.parameters
+
+    if action == TransformationAction.REPLACE_VALUES:
+        final_values = CompiledValueMapping(transformation.value_mappings).final_values
+        plain = {
+            key: target for key, target in final_values.items()
+            if key is not MISSING and value_key(target) is not MISSING
+        }
+        to_missing = [
+            key for key, target in final_values.items()
+            if key is not MISSING and value_key(target) is MISSING
+        ]
+        mapped = expression.replace(_as_dtype(plain, dtype), _as_dtype(plain.values(), dtype)) if plain else expression
+        if to_missing:
+            mapped = pl.when(expression.is_in(_as_dtype(to_missing, dtype))).then(pl.lit(None)).otherwise(mapped)
+        if MISSING in final_values:
+            target = final_values[MISSING]
+            fill = pl.lit(None) if value_key(target) is MISSING else pl.lit(target)
+            mapped = pl.when(expression.is_null()).then(fill).otherwise(mapped)
+        return mapped
+
+    if action == TransformationAction.CONVERT_TYPE:
+        # pd.to_numeric leaves numeric columns as they are
+        return expression
+
+    if action == TransformationAction.FILL_MISSING:
+        strategy = parameters.get('strategy', 'value')
+        if strategy == 'value':
+            return expression.fill_null(pl.lit(parameters.get('fill_value', 'Unknown')))
+        if strategy == 'mean':
+            return expression.fill_null(expression.mean())
+        if strategy == 'median':
+            return expression.fill_null(expression.median())
+        if strategy == 'mode':
+            # pandas uses the smallest of several most frequent values
+            return expression.fill_null(expression.drop_nulls().mode().sort().first())
+        if strategy == 'forward':
+            return expression.forward_fill()
+        return expression.backward_fill()
+
+    if action == TransformationAction.STANDARDIZE_FORMAT:
+        format_type = parameters.get('format_type', 'text')
+        if format_type == 'text':
+            if parameters.get('case', 'lower') == 'lower':
+                expression = expression.str.to_lowercase()
+            else:
+                expression = expression.str.to_uppercase()
+            return expression.str.strip_chars()
+        if format_type == 'phone':
+            return expression.str.replace_all(r'[^\d]', '')
+        return expression.str.to_lowercase().str.strip_chars()
+
+    raise ValueError(f"Unsupported transformation action for lazy execution: {action}")
+
+
+def _as_dtype(values: Any, dtype: Any) -> List[Any]:
+    """Values converted to a column's dtype (Polars 2 no longer coerces is_in/replace keys, e.g. ints on floats)."""
+    return pl.Series(list(values), dtype=dtype).to_list()
+
+
+def _row_filter(transformation: CustomTransformation) -> Any:
+    """Polars predicate keeping the rows outlier removal (IQR) keeps."""
+    column = pl.col(transformation.column)
+    q1 = column.quantile(0.25, interpolation="linear")
+    q3 = column.quantile(0.75, interpolation="linear")
+    iqr = q3 - q1
+    # Missing values compare false in pandas and are dropped as well
+    return (column >= q1 - 1.5 * iqr) & (column <= q3 + 1.5 * iqr)
+
+
+def _to_polars(series: pd.Series) -> Any:
+    """A pandas column as a Polars Series, with NaN and None as null."""
+    if series.dtype == object:
+        values = series.where(series.notna(), None).tolist()
+        return pl.Series(series.name, values, dtype=pl.String)
+    return pl.Series(series.name, series.to_numpy(), nan_to_null=True)
+
+
+def _to_pandas(column: Any, original: pd.Series) -> np.ndarray:
+    """A Polars result column as the values of a pandas column (nulls as None or NaN)."""
+    values = column.to_numpy()
+    return values.astype(object) if original.dtype == object else values
@@ -3,13 +3,33 @@ Memory Data Store for ScioScribe Data Cleaning System.
 
 This module provides in-memory storage for data artifacts, transformation rules,
 and data versions. It serves as a lightweight, no-dependency storage solution.
+
+Data versions are kept in a VersionHistory per artifact, which shares columns
+that did not change between versions instead of copying the whole DataFrame.
+Stored DataFrames and versions hold frozen (read-only) columns, see
+cow_frame.py, so saving a frame that came out of the store or the
+transformation engine copies nothing.
+
+DataFrames and version histories count against a byte budget (measured with
+``memory_usage(deep=True)``). When the budget is exceeded, the least recently
+used entries are spilled to pickle files in a local directory. get_dataframe
+loads a spilled DataFrame back into memory; get_data_version reads a spilled
+version from its file on each request.
+
+Nothing survives a restart. get_data_store() returns the persistent SQLite
+backend (persistent_store.py) instead when datastore_backend is "sqlite".
 """
 
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import os
+import pickle
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 import pandas as pd
 
+from config import get_settings
+
 from .models import (
     DataArtifact,
     TransformationRule,
@@ -18,23 +38,47 @@ from .models import (
     TransformationHistory,
     ProcessingStatus
 )
+from .cow_frame import derive_frame, freeze_frame
+from .storage_backend import DataStoreBackend, rule_matches
+from .version_store import VersionHistory
 
 logger = logging.getLogger(__name__)
 
 
-class MemoryDataStore:
+class MemoryDataStore(DataStoreBackend):
     """
     In-memory data store for storage of data artifacts, transformation rules,
     and data versions using Python dictionaries.
     """
     
-    def __init__(self):
-        """Initialize in-memory data store."""
+    def __init__(self, max_memory_bytes: Optional[int] = None, spill_dir: Optional[str] = None):
+        """
+        Initialize in-memory data store.
+        
+        Args:
+            max_memory_bytes: Byte budget for DataFrames and versions, 0 for
+                unbounded (defaults to the datastore_max_memory_mb setting)
+            spill_dir: Directory for spilled entries (defaults to the
+                datastore_spill_dir setting)
+        """
+        settings = get_settings()
         self.memory_artifacts: Dict[str, DataArtifact] = {}
         self.memory_rules: Dict[str, TransformationRule] = {}
-        self.memory_versions: Dict[str, List[pd.DataFrame]] = {}
+        self.memory_versions: Dict[str, VersionHistory] = {}
         self.memory_dataframes: Dict[str, pd.DataFrame] = {}
         
+        # Capacity management: resident bytes per entry, least recently used first.
+        # Keys are ("dataframe", artifact_id) and ("versions", artifact_id).
+        if max_memory_bytes is None:
+            max_memory_bytes = settings.datastore_max_memory_mb * 1024 * 1024
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = spill_dir or settings.datastore_spill_dir or os.path.join(
+            settings.temp_dir, "scioscribe_datastore"
+        )
+        self._resident: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self.spilled_dataframes: Dict[str, str] = {}
+        self._capacity_stats = {"spills": 0, "rehydrations": 0}
+        
         logger.info("Initialized in-memory data store")
     
     # === Data Artifact Operations ===
@@ -75,19 +119,6 @@ class MemoryDataStore:
             logger.error(f"Error retrieving artifact {artifact_id}: {str(e)}")
             return None
     
-    async def update_data_artifact(self, artifact: DataArtifact) -> bool:
-        """
-        Update an existing data artifact.
-        
-        Args:
-            artifact: The updated artifact
-            
-        Returns:
-            True if successful, False otherwise
-        """
-        artifact.updated_at = datetime.now()
-        return await self.save_data_artifact(artifact)
-    
     async def list_data_artifacts(self, experiment_id: Optional[str] = None) -> List[DataArtifact]:
         """
         List all data artifacts, optionally filtered by experiment.
@@ -122,7 +153,9 @@ class MemoryDataStore:
             True if successful, False otherwise
         """
         try:
-            self.memory_dataframes[artifact_id] = dataframe.copy()
+            self._discard_spilled_dataframe(artifact_id)
+            self.memory_dataframes[artifact_id] = freeze_frame(dataframe)
+            self._track(("dataframe", artifact_id), _frame_bytes(self.memory_dataframes[artifact_id]))
             logger.info(f"Saved DataFrame for artifact {artifact_id} to memory")
             return True
             
@@ -138,10 +171,17 @@ class MemoryDataStore:
             artifact_id: ID of the artifact
             
         Returns:
-            DataFrame if found, None otherwise
+            DataFrame if found (a shallow frame over the stored read-only
+            columns), None otherwise
         """
         try:
-            return self.memory_dataframes.get(artifact_id)
+            if artifact_id in self.spilled_dataframes:
+                self._rehydrate_dataframe(artifact_id)
+            dataframe = self.memory_dataframes.get(artifact_id)
+            if dataframe is None:
+                return None
+            self._touch(("dataframe", artifact_id))
+            return derive_frame(dataframe)
             
         except Exception as e:
             logger.error(f"Error retrieving DataFrame for artifact {artifact_id}: {str(e)}")
@@ -197,15 +237,7 @@ class MemoryDataStore:
             List of matching transformation rules
         """
         try:
-            rules = list(self.memory_rules.values())
-            # Simple pattern matching for in-memory storage
-            matching_rules = []
-            for rule in rules:
-                if (rule.created_by == user_id and 
-                    (pattern.lower() in rule.name.lower() or 
-                     pattern.lower() in rule.column_pattern.lower())):
-                    matching_rules.append(rule)
-            return matching_rules
+            return [rule for rule in self.memory_rules.values() if rule_matches(rule, pattern, user_id)]
             
         except Exception as e:
             logger.error(f"Error searching transformation rules: {str(e)}")
@@ -227,13 +259,14 @@ class MemoryDataStore:
         """
         try:
             if artifact_id not in self.memory_versions:
-                self.memory_versions[artifact_id] = []
+                self.memory_versions[artifact_id] = VersionHistory(
+                    spill_prefix=os.path.join(self.spill_dir, f"versions-{artifact_id}-{uuid.uuid4().hex[:8]}")
+                )
             
-            # Ensure we have enough space for the version
-            while len(self.memory_versions[artifact_id]) <= version:
-                self.memory_versions[artifact_id].append(pd.DataFrame())
-            
-            self.memory_versions[artifact_id][version] = dataframe.copy()
+            # Only columns that changed since the last saved version are copied
+            history = self.memory_versions[artifact_id]
+            history.save(version, dataframe)
+            self._track(("versions", artifact_id), history.resident_bytes())
             logger.info(f"Saved data version {version} for artifact {artifact_id}")
             return True
             
@@ -250,21 +283,114 @@ class MemoryDataStore:
             version: Version number
             
         Returns:
-            DataFrame if found, None otherwise
+            DataFrame if found (a new copy rebuilt from the stored columns), None otherwise
         """
         try:
             if artifact_id not in self.memory_versions:
                 return None
             
-            if version < 0 or version >= len(self.memory_versions[artifact_id]):
-                return None
-            
-            return self.memory_versions[artifact_id][version].copy()
+            history = self.memory_versions[artifact_id]
+            if history.is_spilled(version):
+                # Read from the spill file without making it resident again
+                self._capacity_stats["rehydrations"] += 1
+            dataframe = history.get(version)
+            if dataframe is not None:
+                self._touch(("versions", artifact_id))
+            return dataframe
             
         except Exception as e:
             logger.error(f"Error retrieving data version {version} for artifact {artifact_id}: {str(e)}")
             return None
     
+    # === Capacity Management ===
+    
+    def _track(self, key: Tuple[str, str], size: int) -> None:
+        """Record an entry's resident size, mark it most recently used and enforce the budget."""
+        self._resident[key] = size
+        self._resident.move_to_end(key)
+        self._enforce_budget(protect=key)
+    
+    def _touch(self, key: Tuple[str, str]) -> None:
+        """Mark an entry as most recently used."""
+        if key in self._resident:
+            self._resident.move_to_end(key)
+    
+    def _enforce_budget(self, protect: Tuple[str, str]) -> None:
+        """
+        Spill least recently used entries until resident bytes fit the budget.
+        
+        Version histories first spill all but their newest version, and spill
+        that one only if they are still the coldest entry. The entry just
+        saved or read (``protect``) is never spilled whole; when it is the
+        last resident entry and a version history, its older versions are
+        spilled too.
+        """
+        if not self.max_memory_bytes:
+            return
+        
+        total = sum(self._resident.values())
+        while total > self.max_memory_bytes:
+            victim = next((key for key in self._resident if key != protect), None)
+            if victim is None:
+                if protect[0] != "versions" or protect not in self._resident:
+                    break
+                victim = protect
+            
+            kind, artifact_id = victim
+            try:
+                if kind == "dataframe":
+                    self._spill_dataframe(artifact_id)
+                    freed = self._resident.pop(victim)
+                else:
+                    history = self.memory_versions[artifact_id]
+                    spilled = history.spill_older()
+                    if victim != protect:
+                        spilled = spilled or history.spill_all()
+                    elif not spilled:
+                        # Only the newest version of the protected history is left
+                        break
+                    self._capacity_stats["spills"] += spilled
+                    remaining = history.resident_bytes()
+                    freed = self._resident[victim] - remaining
+                    if remaining:
+                        self._resident[victim] = remaining
+                    else:
+                        self._resident.pop(victim)
+            except OSError as e:
+                logger.error(f"Could not spill {kind} for artifact {artifact_id}: {str(e)}")
+                break
+            
+            total -= freed
+            logger.info(f"Spilled {kind} of artifact {artifact_id} to disk ({freed / 1024 ** 2:.1f} MB freed)")
+    
+    def _spill_dataframe(self, artifact_id: str) -> None:
+        """Write a resident DataFrame to the spill directory and drop it from memory."""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"dataframe-{artifact_id}-{uuid.uuid4().hex[:8]}.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(self.memory_dataframes[artifact_id], f, protocol=5)
+        del self.memory_dataframes[artifact_id]
+        self.spilled_dataframes[artifact_id] = path
+        self._capacity_stats["spills"] += 1
+    
+    def _rehydrate_dataframe(self, artifact_id: str) -> None:
+        """Load a spilled DataFrame back into memory."""
+        path = self.spilled_dataframes.pop(artifact_id)
+        with open(path, "rb") as f:
+            self.memory_dataframes[artifact_id] = freeze_frame(pickle.load(f), adopt=True)
+        os.remove(path)
+        self._capacity_stats["rehydrations"] += 1
+        self._track(("dataframe", artifact_id), _frame_bytes(self.memory_dataframes[artifact_id]))
+    
+    def _discard_spilled_dataframe(self, artifact_id: str) -> None:
+        """Delete the spill file of a DataFrame, if it has one."""
+        path = self.spilled_dataframes.pop(artifact_id, None)
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
     # === Utility Methods ===
     
     async def delete_data_artifact(self, artifact_id: str) -> bool:
@@ -281,7 +407,12 @@ class MemoryDataStore:
             # Clean up memory storage
             self.memory_artifacts.pop(artifact_id, None)
             self.memory_dataframes.pop(artifact_id, None)
-            self.memory_versions.pop(artifact_id, None)
+            self._discard_spilled_dataframe(artifact_id)
+            history = self.memory_versions.pop(artifact_id, None)
+            if history is not None:
+                history.discard()
+            self._resident.pop(("dataframe", artifact_id), None)
+            self._resident.pop(("versions", artifact_id), None)
             
             logger.info(f"Deleted artifact {artifact_id} and associated data")
             return True
@@ -298,12 +429,27 @@ class MemoryDataStore:
             Dictionary with storage statistics
         """
         try:
+            version_usage = [history.memory_usage() for history in self.memory_versions.values()]
             return {
                 "storage_type": "in_memory",
                 "artifacts_count": len(self.memory_artifacts),
                 "dataframes_count": len(self.memory_dataframes),
                 "rules_count": len(self.memory_rules),
-                "versions_count": sum(len(versions) for versions in self.memory_versions.values())
+                "versions_count": sum(len(versions) for versions in self.memory_versions.values()),
+                "dataframes_memory_bytes": sum(
+                    int(df.memory_usage(deep=True).sum()) for df in self.memory_dataframes.values()
+                ),
+                "versions_memory_bytes": sum(usage["stored_bytes"] for usage in version_usage),
+                # What one full copy per version would take; the gap is saved by column sharing
+                "versions_full_copy_bytes": sum(usage["full_copy_bytes"] for usage in version_usage),
+                "memory_budget_bytes": self.max_memory_bytes,
+                "resident_bytes": sum(self._resident.values()),
+                "spilled_dataframes_count": len(self.spilled_dataframes),
+                "spilled_versions_count": sum(
+                    history.spilled_count() for history in self.memory_versions.values()
+                ),
+                "spill_dir": self.spill_dir,
+                **self._capacity_stats
             }
             
         except Exception as e:
@@ -311,13 +457,27 @@ class MemoryDataStore:
             return {"error": str(e)}
 
 
+def _frame_bytes(dataframe: pd.DataFrame) -> int:
+    """Deep memory usage of a DataFrame, including its index."""
+    return int(dataframe.memory_usage(deep=True, index=True).sum())
+
+
 # Global instance
 _data_store = None
 
 
-def get_data_store() -> MemoryDataStore:
-    """Get the global data store instance."""
+def get_data_store() -> DataStoreBackend:
+    """
+    Get the global data store instance.
+    
+    The backend is chosen by the datastore_backend setting: "memory" for
+    MemoryDataStore, "sqlite" for the persistent PersistentDataStore.
+    """
     global _data_store
     if _data_store is None:
-        _data_store = MemoryDataStore()
-    return _data_store 
\ No newline at end of file
+        if get_settings().datastore_backend == "sqlite":
+            from .persistent_store import PersistentDataStore
+            _data_store = PersistentDataStore()
+        else:
+            _data_store = MemoryDataStore()
+    return _data_store
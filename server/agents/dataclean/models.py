@@ -53,6 +53,8 @@ class ProcessingResult(BaseModel):
     data_preview: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
     file_info: Optional[Dict[str, Any]] = None
+    # Parsed DataFrame the preview was built from, so callers need not read the file again
+    dataframe: Optional[Any] = Field(default=None, exclude=True, repr=False)
 
 
 class QualityIssue(BaseModel):
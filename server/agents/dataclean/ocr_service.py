@@ -0,0 +1,249 @@
+"""
+OCR Service for ScioScribe Data Cleaning System.
+
+EasyOCR's readtext holds the GIL for most of its work, so running it on
+threads gives little parallelism, and every EasyOCRProcessor used to load its
+own copy of the model. This service runs OCR on a fixed pool of worker
+processes instead:
+
+- each worker loads the EasyOCR model once, when it starts, and then reads
+  image paths from its pipe and sends back the detected text boxes
+- jobs wait in a bounded queue; submitters wait while it is full, and
+  endpoints can check queue_full() to turn uploads away instead
+- each image gets a time limit (ocr_timeout); a worker that overruns or
+  crashes is killed and replaced
+
+Pool size, queue size and timeout come from the settings (ocr_workers,
+ocr_queue_size, ocr_timeout). Workers start on the first job.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from typing import List, Optional, Tuple
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds for a worker to load the EasyOCR model (may include a download)
+STARTUP_TIMEOUT = 300
+
+# (bounding box corners, text, confidence), as returned by Reader.readtext
+OCRBox = Tuple[List[List[float]], str, float]
+
+
+class OCRError(Exception):
+    """Raised when an image cannot be processed by the OCR service"""
+
+
+class OCRTimeoutError(OCRError):
+    """Raised when an image takes longer than the OCR time limit"""
+
+
+def _worker_main(conn, languages: List[str], gpu: bool) -> None:
+    """Worker process: load the model once, then run readtext on each image path received."""
+    import easyocr
+    import numpy as np
+    from PIL import Image
+
+    reader = easyocr.Reader(languages, gpu=gpu, verbose=False)
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            image_path = conn.recv()
+        except EOFError:
+            break
+        if image_path is None:
+            break
+        try:
+            with Image.open(image_path) as image:
+                image_array = np.array(image)
+            results = reader.readtext(image_array)
+            conn.send(("ok", [
+                (np.asarray(bbox).tolist(), text, float(confidence))
+                for bbox, text, confidence in results
+            ]))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _OCRWorker:
+    """A single OCR worker process with its model loaded."""
+
+    def __init__(self, languages: List[str], gpu: bool):
+        """Start the worker process (does not wait for the model to load)"""
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, languages, gpu), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is still running"""
+        return self.process.is_alive()
+
+    def run(self, image_path: str, timeout: float) -> List[OCRBox]:
+        """
+        Run OCR on one image, blocking until it is done.
+
+        Raises:
+            OCRTimeoutError: If the worker does not answer within the timeout
+            OCRError: If OCR fails for the image
+            EOFError, OSError: If the worker process died
+        """
+        if not self.ready:
+            if not self.conn.poll(STARTUP_TIMEOUT):
+                raise OCRTimeoutError("OCR worker did not load the model in time")
+            self.conn.recv()
+            self.ready = True
+
+        self.conn.send(image_path)
+        if not self.conn.poll(timeout):
+            raise OCRTimeoutError(f"OCR took longer than {timeout} s for {image_path}")
+        status, payload = self.conn.recv()
+        if status == "error":
+            raise OCRError(payload)
+        return payload
+
+    def stop(self) -> None:
+        """Stop the worker process"""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class OCRService:
+    """
+    Fixed pool of OCR worker processes fed from a bounded job queue.
+    """
+
+    def __init__(self, languages: Optional[List[str]] = None, gpu: bool = False,
+                 workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the OCR service (workers start on the first job).
+
+        Args:
+            languages: EasyOCR language codes (default: English)
+            gpu: Whether workers use GPU acceleration
+            workers: Worker processes (default: ocr_workers setting)
+            queue_size: Jobs that can wait for a worker (default: ocr_queue_size setting)
+            timeout: Time limit per image in seconds (default: ocr_timeout setting)
+        """
+        settings = get_settings()
+        self.languages = languages or ['en']
+        self.gpu = gpu
+        self.worker_count = workers or settings.ocr_workers
+        self.queue_size = queue_size or settings.ocr_queue_size
+        self.timeout = timeout or settings.ocr_timeout
+
+        self._workers: List[_OCRWorker] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatchers: List[asyncio.Task] = []
+
+    async def readtext(self, image_path: str) -> List[OCRBox]:
+        """
+        Run OCR on an image file, waiting for a free queue slot if needed.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Detected text boxes as (corner points, text, confidence)
+
+        Raises:
+            OCRError: If OCR fails or times out for the image
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image_path, future))
+        return await future
+
+    def queue_full(self) -> bool:
+        """Whether new jobs would have to wait for a queue slot."""
+        return self._queue is not None and self._queue.full()
+
+    async def shutdown(self) -> None:
+        """Stop the dispatchers and worker processes."""
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        self._queue = None
+        await asyncio.gather(*(asyncio.to_thread(worker.stop) for worker in self._workers))
+        self._workers = []
+        logger.info("OCR service stopped")
+
+    def _ensure_started(self) -> None:
+        """Start the worker processes and their dispatchers on first use."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [_OCRWorker(self.languages, self.gpu) for _ in range(self.worker_count)]
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch(index)) for index in range(self.worker_count)
+        ]
+        logger.info(f"Started OCR service with {self.worker_count} workers, queue size {self.queue_size}")
+
+    async def _dispatch(self, index: int) -> None:
+        """Feed queued jobs to one worker, one at a time."""
+        while True:
+            image_path, future = await self._queue.get()
+            try:
+                result = await asyncio.to_thread(self._run_on_worker, index, image_path)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _run_on_worker(self, index: int, image_path: str) -> List[OCRBox]:
+        """Run a job on a worker, replacing the worker if it hangs or dies."""
+        worker = self._workers[index]
+        try:
+            return worker.run(image_path, self.timeout)
+        except OCRTimeoutError:
+            self._replace_worker(index)
+            raise
+        except OCRError:
+            raise
+        except (EOFError, OSError) as e:
+            self._replace_worker(index)
+            raise OCRError(f"OCR worker died while processing {image_path}: {e}")
+
+    def _replace_worker(self, index: int) -> None:
+        """Kill a worker and start a fresh one in its place."""
+        logger.warning(f"Replacing OCR worker {index}")
+        self._workers[index].stop()
+        self._workers[index] = _OCRWorker(self.languages, self.gpu)
+
+
+# Global OCR service instance
+_ocr_service: Optional[OCRService] = None
+
+
+def get_ocr_service() -> OCRService:
+    """
+    Get the global OCR service instance.
+
+    Returns:
+        The shared OCRService (English, CPU)
+    """
+    global _ocr_service
+    if _ocr_service is None:
+        _ocr_service = OCRService(languages=['en'], gpu=False)
+    return _ocr_service
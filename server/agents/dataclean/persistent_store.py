@@ -0,0 +1,525 @@
+"""
+Persistent Data Store for ScioScribe Data Cleaning System.
+
+A durable implementation of the data store interface: artifacts,
+transformation rules and the metadata of DataFrames and data versions live in
+a SQLite database, and the frames themselves are written as Parquet files
+next to it. Everything survives a restart, and several uvicorn workers can
+share one store directory:
+
+- SQLite runs in WAL mode with a busy timeout, and every operation opens its
+  own short-lived connection, so readers never block writers
+- a frame is written to a new, uniquely named file before its metadata row
+  points at it, so readers in other workers never see a partial file; the
+  replaced file is removed afterwards
+
+Blocking SQLite and file I/O runs in worker threads (``asyncio.to_thread``) so
+the event loop stays responsive.
+
+Parquet needs pyarrow. Without it, or for frames Parquet cannot represent
+(non-string column labels, mixed-type object columns) or would read back with
+other dtypes (object columns or indexes holding anything but strings, e.g.
+floats that would come back as float64), frames are written as pickle files
+instead; the format is recorded per file.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import shutil
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from config import get_settings
+
+from .cow_frame import freeze_frame
+from .models import DataArtifact, TransformationRule
+from .storage_backend import DataStoreBackend, rule_matches
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    artifact_id TEXT PRIMARY KEY,
+    experiment_id TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_experiment ON artifacts (experiment_id);
+
+CREATE TABLE IF NOT EXISTS rules (
+    rule_id TEXT PRIMARY KEY,
+    created_by TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rules_created_by ON rules (created_by);
+
+CREATE TABLE IF NOT EXISTS frames (
+    artifact_id TEXT NOT NULL,
+    version INTEGER NOT NULL,  -- -1 for the current DataFrame, >= 0 for data versions
+    path TEXT NOT NULL,
+    format TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    columns INTEGER NOT NULL,
+    file_bytes INTEGER NOT NULL,
+    saved_at TEXT NOT NULL,
+    PRIMARY KEY (artifact_id, version)
+);
+"""
+
+# frames.version of an artifact's current DataFrame
+CURRENT_FRAME = -1
+
+
+class PersistentDataStore(DataStoreBackend):
+    """
+    Durable data store using SQLite for metadata and Parquet files for
+    DataFrames and data versions.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the persistent data store.
+
+        Args:
+            root: Store directory holding ``datastore.db`` and ``frames/``
+                (defaults to the datastore_path setting)
+        """
+        self.root = root or get_settings().datastore_path
+        self.db_path = os.path.join(self.root, "datastore.db")
+        self.frames_dir = os.path.join(self.root, "frames")
+        self.frame_format = "parquet" if pyarrow is not None else "pickle"
+
+        os.makedirs(self.frames_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+        logger.info(f"Initialized persistent data store at {self.root} (frames as {self.frame_format})")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation; commits on success, rolls back on error."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA busy_timeout = 30000")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # === Data Artifact Operations ===
+
+    async def save_data_artifact(self, artifact: DataArtifact) -> bool:
+        """
+        Save a data artifact to the database.
+
+        Args:
+            artifact: The data artifact to save
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await asyncio.to_thread(self._write_artifact, artifact)
+            logger.info(f"Saved artifact {artifact.artifact_id} to persistent store")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving artifact {artifact.artifact_id}: {str(e)}")
+            return False
+
+    def _write_artifact(self, artifact: DataArtifact) -> None:
+        payload = artifact.model_dump_json()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO artifacts (artifact_id, experiment_id, owner_id, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (artifact_id) DO UPDATE SET experiment_id = excluded.experiment_id, "
+                "owner_id = excluded.owner_id, payload = excluded.payload",
+                (artifact.artifact_id, artifact.experiment_id, artifact.owner_id,
+                 artifact.created_at.isoformat(), payload)
+            )
+
+    async def get_data_artifact(self, artifact_id: str) -> Optional[DataArtifact]:
+        """
+        Retrieve a data artifact from the database.
+
+        Args:
+            artifact_id: ID of the artifact to retrieve
+
+        Returns:
+            DataArtifact if found, None otherwise
+        """
+        try:
+            row = await asyncio.to_thread(
+                self._fetch_one, "SELECT payload FROM artifacts WHERE artifact_id = ?", (artifact_id,)
+            )
+            return DataArtifact.model_validate_json(row[0]) if row else None
+
+        except Exception as e:
+            logger.error(f"Error retrieving artifact {artifact_id}: {str(e)}")
+            return None
+
+    async def list_data_artifacts(self, experiment_id: Optional[str] = None) -> List[DataArtifact]:
+        """
+        List all data artifacts, optionally filtered by experiment.
+
+        Args:
+            experiment_id: Optional experiment ID to filter by
+
+        Returns:
+            List of data artifacts, oldest first
+        """
+        try:
+            if experiment_id:
+                rows = await asyncio.to_thread(
+                    self._fetch_all,
+                    "SELECT payload FROM artifacts WHERE experiment_id = ? ORDER BY created_at",
+                    (experiment_id,)
+                )
+            else:
+                rows = await asyncio.to_thread(
+                    self._fetch_all, "SELECT payload FROM artifacts ORDER BY created_at", ()
+                )
+            return [DataArtifact.model_validate_json(row[0]) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Error listing artifacts: {str(e)}")
+            return []
+
+    # === DataFrame Operations ===
+
+    async def save_dataframe(self, artifact_id: str, dataframe: pd.DataFrame) -> bool:
+        """
+        Save an artifact's current DataFrame to disk.
+
+        Args:
+            artifact_id: ID of the artifact
+            dataframe: The DataFrame to save
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await asyncio.to_thread(self._write_frame, artifact_id, CURRENT_FRAME, dataframe)
+            logger.info(f"Saved DataFrame for artifact {artifact_id} to persistent store")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving DataFrame for artifact {artifact_id}: {str(e)}")
+            return False
+
+    async def get_dataframe(self, artifact_id: str) -> Optional[pd.DataFrame]:
+        """
+        Load an artifact's current DataFrame from disk.
+
+        Args:
+            artifact_id: ID of the artifact
+
+        Returns:
+            DataFrame if found, None otherwise. Each call returns a new frame;
+            changes must be saved with save_dataframe to persist.
+        """
+        try:
+            return await asyncio.to_thread(self._read_frame, artifact_id, CURRENT_FRAME)
+
+        except Exception as e:
+            logger.error(f"Error retrieving DataFrame for artifact {artifact_id}: {str(e)}")
+            return None
+
+    # === Transformation Rules Operations ===
+
+    async def save_transformation_rule(self, rule: TransformationRule) -> bool:
+        """
+        Save a transformation rule to the database.
+
+        Args:
+            rule: The transformation rule to save
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await asyncio.to_thread(
+                self._execute,
+                "INSERT OR REPLACE INTO rules (rule_id, created_by, payload) VALUES (?, ?, ?)",
+                (rule.rule_id, rule.created_by, rule.model_dump_json())
+            )
+            logger.info(f"Saved transformation rule {rule.rule_id} to persistent store")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving transformation rule {rule.rule_id}: {str(e)}")
+            return False
+
+    async def get_transformation_rule(self, rule_id: str) -> Optional[TransformationRule]:
+        """
+        Retrieve a transformation rule from the database.
+
+        Args:
+            rule_id: ID of the rule to retrieve
+
+        Returns:
+            TransformationRule if found, None otherwise
+        """
+        try:
+            row = await asyncio.to_thread(
+                self._fetch_one, "SELECT payload FROM rules WHERE rule_id = ?", (rule_id,)
+            )
+            return TransformationRule.model_validate_json(row[0]) if row else None
+
+        except Exception as e:
+            logger.error(f"Error retrieving transformation rule {rule_id}: {str(e)}")
+            return None
+
+    async def search_transformation_rules(self, pattern: str, user_id: str) -> List[TransformationRule]:
+        """
+        Search for transformation rules by pattern.
+
+        Args:
+            pattern: Pattern to search for
+            user_id: User ID to filter by
+
+        Returns:
+            List of matching transformation rules
+        """
+        try:
+            rows = await asyncio.to_thread(
+                self._fetch_all, "SELECT payload FROM rules WHERE created_by = ? ORDER BY rowid", (user_id,)
+            )
+            rules = [TransformationRule.model_validate_json(row[0]) for row in rows]
+            return [rule for rule in rules if rule_matches(rule, pattern, user_id)]
+
+        except Exception as e:
+            logger.error(f"Error searching transformation rules: {str(e)}")
+            return []
+
+    # === Data Version Operations ===
+
+    async def save_data_version(self, artifact_id: str, version: int, dataframe: pd.DataFrame) -> bool:
+        """
+        Save a data version to disk.
+
+        Args:
+            artifact_id: ID of the artifact
+            version: Version number
+            dataframe: The DataFrame to save
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if version < 0:
+                raise ValueError("version must be non-negative")
+            await asyncio.to_thread(self._write_frame, artifact_id, version, dataframe)
+            logger.info(f"Saved data version {version} for artifact {artifact_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving data version {version} for artifact {artifact_id}: {str(e)}")
+            return False
+
+    async def get_data_version(self, artifact_id: str, version: int) -> Optional[pd.DataFrame]:
+        """
+        Load a specific data version from disk.
+
+        Args:
+            artifact_id: ID of the artifact
+            version: Version number
+
+        Returns:
+            DataFrame if found, None otherwise
+        """
+        try:
+            if version < 0:
+                return None
+            return await asyncio.to_thread(self._read_frame, artifact_id, version)
+
+        except Exception as e:
+            logger.error(f"Error retrieving data version {version} for artifact {artifact_id}: {str(e)}")
+            return None
+
+    # === Frame Files ===
+
+    def _write_frame(self, artifact_id: str, version: int, dataframe: pd.DataFrame) -> None:
+        """Write a frame to a new file, point its metadata row at it and remove the replaced file."""
+        directory = os.path.join(self.frames_dir, artifact_id)
+        os.makedirs(directory, exist_ok=True)
+        name = "current" if version == CURRENT_FRAME else f"v{version}"
+        base = os.path.join(directory, f"{name}-{uuid.uuid4().hex[:12]}")
+        path, file_format = _dump_frame(dataframe, base, self.frame_format)
+
+        try:
+            with self._connect() as conn:
+                previous = conn.execute(
+                    "SELECT path FROM frames WHERE artifact_id = ? AND version = ?", (artifact_id, version)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO frames "
+                    "(artifact_id, version, path, format, rows, columns, file_bytes, saved_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (artifact_id, version, os.path.relpath(path, self.frames_dir), file_format,
+                     len(dataframe), dataframe.shape[1], os.path.getsize(path), datetime.now().isoformat())
+                )
+        except Exception:
+            _remove_file(path)
+            raise
+
+        if previous:
+            _remove_file(os.path.join(self.frames_dir, previous[0]))
+
+    def _read_frame(self, artifact_id: str, version: int) -> Optional[pd.DataFrame]:
+        """Load a frame; retried once if another worker replaced its file in between."""
+        for attempt in range(2):
+            row = self._fetch_one(
+                "SELECT path, format FROM frames WHERE artifact_id = ? AND version = ?", (artifact_id, version)
+            )
+            if row is None:
+                return None
+            try:
+                return _load_frame(os.path.join(self.frames_dir, row[0]), row[1])
+            except FileNotFoundError:
+                if attempt:
+                    raise
+        return None
+
+    # === Database Helpers ===
+
+    def _execute(self, sql: str, params: Tuple) -> None:
+        with self._connect() as conn:
+            conn.execute(sql, params)
+
+    def _fetch_one(self, sql: str, params: Tuple) -> Optional[Tuple]:
+        with self._connect() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _fetch_all(self, sql: str, params: Tuple) -> List[Tuple]:
+        with self._connect() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    # === Utility Methods ===
+
+    async def delete_data_artifact(self, artifact_id: str) -> bool:
+        """
+        Delete a data artifact and all associated data.
+
+        Args:
+            artifact_id: ID of the artifact to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await asyncio.to_thread(self._delete_artifact, artifact_id)
+            logger.info(f"Deleted artifact {artifact_id} and associated data")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error deleting artifact {artifact_id}: {str(e)}")
+            return False
+
+    def _delete_artifact(self, artifact_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM artifacts WHERE artifact_id = ?", (artifact_id,))
+            conn.execute("DELETE FROM frames WHERE artifact_id = ?", (artifact_id,))
+        shutil.rmtree(os.path.join(self.frames_dir, artifact_id), ignore_errors=True)
+
+    async def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Dictionary with storage statistics
+        """
+        try:
+            return await asyncio.to_thread(self._storage_stats)
+
+        except Exception as e:
+            logger.error(f"Error getting storage stats: {str(e)}")
+            return {"error": str(e)}
+
+    def _storage_stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            artifacts_count = conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+            rules_count = conn.execute("SELECT COUNT(*) FROM rules").fetchone()[0]
+            dataframes_count, dataframes_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(file_bytes), 0) FROM frames WHERE version = ?", (CURRENT_FRAME,)
+            ).fetchone()
+            versions_count, versions_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(file_bytes), 0) FROM frames WHERE version >= 0"
+            ).fetchone()
+        return {
+            "storage_type": "sqlite",
+            "artifacts_count": artifacts_count,
+            "dataframes_count": dataframes_count,
+            "rules_count": rules_count,
+            "versions_count": versions_count,
+            "dataframes_disk_bytes": dataframes_bytes,
+            "versions_disk_bytes": versions_bytes,
+            "database_bytes": os.path.getsize(self.db_path),
+            "frame_format": self.frame_format,
+            "root": self.root,
+        }
+
+
+def _dump_frame(dataframe: pd.DataFrame, base: str, preferred_format: str) -> Tuple[str, str]:
+    """
+    Write a frame to ``base`` plus the format's extension.
+
+    Returns:
+        Path written and the format used ("parquet" or "pickle")
+    """
+    if preferred_format == "parquet" and _parquet_round_trips(dataframe):
+        path = f"{base}.parquet"
+        try:
+            dataframe.to_parquet(path, index=True)
+            return path, "parquet"
+        except (ValueError, TypeError, NotImplementedError) as e:
+            # e.g. integer column labels or object columns mixing strings and numbers
+            _remove_file(path)
+            logger.debug(f"Frame not representable as Parquet, writing pickle instead: {e}")
+
+    path = f"{base}.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(dataframe, f, protocol=5)
+    return path, "pickle"
+
+
+def _parquet_round_trips(dataframe: pd.DataFrame) -> bool:
+    """Whether the object columns and index of a frame hold only strings, so Parquet keeps their dtype."""
+    arrays = [dataframe.index] + [dataframe.iloc[:, i] for i in range(dataframe.shape[1])]
+    return all(
+        array.dtype != object or pd.api.types.infer_dtype(array, skipna=True) in ("string", "empty")
+        for array in arrays
+    )
+
+
+def _load_frame(path: str, file_format: str) -> pd.DataFrame:
+    """Read a frame written by _dump_frame, with its freshly loaded columns frozen."""
+    if file_format == "parquet":
+        dataframe = pd.read_parquet(path)
+    else:
+        with open(path, "rb") as f:
+            dataframe = pickle.load(f)
+    return freeze_frame(dataframe, adopt=True)
+
+
+def _remove_file(path: str) -> None:
+    """Delete a file if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
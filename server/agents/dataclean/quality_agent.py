@@ -8,11 +8,14 @@ intelligent suggestions for data cleaning and improvement.
 import asyncio
 import json
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable, TypeVar
 import pandas as pd
 import logging
 from openai import AsyncOpenAI
 
+from config import get_settings
+from ..llm_cache import wrap_openai_client
+from ..profiling import profile_frame
 from .models import (
     QualityIssue, 
     Suggestion, 
@@ -22,6 +25,13 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Upper bound on the issue and sample text packed into one suggestion batch prompt
+SUGGESTION_BATCH_MAX_CHARS = 12000
+
+RISK_LEVELS = ("low", "medium", "high")
+
 
 class DataQualityAgent:
     """
@@ -31,15 +41,34 @@ class DataQualityAgent:
     actionable suggestions for data cleaning.
     """
     
-    def __init__(self, openai_client: AsyncOpenAI):
+    def __init__(self,
+                 openai_client: AsyncOpenAI,
+                 concurrent: Optional[bool] = None,
+                 max_concurrency: Optional[int] = None,
+                 call_timeout: Optional[float] = None,
+                 suggestion_batch_size: Optional[int] = None):
         """
         Initialize the Data Quality Agent.
         
         Args:
-            openai_client: AsyncOpenAI client instance
+            openai_client: AsyncOpenAI client instance; its chat completions are
+                served from the LLM response cache
+            concurrent: Run quality checks and suggestion calls concurrently
+                (defaults to the quality_concurrent_analysis setting)
+            max_concurrency: Maximum calls in flight at once
+                (defaults to the quality_max_concurrency setting)
+            call_timeout: Timeout in seconds for each check or suggestion call
+                (defaults to the quality_llm_timeout setting)
+            suggestion_batch_size: Issues per suggestion call; 1 requests each
+                suggestion separately (defaults to quality_suggestion_batch_size)
         """
-        self.client = openai_client
+        settings = get_settings()
+        self.client = wrap_openai_client(openai_client)
         self.model = "gpt-4.1"  # Using consistent model across codebase
+        self.concurrent = settings.quality_concurrent_analysis if concurrent is None else concurrent
+        self.max_concurrency = max_concurrency or settings.quality_max_concurrency
+        self.call_timeout = call_timeout or settings.quality_llm_timeout
+        self.suggestion_batch_size = suggestion_batch_size or settings.quality_suggestion_batch_size
         
     async def analyze_data(self, df: pd.DataFrame) -> List[QualityIssue]:
         """
@@ -57,24 +86,22 @@ class DataQualityAgent:
             # Generate data summary for AI analysis
             data_summary = self._generate_data_summary(df)
             
-            # Analyze different types of quality issues
-            issues = []
-            
-            # 1. Data type issues
-            type_issues = await self._analyze_data_types(df, data_summary)
-            issues.extend(type_issues)
-            
-            # 2. Missing value issues
-            missing_issues = await self._analyze_missing_values(df, data_summary)
-            issues.extend(missing_issues)
-            
-            # 3. Inconsistency issues
-            consistency_issues = await self._analyze_consistency(df, data_summary)
-            issues.extend(consistency_issues)
+            # Analyze different types of quality issues. The checks are
+            # independent, so in concurrent mode their LLM calls overlap; a
+            # check that fails or times out contributes no issues.
+            semaphore = self._call_limiter()
+            results = await asyncio.gather(
+                # 1. Data type issues
+                self._run_limited(semaphore, "data type analysis", self._analyze_data_types(df, data_summary), []),
+                # 2. Missing value issues
+                self._run_limited(semaphore, "missing value analysis", self._analyze_missing_values(df, data_summary), []),
+                # 3. Inconsistency issues
+                self._run_limited(semaphore, "consistency analysis", self._analyze_consistency(df, data_summary), []),
+                # 4. Outlier detection
+                self._run_limited(semaphore, "outlier analysis", self._analyze_outliers(df, data_summary), []),
+            )
             
-            # 4. Outlier detection
-            outlier_issues = await self._analyze_outliers(df, data_summary)
-            issues.extend(outlier_issues)
+            issues = [issue for check_issues in results for issue in check_issues]
             
             logger.info(f"Found {len(issues)} quality issues")
             return issues
@@ -95,13 +122,13 @@ class DataQualityAgent:
             List of AI-generated suggestions
         """
         try:
-            suggestions = []
+            semaphore = self._call_limiter()
+            if self.suggestion_batch_size > 1 and len(issues) > 1:
+                results = await self._generate_batched_suggestions(issues, df, semaphore)
+            else:
+                results = await self._generate_individual_suggestions(issues, df, semaphore)
+            suggestions = [suggestion for suggestion in results if suggestion]
             
-            for issue in issues:
-                suggestion = await self._generate_suggestion_for_issue(issue, df)
-                if suggestion:
-                    suggestions.append(suggestion)
-                    
             # Rank suggestions by priority
             ranked_suggestions = self._rank_suggestions(suggestions)
             
@@ -112,6 +139,297 @@ class DataQualityAgent:
             logger.error(f"Error generating suggestions: {str(e)}")
             return []
     
+    async def _generate_individual_suggestions(self, issues: List[QualityIssue], df: pd.DataFrame,
+                                               semaphore: asyncio.Semaphore) -> List[Optional[Suggestion]]:
+        """
+        Generate suggestions with one LLM call per issue.
+        
+        Args:
+            issues: Quality issues to address
+            df: Original DataFrame
+            semaphore: Limiter for calls in flight
+            
+        Returns:
+            Suggestion (or None) for each issue, in issue order
+        """
+        return await asyncio.gather(*(
+            self._run_limited(
+                semaphore,
+                f"suggestion for issue {issue.issue_id}",
+                self._generate_suggestion_for_issue(issue, df),
+                None
+            )
+            for issue in issues
+        ))
+    
+    async def _generate_batched_suggestions(self, issues: List[QualityIssue], df: pd.DataFrame,
+                                            semaphore: asyncio.Semaphore) -> List[Optional[Suggestion]]:
+        """
+        Generate suggestions for batches of issues, one LLM call per batch.
+        
+        Issues without a valid suggestion in their batch response (or whose
+        batch call failed) fall back to individual calls.
+        
+        Args:
+            issues: Quality issues to address
+            df: Original DataFrame
+            semaphore: Limiter for calls in flight
+            
+        Returns:
+            Suggestion (or None) for each issue, in issue order
+        """
+        batches = self._batch_issues(issues, df)
+        results = await asyncio.gather(*(
+            self._run_limited(
+                semaphore,
+                f"suggestion batch of {len(batch)} issues",
+                self._generate_suggestions_for_batch(batch, df),
+                {}
+            )
+            for batch in batches
+        ))
+        
+        suggestions: Dict[str, Suggestion] = {}
+        for batch_suggestions in results:
+            suggestions.update(batch_suggestions)
+        
+        remaining = [issue for issue in issues if issue.issue_id not in suggestions]
+        if remaining:
+            logger.info(f"Requesting {len(remaining)} of {len(issues)} suggestions individually")
+            fallback = await self._generate_individual_suggestions(remaining, df, semaphore)
+            for issue, suggestion in zip(remaining, fallback):
+                if suggestion:
+                    suggestions[issue.issue_id] = suggestion
+        
+        return [suggestions.get(issue.issue_id) for issue in issues]
+    
+    def _batch_issues(self, issues: List[QualityIssue], df: pd.DataFrame) -> List[List[QualityIssue]]:
+        """
+        Pack issues into batches bounded by suggestion_batch_size and prompt size.
+        
+        Issues on columns missing from the DataFrame are left out; the
+        individual fallback reports them.
+        
+        Args:
+            issues: Quality issues to address
+            df: Original DataFrame
+            
+        Returns:
+            List of issue batches
+        """
+        batches: List[List[QualityIssue]] = []
+        batch: List[QualityIssue] = []
+        batch_columns: set = set()
+        batch_chars = 0
+        sample_chars: Dict[str, int] = {}
+        
+        for issue in issues:
+            if issue.column not in df.columns:
+                continue
+            if issue.column not in sample_chars:
+                sample_chars[issue.column] = len(str(self._column_sample(df, issue.column)))
+            # Issue details plus the column sample, which is sent once per batch
+            issue_chars = len(issue.description) + 200
+            size = issue_chars + (0 if issue.column in batch_columns else sample_chars[issue.column])
+            if batch and (len(batch) >= self.suggestion_batch_size
+                          or batch_chars + size > SUGGESTION_BATCH_MAX_CHARS):
+                batches.append(batch)
+                batch, batch_columns, batch_chars = [], set(), 0
+                size = issue_chars + sample_chars[issue.column]
+            batch.append(issue)
+            batch_columns.add(issue.column)
+            batch_chars += size
+        
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _column_sample(self, df: pd.DataFrame, column: str) -> List[Any]:
+        """First 10 unique non-null values of a column, as shown to the LLM."""
+        return df[column].dropna().unique()[:10].tolist()
+    
+    async def _generate_suggestions_for_batch(self, issues: List[QualityIssue],
+                                              df: pd.DataFrame) -> Dict[str, Suggestion]:
+        """
+        Generate suggestions for several issues with a single LLM call.
+        
+        Args:
+            issues: Batch of quality issues
+            df: Original DataFrame
+            
+        Returns:
+            Valid suggestions keyed by issue ID (issues may be missing)
+        """
+        issue_details = "\n".join(
+            f"""
+        Issue {number}:
+        - Column: {issue.column}
+        - Issue Type: {issue.issue_type}
+        - Description: {issue.description}
+        - Severity: {issue.severity}
+        - Affected Rows: {issue.affected_rows}"""
+            for number, issue in enumerate(issues, start=1)
+        )
+        # Each column's sample is sent once, however many issues it has
+        sample_data = {}
+        for issue in issues:
+            if issue.column not in sample_data:
+                sample_data[issue.column] = self._column_sample(df, issue.column)
+        
+        prompt = f"""
+        Generate a specific, actionable suggestion to fix each of these data quality issues:
+        {issue_details}
+        
+        Sample Data per Column:
+        {sample_data}
+        
+        For each issue, provide:
+        1. A clear action to take
+        2. The confidence level (0.0-1.0)
+        3. The risk level (low/medium/high)
+        4. A brief explanation of why this suggestion helps
+        
+        Respond with a JSON array containing one object per issue:
+        [
+            {{
+                "issue": issue_number,
+                "action": "specific_action_to_take",
+                "confidence": confidence_score,
+                "risk_level": "low|medium|high",
+                "explanation": "Brief explanation of the suggestion"
+            }}
+        ]
+        """
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a data quality expert. Provide actionable suggestions and respond only with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            max_tokens=min(4000, 400 * len(issues))
+        )
+        
+        items = self._parse_json_content(response.choices[0].message.content)
+        if not isinstance(items, list):
+            raise ValueError("Suggestion batch response is not a JSON array")
+        
+        suggestions: Dict[str, Suggestion] = {}
+        for item in items:
+            number = item.get('issue') if isinstance(item, dict) else None
+            if not isinstance(number, int) or not 1 <= number <= len(issues):
+                logger.debug(f"Skipping suggestion with invalid issue number: {item}")
+                continue
+            issue = issues[number - 1]
+            if issue.issue_id in suggestions:
+                continue
+            suggestion = self._validated_suggestion(issue, item)
+            if suggestion:
+                suggestions[issue.issue_id] = suggestion
+        
+        return suggestions
+    
+    def _validated_suggestion(self, issue: QualityIssue, suggestion_data: Dict[str, Any]) -> Optional[Suggestion]:
+        """
+        Build a suggestion from one batch response item, or None if it is invalid.
+        
+        Args:
+            issue: Issue the item answers
+            suggestion_data: Parsed JSON object from the response
+            
+        Returns:
+            Suggestion, or None if a field is missing or malformed
+        """
+        action = suggestion_data.get('action')
+        explanation = suggestion_data.get('explanation')
+        confidence = suggestion_data.get('confidence')
+        if (not isinstance(action, str) or not action.strip()
+                or not isinstance(explanation, str)
+                or isinstance(confidence, bool) or not isinstance(confidence, (int, float))
+                or suggestion_data.get('risk_level') not in RISK_LEVELS):
+            logger.debug(f"Invalid suggestion for issue {issue.issue_id}: {suggestion_data}")
+            return None
+        
+        try:
+            return self._build_suggestion(issue, suggestion_data)
+        except Exception as e:
+            logger.debug(f"Invalid suggestion for issue {issue.issue_id}: {str(e)}")
+            return None
+    
+    def _build_suggestion(self, issue: QualityIssue, suggestion_data: Dict[str, Any]) -> Suggestion:
+        """
+        Map parsed suggestion JSON to a Suggestion for an issue.
+        
+        Args:
+            issue: Issue the suggestion addresses
+            suggestion_data: Parsed JSON with action, confidence, risk_level and explanation
+            
+        Returns:
+            Suggestion
+        """
+        return Suggestion(
+            suggestion_id=str(uuid.uuid4()),
+            type=self._map_issue_to_suggestion_type(issue.issue_type),
+            column=issue.column,
+            description=suggestion_data['action'],
+            confidence=suggestion_data['confidence'],
+            risk_level=suggestion_data['risk_level'],
+            transformation={'action': suggestion_data['action']},
+            explanation=suggestion_data['explanation']
+        )
+    
+    def _parse_json_content(self, content: str) -> Any:
+        """
+        Parse a JSON LLM response, stripping a Markdown code fence if present.
+        
+        Args:
+            content: Raw response content
+            
+        Returns:
+            Parsed JSON value
+        """
+        content = content.strip()
+        if content.startswith('```json'):
+            content = content[7:-3]
+        elif content.startswith('```'):
+            content = content[3:-3]
+        return json.loads(content)
+    
+    def _call_limiter(self) -> asyncio.Semaphore:
+        """
+        Create the semaphore bounding calls in flight for one analysis.
+        
+        Returns:
+            Semaphore allowing max_concurrency calls, or one in sequential mode
+        """
+        return asyncio.Semaphore(self.max_concurrency if self.concurrent else 1)
+    
+    async def _run_limited(self, semaphore: asyncio.Semaphore, label: str,
+                           call: Awaitable[T], default: T) -> T:
+        """
+        Run one check or suggestion call under the concurrency limit and timeout.
+        
+        Failures are contained so the other calls still return their results.
+        
+        Args:
+            semaphore: Limiter shared by the calls of one analysis
+            label: Description of the call for logging
+            call: Coroutine to run
+            default: Result to use if the call fails or times out
+            
+        Returns:
+            Result of the call, or default
+        """
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(call, timeout=self.call_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{label} timed out after {self.call_timeout}s, continuing without it")
+            except Exception as e:
+                logger.error(f"Error in {label}: {str(e)}")
+            return default
+    
     def _generate_data_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Generate a summary of the DataFrame for AI analysis.
@@ -122,25 +440,17 @@ class DataQualityAgent:
         Returns:
             Dictionary containing data summary
         """
-        summary = {
+        # One bulk profiling pass; sample data is the first 5 unique non-null values
+        profile = profile_frame(df, first_k=5, top_k=0)
+        
+        return {
             'shape': df.shape,
             'columns': list(df.columns),
-            'dtypes': df.dtypes.astype(str).to_dict(),
-            'null_counts': df.isnull().sum().to_dict(),
-            'unique_counts': df.nunique().to_dict(),
-            'sample_data': {}
+            'dtypes': profile.dtypes(),
+            'null_counts': profile.null_counts(),
+            'unique_counts': profile.distinct_counts(),
+            'sample_data': {col: stats.first_values for col, stats in profile.columns.items()}
         }
-        
-        # Add sample data for each column (first 5 unique values)
-        for col in df.columns:
-            unique_values = df[col].dropna().unique()[:5]
-            # Convert to native Python types for JSON serialization
-            summary['sample_data'][col] = [
-                val.item() if hasattr(val, 'item') else val 
-                for val in unique_values
-            ]
-        
-        return summary
     
     async def _analyze_data_types(self, df: pd.DataFrame, summary: Dict[str, Any]) -> List[QualityIssue]:
         """
@@ -388,7 +698,7 @@ class DataQualityAgent:
             AI-generated suggestion or None
         """
         # Get sample data for the problematic column
-        sample_data = df[issue.column].dropna().unique()[:10].tolist()
+        sample_data = self._column_sample(df, issue.column)
         
         prompt = f"""
         Generate a specific, actionable suggestion to fix this data quality issue:
@@ -429,30 +739,9 @@ class DataQualityAgent:
                 max_tokens=500
             )
             
-            content = response.choices[0].message.content.strip()
-            # Clean up the response to extract JSON
-            if content.startswith('```json'):
-                content = content[7:-3]
-            elif content.startswith('```'):
-                content = content[3:-3]
-            
-            suggestion_data = json.loads(content)
-            
-            # Map issue type to suggestion type
-            suggestion_type = self._map_issue_to_suggestion_type(issue.issue_type)
-            
-            suggestion = Suggestion(
-                suggestion_id=str(uuid.uuid4()),
-                type=suggestion_type,
-                column=issue.column,
-                description=suggestion_data['action'],
-                confidence=suggestion_data['confidence'],
-                risk_level=suggestion_data['risk_level'],
-                transformation={'action': suggestion_data['action']},
-                explanation=suggestion_data['explanation']
-            )
+            suggestion_data = self._parse_json_content(response.choices[0].message.content)
             
-            return suggestion
+            return self._build_suggestion(issue, suggestion_data)
             
         except Exception as e:
             logger.error(f"Error generating suggestion for issue {issue.issue_id}: {str(e)}")
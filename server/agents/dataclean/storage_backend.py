@@ -0,0 +1,110 @@
+"""
+Storage Backend Interface for ScioScribe Data Cleaning System.
+
+The data cleaning agents, API routes and conversation nodes only talk to the
+data store returned by ``get_data_store()``. This module defines the method
+surface every store implements, so the backend can be chosen by
+configuration (``datastore_backend``):
+
+- ``memory``: MemoryDataStore, dictionaries in the process (the default)
+- ``sqlite``: PersistentDataStore, SQLite metadata plus frame files on disk,
+  which survives restarts and can be shared by several uvicorn workers
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .models import DataArtifact, TransformationRule
+
+
+class DataStoreBackend(ABC):
+    """
+    Interface for storage of data artifacts, DataFrames, transformation
+    rules and data versions.
+
+    Save and delete methods return True on success and False on failure; get
+    methods return None (or an empty list) when nothing is found or the
+    lookup fails. Errors are logged, not raised.
+    """
+
+    # === Data Artifact Operations ===
+
+    @abstractmethod
+    async def save_data_artifact(self, artifact: DataArtifact) -> bool:
+        """Save a data artifact."""
+
+    @abstractmethod
+    async def get_data_artifact(self, artifact_id: str) -> Optional[DataArtifact]:
+        """Retrieve a data artifact."""
+
+    async def update_data_artifact(self, artifact: DataArtifact) -> bool:
+        """
+        Update an existing data artifact.
+
+        Args:
+            artifact: The updated artifact
+
+        Returns:
+            True if successful, False otherwise
+        """
+        artifact.updated_at = datetime.now()
+        return await self.save_data_artifact(artifact)
+
+    @abstractmethod
+    async def list_data_artifacts(self, experiment_id: Optional[str] = None) -> List[DataArtifact]:
+        """List data artifacts, optionally filtered by experiment."""
+
+    # === DataFrame Operations ===
+
+    @abstractmethod
+    async def save_dataframe(self, artifact_id: str, dataframe: pd.DataFrame) -> bool:
+        """Save the current DataFrame of an artifact."""
+
+    @abstractmethod
+    async def get_dataframe(self, artifact_id: str) -> Optional[pd.DataFrame]:
+        """Retrieve the current DataFrame of an artifact."""
+
+    # === Transformation Rules Operations ===
+
+    @abstractmethod
+    async def save_transformation_rule(self, rule: TransformationRule) -> bool:
+        """Save a transformation rule."""
+
+    @abstractmethod
+    async def get_transformation_rule(self, rule_id: str) -> Optional[TransformationRule]:
+        """Retrieve a transformation rule."""
+
+    @abstractmethod
+    async def search_transformation_rules(self, pattern: str, user_id: str) -> List[TransformationRule]:
+        """Search a user's transformation rules by name or column pattern."""
+
+    # === Data Version Operations ===
+
+    @abstractmethod
+    async def save_data_version(self, artifact_id: str, version: int, dataframe: pd.DataFrame) -> bool:
+        """Save a numbered version of an artifact's DataFrame."""
+
+    @abstractmethod
+    async def get_data_version(self, artifact_id: str, version: int) -> Optional[pd.DataFrame]:
+        """Retrieve a numbered version of an artifact's DataFrame."""
+
+    # === Utility Methods ===
+
+    @abstractmethod
+    async def delete_data_artifact(self, artifact_id: str) -> bool:
+        """Delete a data artifact and all associated data."""
+
+    @abstractmethod
+    async def get_storage_stats(self) -> Dict[str, Any]:
+        """Get storage statistics."""
+
+
+def rule_matches(rule: TransformationRule, pattern: str, user_id: str) -> bool:
+    """Whether a rule belongs to the user and its name or column pattern contains the pattern."""
+    pattern = pattern.lower()
+    return rule.created_by == user_id and (
+        pattern in rule.name.lower() or pattern in rule.column_pattern.lower()
+    )
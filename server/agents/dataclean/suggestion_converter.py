@@ -6,6 +6,7 @@ CustomTransformation objects that can be applied to data using the Transformatio
 """
 
 import uuid
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
@@ -82,9 +83,10 @@ class SuggestionConverter:
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
         
-        # Analyze the column to determine standardization approach
-        unique_values = df[column].dropna().unique()
-        value_mappings = []
+        # Analyze the column to determine standardization approach: each
+        # distinct value once, with its row count
+        counts = _distinct_counts(df[column])
+        originals = _distinct_text(counts)
         
         # Check if this is a case standardization (title case, lowercase, etc.)
         if "title case" in suggestion.description.lower():
@@ -92,60 +94,29 @@ class SuggestionConverter:
             parameters = {"format_type": "text", "case": "title"}
             
             # Create mappings for preview
-            for value in unique_values:
-                if isinstance(value, str):
-                    new_value = value.title()
-                    if new_value != value:
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value=new_value,
-                            count=int((df[column] == value).sum())
-                        ))
+            new_values = originals.str.title()
                         
         elif "lowercase" in suggestion.description.lower():
             action = TransformationAction.STANDARDIZE_FORMAT
             parameters = {"format_type": "text", "case": "lower"}
             
-            for value in unique_values:
-                if isinstance(value, str):
-                    new_value = value.lower()
-                    if new_value != value:
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value=new_value,
-                            count=int((df[column] == value).sum())
-                        ))
+            new_values = originals.str.lower()
         
         elif "uppercase" in suggestion.description.lower():
             action = TransformationAction.STANDARDIZE_FORMAT
             parameters = {"format_type": "text", "case": "upper"}
             
-            for value in unique_values:
-                if isinstance(value, str):
-                    new_value = value.upper()
-                    if new_value != value:
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value=new_value,
-                            count=int((df[column] == value).sum())
-                        ))
+            new_values = originals.str.upper()
         
         else:
             # General categorical standardization
             action = TransformationAction.REPLACE_VALUES
             parameters = {}
             
-            # Try to infer common standardizations
-            for value in unique_values:
-                if isinstance(value, str):
-                    # Clean up common issues
-                    clean_value = value.strip()
-                    if clean_value != value:
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value=clean_value,
-                            count=int((df[column] == value).sum())
-                        ))
+            # Try to infer common standardizations: clean up common issues
+            new_values = originals.str.strip()
+        
+        value_mappings = _value_mappings(counts, new_values, _changed(originals, new_values))
         
         return CustomTransformation(
             transformation_id=str(uuid.uuid4()),
@@ -178,58 +149,36 @@ class SuggestionConverter:
             action = TransformationAction.CONVERT_TYPE
             parameters = {"target_type": "int"}
             
-            # Find non-numeric values that need to be handled
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if not pd.api.types.is_numeric_dtype(type(value)):
-                    try:
-                        # Try to convert common text numbers
-                        if isinstance(value, str):
-                            if value.lower() in ["thirty-five", "35"]:
-                                value_mappings.append(ValueMapping(
-                                    original_value=value,
-                                    new_value=35,
-                                    count=int((df[column] == value).sum())
-                                ))
-                            elif "null" in description or "default" in description:
-                                value_mappings.append(ValueMapping(
-                                    original_value=value,
-                                    new_value=None,
-                                    count=int((df[column] == value).sum())
-                                ))
-                    except:
-                        pass
+            # Find non-numeric (text) values that need to be handled
+            counts = _distinct_counts(df[column])
+            originals = _distinct_text(counts)
+            is_text = originals.notna()
+            
+            # Try to convert common text numbers
+            text_number = originals.str.lower().isin(["thirty-five", "35"]) & is_text
+            selected = text_number
+            if "null" in description or "default" in description:
+                selected = selected | is_text
+            new_values = pd.Series(np.where(text_number, 35, None), dtype=object)
+            value_mappings = _value_mappings(counts, new_values, selected)
         
         elif "email" in description:
             # Email format validation and correction
             action = TransformationAction.STANDARDIZE_FORMAT
             parameters = {"format_type": "email"}
             
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if isinstance(value, str) and "@" in value:
-                    # Common email corrections
-                    if value == "bob@email":
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value="bob@email.com",
-                            count=int((df[column] == value).sum())
-                        ))
+            # Common email corrections
+            value_mappings = _email_corrections(_distinct_counts(df[column]))
         
         elif "phone" in description:
             # Phone number standardization
             action = TransformationAction.STANDARDIZE_FORMAT
             parameters = {"format_type": "phone"}
             
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if isinstance(value, str):
-                    if "invalid" in value.lower():
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value="N/A",
-                            count=int((df[column] == value).sum())
-                        ))
+            counts = _distinct_counts(df[column])
+            originals = _distinct_text(counts)
+            invalid = _contains_invalid(originals)
+            value_mappings = _value_mappings(counts, pd.Series("N/A", index=originals.index), invalid)
         
         else:
             # General data type conversion
@@ -308,7 +257,8 @@ class SuggestionConverter:
                     count=int(missing_count)
                 ))
             elif strategy == "mode":
-                mode_value = df[column].mode().iloc[0] if not df[column].mode().empty else "Unknown"
+                modes = df[column].mode()
+                mode_value = modes.iloc[0] if not modes.empty else "Unknown"
                 value_mappings.append(ValueMapping(
                     original_value=None,
                     new_value=mode_value,
@@ -353,14 +303,13 @@ class SuggestionConverter:
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if isinstance(value, (int, float)) and (value < lower_bound or value > upper_bound):
-                    value_mappings.append(ValueMapping(
-                        original_value=value,
-                        new_value=median_value,
-                        count=int((df[column] == value).sum())
-                    ))
+            counts = _distinct_counts(df[column])
+            originals = _distinct_values(counts)
+            # Checked on the column's own scalars (numpy integers are not int)
+            is_number = pd.Series([isinstance(value, (int, float)) for value in counts.index.to_numpy()], dtype=bool)
+            numbers = pd.to_numeric(originals.where(is_number), errors="coerce")
+            outside = is_number & ((numbers < lower_bound) | (numbers > upper_bound))
+            value_mappings = _value_mappings(counts, pd.Series(median_value, index=originals.index), outside)
             
             parameters = {"method": "replace_with_median"}
         
@@ -377,21 +326,20 @@ class SuggestionConverter:
             
             # Find specific outlier values mentioned in description
             value_mappings = []
+            counts = _distinct_counts(df[column])
             # Look for specific values mentioned (e.g., "999999")
             outlier_pattern = r'(\d+)'
             matches = re.findall(outlier_pattern, suggestion.description)
             
             for match in matches:
-                try:
-                    outlier_value = float(match)
-                    if outlier_value in df[column].values:
-                        value_mappings.append(ValueMapping(
-                            original_value=outlier_value,
-                            new_value=median_value,
-                            count=int((df[column] == outlier_value).sum())
-                        ))
-                except:
-                    pass
+                outlier_value = float(match)
+                count = _count_of(counts, outlier_value)
+                if count:
+                    value_mappings.append(ValueMapping(
+                        original_value=outlier_value,
+                        new_value=median_value,
+                        count=count
+                    ))
             
             parameters = {"method": "replace_with_median"}
         
@@ -426,57 +374,38 @@ class SuggestionConverter:
             parameters = {"format_type": "phone"}
             
             # Create mappings for phone number standardization
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if isinstance(value, str):
-                    if "invalid" in value.lower():
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value="N/A",
-                            count=int((df[column] == value).sum())
-                        ))
-                    elif re.match(r'\d{10}', value.replace('-', '').replace('(', '').replace(')', '').replace(' ', '')):
-                        # Format as (XXX) XXX-XXXX
-                        digits = re.sub(r'[^\d]', '', value)
-                        if len(digits) == 10:
-                            formatted = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-                            if formatted != value:
-                                value_mappings.append(ValueMapping(
-                                    original_value=value,
-                                    new_value=formatted,
-                                    count=int((df[column] == value).sum())
-                                ))
+            counts = _distinct_counts(df[column])
+            originals = _distinct_text(counts)
+            
+            # Format ten digit numbers as (XXX) XXX-XXXX
+            digits = originals.str.replace(r'[^\d]', '', regex=True)
+            formatted = "(" + digits.str[:3] + ") " + digits.str[3:6] + "-" + digits.str[6:]
+            ten_digits = (
+                originals.str.replace(r'[-() ]', '', regex=True).str.match(r'\d{10}', na=False).astype(bool)
+                & (digits.str.len() == 10)
+            )
+            new_values = formatted.where(ten_digits)
+            
+            invalid = _contains_invalid(originals)
+            new_values[invalid] = "N/A"
+            value_mappings = _value_mappings(counts, new_values, _changed(originals, new_values))
         
         elif "email" in description:
             action = TransformationAction.STANDARDIZE_FORMAT
             parameters = {"format_type": "email"}
             
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if isinstance(value, str) and "@" in value:
-                    # Common email corrections
-                    if "bob@email" == value:
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value="bob@email.com",
-                            count=int((df[column] == value).sum())
-                        ))
+            # Common email corrections
+            value_mappings = _email_corrections(_distinct_counts(df[column]))
         
         else:
             # General text formatting
             action = TransformationAction.STANDARDIZE_FORMAT
             parameters = {"format_type": "text", "case": "lower"}
             
-            value_mappings = []
-            for value in df[column].dropna().unique():
-                if isinstance(value, str):
-                    formatted = value.strip().lower()
-                    if formatted != value:
-                        value_mappings.append(ValueMapping(
-                            original_value=value,
-                            new_value=formatted,
-                            count=int((df[column] == value).sum())
-                        ))
+            counts = _distinct_counts(df[column])
+            originals = _distinct_text(counts)
+            new_values = originals.str.strip().str.lower()
+            value_mappings = _value_mappings(counts, new_values, _changed(originals, new_values))
         
         return CustomTransformation(
             transformation_id=str(uuid.uuid4()),
@@ -487,4 +416,63 @@ class SuggestionConverter:
             description=suggestion.description,
             created_by=user_id,
             created_at=datetime.now()
-        ) 
\ No newline at end of file
+        ) 
+
+
+# === Vectorized helpers: one pass over the column, then work per distinct value ===
+
+def _distinct_counts(series: pd.Series) -> pd.Series:
+    """Rows per distinct non-missing value, in order of first appearance."""
+    counts = series.value_counts(sort=False, dropna=True)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categorical counts follow the categories and include unused ones
+        counts = counts.reindex(list(series.dropna().unique()))
+    return counts
+
+
+def _distinct_values(counts: pd.Series) -> pd.Series:
+    """The distinct values of _distinct_counts as an object Series."""
+    return pd.Series(list(counts.index), dtype=object)
+
+
+def _distinct_text(counts: pd.Series) -> pd.Series:
+    """The distinct values of _distinct_counts, with None for values that are not text, for ``.str`` methods."""
+    values = _distinct_values(counts)
+    return values.where(values.map(lambda value: isinstance(value, str)).astype(bool), None)
+
+
+def _changed(originals: pd.Series, new_values: pd.Series) -> pd.Series:
+    """Distinct values that have a new value different from themselves."""
+    return new_values.notna() & (new_values != originals)
+
+
+def _contains_invalid(originals: pd.Series) -> pd.Series:
+    """Text values containing "invalid" in any case."""
+    return originals.str.lower().str.contains("invalid", regex=False, na=False).astype(bool)
+
+
+def _value_mappings(counts: pd.Series, new_values: pd.Series, selected: pd.Series) -> List[ValueMapping]:
+    """ValueMappings of the selected distinct values to their new values."""
+    selected = selected.to_numpy(dtype=bool)
+    return [
+        ValueMapping(original_value=original, new_value=new_value, count=int(count))
+        for original, new_value, count in zip(
+            counts.index[selected], new_values.to_numpy()[selected], counts.to_numpy()[selected]
+        )
+    ]
+
+
+def _count_of(counts: pd.Series, value: Any) -> int:
+    """Rows holding a value, 0 if the column has none."""
+    try:
+        return int(counts.get(value, 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _email_corrections(counts: pd.Series) -> List[ValueMapping]:
+    """Mappings for common email typos."""
+    count = _count_of(counts, "bob@email")
+    if not count:
+        return []
+    return [ValueMapping(original_value="bob@email", new_value="bob@email.com", count=count)]
@@ -5,14 +5,19 @@ This module provides the core logic for applying custom transformations,
 generating previews, and managing transformation rules.
 """
 
+import asyncio
 import uuid
-import hashlib
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 import copy
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import get_settings
 
 from .models import (
     CustomTransformation,
@@ -24,9 +29,53 @@ from .models import (
     TransformationAction
 )
 from .memory_store import get_data_store
+from .cow_frame import derive_frame, freeze_frame
+from .frame_hash import hash_frame
+from .value_mapping import CompiledValueMapping, ValueReplacement, changed_mask, value_key
+from . import lazy_engine
+from .transformation_pipeline import (
+    PipelineResult,
+    TransformationPipeline,
+    fuse_chain,
+    merge_replacements
+)
 
 logger = logging.getLogger(__name__)
 
+# Rows shown as before/after samples in a preview
+PREVIEW_DISPLAY_ROWS = 10
+
+# Actions that map each value independently of the rest of the column
+VALUE_WISE_ACTIONS = {TransformationAction.CONVERT_TYPE, TransformationAction.STANDARDIZE_FORMAT}
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_transformation_executor() -> ThreadPoolExecutor:
+    """
+    Get the worker pool shared by all transformation engines.
+    
+    Returns:
+        ThreadPoolExecutor with transformation_max_workers threads
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = get_settings().transformation_max_workers
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transformations")
+            logger.info(f"Initialized transformation pool with {workers} workers")
+        return _executor
+
+
+def shutdown_transformation_executor(wait: bool = True) -> None:
+    """Shut down the shared transformation pool (e.g. on application shutdown)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+        _executor = None
+
 
 class TransformationEngine:
     """
@@ -38,6 +87,9 @@ class TransformationEngine:
         """Initialize the transformation engine."""
         # Use in-memory data store for storage
         self.data_store = get_data_store()
+        # Worker threads for the independent column chains of a pipeline
+        # (the pool is shared by all engines, see get_transformation_executor)
+        self.max_workers = get_settings().transformation_max_workers
         
     async def create_transformation_preview(
         self,
@@ -47,6 +99,14 @@ class TransformationEngine:
         """
         Generate a preview of how a transformation will affect the data.
         
+        The transformation is applied to the target column only, so the
+        preview shows exactly what apply_transformation will write and counts
+        rows exactly. Value replacements, missing value fills and outlier
+        removal are single vectorized passes over the column (fill values and
+        outlier bounds come from the whole column). Type conversion and
+        format standardization work value by value, so they are applied to
+        the distinct values of the column only and mapped back to the rows.
+        
         Args:
             df: Original DataFrame
             transformation: Transformation to preview
@@ -57,35 +117,56 @@ class TransformationEngine:
         try:
             logger.info(f"Creating preview for transformation: {transformation.transformation_id}")
             
-            # Create a copy for preview
-            preview_df = df.copy()
-            
-            # Apply transformation to the copy
-            transformed_df = await self._apply_transformation_to_dataframe(
-                preview_df, transformation
-            )
+            column = transformation.column
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in DataFrame")
             
-            # Calculate impact
             total_rows = len(df)
-            affected_rows = self._count_affected_rows(df, transformation)
             
-            # Get sample data (before and after)
-            sample_size = min(10, total_rows)
-            before_sample = df.head(sample_size).to_dict('records')
-            after_sample = transformed_df.head(sample_size).to_dict('records')
+            # Apply transformation to the target column alone, positionally indexed
+            before = pd.Series(df[column].array, index=pd.RangeIndex(total_rows), name=column, copy=False)
+            replacement = None
+            if transformation.action == TransformationAction.REPLACE_VALUES:
+                # Value replacements report the rows they replace
+                replacement = CompiledValueMapping(transformation.value_mappings).apply(before)
+                after = replacement.values
+            elif transformation.action in VALUE_WISE_ACTIONS:
+                after = self._transform_distinct_values(before, transformation)
+            else:
+                transformed_df = await self._apply_transformation_to_dataframe(
+                    before.to_frame(), transformation
+                )
+                after = transformed_df[column]
+            
+            # One vectorized mask of affected rows: removed, or value changed
+            removed = np.ones(len(before), dtype=bool)
+            removed[after.index] = False
+            if replacement is not None:
+                affected = replacement.replaced
+            else:
+                affected = removed.copy()
+                affected[after.index] = changed_mask(before.loc[after.index], after)
+            affected_rows = int(affected.sum())
+            
+            # Sample data (before and after) from the first rows
+            sample_size = min(PREVIEW_DISPLAY_ROWS, total_rows)
+            before_rows = df.head(sample_size)
+            kept = after.index[after.index < sample_size]
+            after_rows = derive_frame(before_rows.iloc[kept])
+            after_rows[column] = after.loc[kept].array
             
             # Generate impact summary
             impact_summary = self._generate_impact_summary(
-                df, transformed_df, transformation
+                df, before, after, transformation, removed, replacement
             )
             
             preview = TransformationPreview(
                 transformation_id=transformation.transformation_id,
-                column=transformation.column,
+                column=column,
                 total_rows=total_rows,
                 affected_rows=affected_rows,
-                before_sample=before_sample,
-                after_sample=after_sample,
+                before_sample=before_rows.to_dict('records'),
+                after_sample=after_rows.to_dict('records'),
                 impact_summary=impact_summary
             )
             
@@ -122,13 +203,19 @@ class TransformationEngine:
             version_id = str(uuid.uuid4())
             current_version = self._get_next_version_number(artifact_id)
             
+            # Freeze the current state (a no-op for frames from the store or a
+            # previous transformation) so it is shared rather than copied
+            base_df = freeze_frame(df)
+            
             # Store the current state before transformation
-            await self.data_store.save_data_version(artifact_id, current_version - 1, df)
+            await self.data_store.save_data_version(artifact_id, current_version - 1, base_df)
             
-            # Apply transformation
+            # Apply transformation; only the columns it replaces are new, and
+            # those are frozen in place since nothing else references them
             transformed_df = await self._apply_transformation_to_dataframe(
-                df.copy(), transformation
+                derive_frame(base_df), transformation
             )
+            transformed_df = freeze_frame(transformed_df, adopt=True)
             
             # Create version record
             data_version = DataVersion(
@@ -152,6 +239,200 @@ class TransformationEngine:
             logger.error(f"Error applying transformation: {str(e)}")
             raise
 
+    async def apply_pipeline(
+        self,
+        df: pd.DataFrame,
+        pipeline: TransformationPipeline,
+        artifact_id: str,
+        user_id: str
+    ) -> PipelineResult:
+        """
+        Apply a batch of transformations in one pass and record one version.
+        
+        The pipeline's column chains run concurrently, fused value
+        replacements in a single pass; the frame is frozen, stored and hashed
+        once for the whole batch. With the ``polars`` transformation engine,
+        large frames run as one lazy Polars plan when it supports every
+        transformation (see lazy_engine.py). A transformation that fails is
+        skipped and reported, as if it had been applied on its own.
+        
+        Args:
+            df: Original DataFrame
+            pipeline: Transformations to apply
+            artifact_id: ID of the data artifact
+            user_id: ID of the user applying the transformations
+            
+        Returns:
+            PipelineResult with the transformed DataFrame and a version listing
+            the applied transformations in order (no version if none applied)
+        """
+        try:
+            logger.info(f"Applying pipeline of {len(pipeline)} transformations")
+            
+            base_df = freeze_frame(df)
+            if self._use_lazy_engine(base_df, pipeline):
+                working_df, applied, failed = await self._run_pipeline_lazy(base_df, pipeline)
+            else:
+                working_df, applied, failed = await self._run_pipeline_stages(base_df, pipeline)
+            
+            if not applied:
+                return PipelineResult(base_df, None, [], failed)
+            
+            # Lineage in the order the transformations were queued
+            order = {id(transformation): position for position, transformation in enumerate(pipeline.transformations)}
+            applied.sort(key=lambda transformation: order[id(transformation)])
+            
+            current_version = self._get_next_version_number(artifact_id)
+            await self.data_store.save_data_version(artifact_id, current_version - 1, base_df)
+            transformed_df = freeze_frame(working_df, adopt=True)
+            
+            data_version = DataVersion(
+                version_id=str(uuid.uuid4()),
+                artifact_id=artifact_id,
+                version_number=current_version,
+                description=(
+                    f"Applied {len(applied)} transformations: "
+                    + "; ".join(transformation.description for transformation in applied)
+                ),
+                transformations_applied=[transformation.transformation_id for transformation in applied],
+                data_hash=self._calculate_data_hash(transformed_df),
+                created_at=datetime.now(),
+                created_by=user_id
+            )
+            await self.data_store.save_data_version(artifact_id, current_version, transformed_df)
+            
+            logger.info(
+                f"Pipeline applied {len(applied)} transformations ({len(failed)} failed). "
+                f"New version: {current_version}"
+            )
+            return PipelineResult(transformed_df, data_version, applied, failed)
+            
+        except Exception as e:
+            logger.error(f"Error applying pipeline: {str(e)}")
+            raise
+    
+    def _use_lazy_engine(self, df: pd.DataFrame, pipeline: TransformationPipeline) -> bool:
+        """Whether a pipeline runs on the lazy Polars engine rather than pandas."""
+        settings = get_settings()
+        return (
+            settings.transformation_engine == "polars"
+            and len(df) >= settings.lazy_engine_min_rows
+            and lazy_engine.supports(df, pipeline)
+        )
+    
+    async def _run_pipeline_lazy(
+        self,
+        base_df: pd.DataFrame,
+        pipeline: TransformationPipeline
+    ) -> Tuple[pd.DataFrame, List[CustomTransformation], List[Tuple[CustomTransformation, str]]]:
+        """Run a pipeline as one Polars plan, falling back to pandas if it fails."""
+        try:
+            loop = asyncio.get_running_loop()
+            # Polars runs the plan on its own thread pool; keep the event loop free
+            working_df = await loop.run_in_executor(
+                get_transformation_executor(), lazy_engine.execute, base_df, pipeline
+            )
+            logger.info(f"Pipeline executed on the lazy Polars engine ({len(base_df)} rows)")
+            return working_df, list(pipeline.transformations), []
+        except Exception as e:
+            logger.warning(f"Lazy pipeline execution failed, using pandas: {str(e)}")
+            return await self._run_pipeline_stages(base_df, pipeline)
+    
+    async def _run_pipeline_stages(
+        self,
+        base_df: pd.DataFrame,
+        pipeline: TransformationPipeline
+    ) -> Tuple[pd.DataFrame, List[CustomTransformation], List[Tuple[CustomTransformation, str]]]:
+        """
+        Run a pipeline's stages with pandas.
+        
+        Returns:
+            (transformed frame, applied transformations, failed transformations with errors)
+        """
+        working_df = derive_frame(base_df)
+        applied: List[CustomTransformation] = []
+        failed: List[Tuple[CustomTransformation, str]] = []
+        
+        for stage in pipeline.compile():
+            if stage.row_filter is not None:
+                try:
+                    working_df = self._transform_frame(working_df, stage.row_filter)
+                    applied.append(stage.row_filter)
+                except Exception as e:
+                    logger.warning(f"Transformation {stage.row_filter.transformation_id} failed: {str(e)}")
+                    failed.append((stage.row_filter, str(e)))
+                continue
+            
+            # Chains of different columns are independent: run them side by side
+            columns = []
+            for column, chain in stage.chains.items():
+                if column in working_df.columns:
+                    columns.append(column)
+                else:
+                    failed.extend((transformation, f"Column '{column}' not found in DataFrame") for transformation in chain)
+            
+            if len(columns) > 1 and self.max_workers > 1:
+                loop = asyncio.get_running_loop()
+                executor = get_transformation_executor()
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(
+                        executor, self._run_column_chain, working_df[column], stage.chains[column]
+                    )
+                    for column in columns
+                ])
+            else:
+                results = [self._run_column_chain(working_df[column], stage.chains[column]) for column in columns]
+            
+            for column, (values, chain_applied, chain_failed) in zip(columns, results):
+                if chain_applied:
+                    working_df[column] = values
+                applied.extend(chain_applied)
+                failed.extend(chain_failed)
+        
+        return working_df, applied, failed
+    
+    def _run_column_chain(
+        self,
+        values: pd.Series,
+        chain: List[CustomTransformation]
+    ) -> Tuple[pd.Series, List[CustomTransformation], List[Tuple[CustomTransformation, str]]]:
+        """
+        Apply the transformations of one column in order, on that column alone.
+        
+        Returns:
+            (new column, applied transformations, failed transformations with errors)
+        """
+        applied, failed = [], []
+        column_df = values.to_frame()
+        for step in fuse_chain(chain):
+            if len(step) > 1:
+                try:
+                    column_df = self._transform_frame(column_df, merge_replacements(step))
+                    applied.extend(step)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Fused value replacements failed, applying them one by one: {str(e)}")
+            
+            for transformation in step:
+                try:
+                    column_df = self._transform_frame(column_df, transformation)
+                    applied.append(transformation)
+                except Exception as e:
+                    logger.warning(f"Transformation {transformation.transformation_id} failed: {str(e)}")
+                    failed.append((transformation, str(e)))
+        
+        return column_df.iloc[:, 0], applied, failed
+
+    def _transform_distinct_values(self, column: pd.Series, transformation: CustomTransformation) -> pd.Series:
+        """Apply a value-wise transformation to the distinct values of a column and map them back to its rows."""
+        if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in ("string", "empty"):
+            # Hashing equates True, 1 and 1.0, so mixed objects cannot share codes
+            return self._transform_frame(column.to_frame(), transformation)[column.name]
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        distinct = pd.Series(uniques, name=column.name)
+        transformed = self._transform_frame(distinct.to_frame(), transformation)[column.name]
+        return pd.Series(transformed.array.take(codes), index=column.index, name=column.name)
+    
     async def _apply_transformation_to_dataframe(
         self,
         df: pd.DataFrame,
@@ -167,6 +448,10 @@ class TransformationEngine:
         Returns:
             Transformed DataFrame
         """
+        return self._transform_frame(df, transformation)
+    
+    def _transform_frame(self, df: pd.DataFrame, transformation: CustomTransformation) -> pd.DataFrame:
+        """Apply a transformation to a DataFrame (synchronous, safe to run in a worker thread)."""
         column = transformation.column
         
         if column not in df.columns:
@@ -190,17 +475,12 @@ class TransformationEngine:
         df: pd.DataFrame,
         transformation: CustomTransformation
     ) -> pd.DataFrame:
-        """Apply value replacement transformation."""
+        """Apply value replacement transformation in a single pass over the column."""
         column = transformation.column
         
-        for mapping in transformation.value_mappings:
-            # Handle different types of original values
-            if pd.isna(mapping.original_value):
-                # Replace NaN values
-                df[column] = df[column].fillna(mapping.new_value)
-            else:
-                # Replace specific values
-                df[column] = df[column].replace(mapping.original_value, mapping.new_value)
+        replacement = CompiledValueMapping(transformation.value_mappings).apply(df[column])
+        if replacement.replaced.any():
+            df[column] = replacement.values
         
         return df
     
@@ -315,70 +595,56 @@ class TransformationEngine:
         
         return df
     
-    def _count_affected_rows(
-        self,
-        df: pd.DataFrame,
-        transformation: CustomTransformation
-    ) -> int:
-        """Count how many rows will be affected by the transformation."""
-        column = transformation.column
-        
-        if transformation.action == TransformationAction.REPLACE_VALUES:
-            affected = 0
-            for mapping in transformation.value_mappings:
-                if pd.isna(mapping.original_value):
-                    affected += df[column].isna().sum()
-                else:
-                    affected += (df[column] == mapping.original_value).sum()
-            return affected
-        elif transformation.action == TransformationAction.FILL_MISSING:
-            return df[column].isna().sum()
-        elif transformation.action == TransformationAction.CONVERT_TYPE:
-            return len(df)  # Type conversion affects all rows
-        else:
-            return len(df)  # Conservative estimate
-    
     def _generate_impact_summary(
         self,
-        original_df: pd.DataFrame,
-        transformed_df: pd.DataFrame,
-        transformation: CustomTransformation
+        df: pd.DataFrame,
+        before: pd.Series,
+        after: pd.Series,
+        transformation: CustomTransformation,
+        removed: np.ndarray,
+        replacement: Optional[ValueReplacement] = None
     ) -> Dict[str, Any]:
-        """Generate a summary of the transformation impact."""
+        """
+        Generate a summary of the transformation impact.
+        
+        ``before``/``after`` are the target column values before and after
+        the transformation; the ``removed`` mask and the value
+        ``replacement`` (for REPLACE_VALUES) are over ``before``.
+        """
         column = transformation.column
+        rows_removed = int(removed.sum())
         
         summary = {
             'transformation_type': transformation.action.value,
             'column': column,
-            'original_shape': original_df.shape,
-            'transformed_shape': transformed_df.shape,
-            'rows_changed': len(original_df) - len(transformed_df),
+            'original_shape': df.shape,
+            'transformed_shape': (len(df) - rows_removed, df.shape[1]),
+            'rows_changed': rows_removed,
         }
         
-        if column in original_df.columns and column in transformed_df.columns:
-            # Value distribution changes
-            original_unique = original_df[column].nunique()
-            transformed_unique = transformed_df[column].nunique()
-            
-            summary.update({
-                'original_unique_values': original_unique,
-                'transformed_unique_values': transformed_unique,
-                'unique_values_change': transformed_unique - original_unique,
-                'original_null_count': original_df[column].isna().sum(),
-                'transformed_null_count': transformed_df[column].isna().sum(),
-            })
-            
-            # Sample of value changes
-            if transformation.action == TransformationAction.REPLACE_VALUES:
-                value_changes = {}
-                for mapping in transformation.value_mappings:
-                    original_count = (original_df[column] == mapping.original_value).sum()
-                    if original_count > 0:
-                        value_changes[str(mapping.original_value)] = {
-                            'new_value': mapping.new_value,
-                            'count': original_count
-                        }
-                summary['value_changes'] = value_changes
+        # Value distribution changes
+        original_unique = int(before.nunique())
+        transformed_unique = int(after.nunique())
+        summary.update({
+            'original_unique_values': original_unique,
+            'transformed_unique_values': transformed_unique,
+            'unique_values_change': transformed_unique - original_unique,
+            'original_null_count': int(before.isna().sum()),
+            'transformed_null_count': int(after.isna().sum()),
+        })
+        
+        # Sample of value changes
+        if replacement is not None:
+            value_changes = {}
+            replaced_counts = replacement.replaced_counts()
+            for mapping in transformation.value_mappings:
+                original_count = replaced_counts.get(value_key(mapping.original_value), 0)
+                if original_count > 0:
+                    value_changes[str(mapping.original_value)] = {
+                        'new_value': mapping.new_value,
+                        'count': original_count
+                    }
+            summary['value_changes'] = value_changes
         
         return summary
     
@@ -397,9 +663,8 @@ class TransformationEngine:
     
     def _calculate_data_hash(self, df: pd.DataFrame) -> str:
         """Calculate a hash of the DataFrame for integrity checking."""
-        # Convert DataFrame to string and hash it
-        df_string = df.to_string()
-        return hashlib.md5(df_string.encode()).hexdigest()
+        # Per-column hashes; unchanged (shared) columns are not hashed again
+        return hash_frame(df)
     
     async def get_data_version(self, artifact_id: str, version: int) -> Optional[pd.DataFrame]:
         """Retrieve a specific version of the data."""
@@ -528,4 +793,6 @@ class TransformationEngine:
         
         # Convert pattern to regex
         regex_pattern = pattern.replace("*", ".*")
-        return bool(re.match(regex_pattern, column_name, re.IGNORECASE)) 
\ No newline at end of file
+        return bool(re.match(regex_pattern, column_name, re.IGNORECASE)) 
+
+
@@ -0,0 +1,137 @@
+"""
+Transformation Pipelines for ScioScribe Data Cleaning System.
+
+Applying a batch of transformations with one apply_transformation() call each
+saves two data versions, freezes the frame and hashes it once per
+transformation. A TransformationPipeline compiles the batch instead:
+
+- transformations that change one column (value replacement, type
+  conversion, missing value fill, format standardization) are grouped into
+  one chain per column; chains of different columns are independent, so they
+  run side by side in worker threads
+- consecutive value replacements on a column are fused into one, which the
+  compiled value mappings (value_mapping.py) apply in a single pass
+- row filters (outlier removal) change every column, so they end a stage:
+  chains queued before a filter run before it, chains queued after it see
+  the filtered rows
+
+TransformationEngine.apply_pipeline runs a pipeline and records one data
+version listing every applied transformation in order.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .models import CustomTransformation, DataVersion, TransformationAction
+
+logger = logging.getLogger(__name__)
+
+# Actions that change the rows of the frame rather than a single column
+ROW_ACTIONS = {TransformationAction.REMOVE_OUTLIERS}
+
+
+@dataclass
+class PipelineStage:
+    """Column chains that run together, or a single row filter."""
+    chains: Dict[str, List[CustomTransformation]] = field(default_factory=dict)
+    row_filter: Optional[CustomTransformation] = None
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of running a pipeline."""
+    dataframe: pd.DataFrame
+    data_version: Optional[DataVersion]  # None if no transformation was applied
+    applied: List[CustomTransformation]  # in pipeline order
+    failed: List[Tuple[CustomTransformation, str]]  # with the error message
+
+
+class TransformationPipeline:
+    """
+    An ordered batch of transformations, compiled into fused stages.
+    """
+
+    def __init__(self, transformations: Optional[List[CustomTransformation]] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            transformations: Transformations in the order they apply
+        """
+        self.transformations: List[CustomTransformation] = []
+        for transformation in transformations or []:
+            self.add(transformation)
+
+    def add(self, transformation: CustomTransformation) -> None:
+        """Queue a transformation after the ones already in the pipeline."""
+        self.transformations.append(transformation)
+
+    def depends_on(self, column: str) -> bool:
+        """
+        Whether the state of a column depends on the queued transformations.
+
+        True if a queued transformation changes the column, or filters rows.
+        Something derived from the column (e.g. a transformation converted
+        from a suggestion) must then look at the pipeline's result instead
+        of its input.
+        """
+        return any(
+            transformation.column == column or transformation.action in ROW_ACTIONS
+            for transformation in self.transformations
+        )
+
+    def compile(self) -> List[PipelineStage]:
+        """
+        Group the transformations into stages.
+
+        Returns:
+            Stages in the order they run: column chains (in queue order per
+            column) separated by row filters
+        """
+        stages: List[PipelineStage] = []
+        current = PipelineStage()
+        for transformation in self.transformations:
+            if transformation.action in ROW_ACTIONS:
+                if current.chains:
+                    stages.append(current)
+                stages.append(PipelineStage(row_filter=transformation))
+                current = PipelineStage()
+            else:
+                current.chains.setdefault(transformation.column, []).append(transformation)
+        if current.chains:
+            stages.append(current)
+        return stages
+
+    def __len__(self) -> int:
+        return len(self.transformations)
+
+
+def fuse_chain(chain: List[CustomTransformation]) -> List[List[CustomTransformation]]:
+    """
+    Split a column chain into steps, fusing consecutive value replacements.
+
+    Returns:
+        Groups of transformations; each group runs as one step
+    """
+    steps: List[List[CustomTransformation]] = []
+    for transformation in chain:
+        if (
+            steps
+            and transformation.action == TransformationAction.REPLACE_VALUES
+            and steps[-1][0].action == TransformationAction.REPLACE_VALUES
+        ):
+            steps[-1].append(transformation)
+        else:
+            steps.append([transformation])
+    return steps
+
+
+def merge_replacements(group: List[CustomTransformation]) -> CustomTransformation:
+    """One value replacement applying the mappings of several in order."""
+    if len(group) == 1:
+        return group[0]
+    mappings = [mapping for transformation in group for mapping in transformation.value_mappings]
+    return group[0].model_copy(update={"value_mappings": mappings})
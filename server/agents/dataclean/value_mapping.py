@@ -0,0 +1,232 @@
+"""
+Compiled Value Mappings for ScioScribe Data Cleaning System.
+
+A REPLACE_VALUES transformation carries value mappings that apply in order,
+each to the result of the previous ones (``A -> B`` then ``B -> C`` maps A to
+C). Applying them with one ``replace``/``fillna`` call per mapping scans the
+column once per mapping, which adds up for suggestions that fold hundreds of
+spellings into one value. CompiledValueMapping folds the mappings into one
+dictionary from original to final values and applies it in one pass:
+
+- the column is factorized once (a categorical column already is: its codes
+  are remapped and its categories renamed), the dictionary is looked up once
+  per distinct value, and the new column is taken from the mapped values
+- the same pass gives the mask of replaced rows and the replaced rows per
+  original value, so previews need no comparison per mapping
+
+Booleans are keyed apart from the numbers they equal (True == 1), so a
+mapping of True does not replace 1 and a mapping of 1 does not replace True.
+
+Columns holding unhashable values (e.g. lists) cannot be factorized and fall
+back to applying the mappings one at a time.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import ValueMapping
+
+logger = logging.getLogger(__name__)
+
+# Dictionary key standing for every kind of missing value (None, NaN, NaT, NA)
+MISSING = object()
+
+# Tags boolean keys: True == 1 and False == 0 hash alike, but map separately
+_BOOLEAN = object()
+
+# Inferred types of object columns that can mix booleans with numbers
+_MIXED_TYPES = ("mixed", "mixed-integer")
+
+
+def value_key(value: Any) -> Any:
+    """
+    Key of a value in a compiled mapping: MISSING for missing values, a
+    tagged pair for booleans (so True and 1 stay distinct), else the value.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return (_BOOLEAN, bool(value))
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return MISSING
+    return value
+
+
+@dataclass
+class ValueReplacement:
+    """Result of applying compiled value mappings to a column."""
+    values: pd.Series  # the new column
+    replaced: np.ndarray  # rows whose value was replaced
+    keys: List[Any]  # value_key of each distinct original value
+    codes: Optional[np.ndarray] = None  # position of each row's original value in keys (-1: the last)
+    matches: Optional[Dict[Any, np.ndarray]] = None  # replaced rows per key, without codes
+
+    def replaced_counts(self) -> Dict[Any, int]:
+        """
+        Replaced rows per original value.
+
+        Returns:
+            Row counts keyed by value_key of the original value
+        """
+        if self.codes is None:
+            return {key: int(mask.sum()) for key, mask in self.matches.items()}
+
+        slots = len(self.keys)
+        per_slot = np.bincount(self.codes[self.replaced] % slots, minlength=slots)
+        return {key: int(count) for key, count in zip(self.keys, per_slot) if count > 0}
+
+
+class CompiledValueMapping:
+    """
+    Ordered value mappings folded into one dictionary of final values.
+    """
+
+    def __init__(self, value_mappings: List[ValueMapping]):
+        """
+        Compile value mappings.
+
+        Args:
+            value_mappings: Mappings in the order they apply
+        """
+        self.value_mappings = list(value_mappings)
+        try:
+            self.final_values: Optional[Dict[Any, Any]] = _fold(self.value_mappings)
+        except TypeError:
+            # Unhashable original or new values cannot be dictionary keys
+            self.final_values = None
+
+    def apply(self, column: pd.Series) -> ValueReplacement:
+        """
+        Apply the mappings to a column in one pass.
+
+        Args:
+            column: Column to map; it is not modified
+
+        Returns:
+            ValueReplacement with the new column and the replaced rows
+        """
+        if self.final_values is None:
+            return self._apply_sequential(column)
+
+        categorical = isinstance(column.dtype, pd.CategoricalDtype)
+        if categorical:
+            codes = column.cat.codes.to_numpy()
+            uniques = list(column.cat.categories)
+        else:
+            try:
+                codes, uniques = _factorize(column)
+            except TypeError:
+                return self._apply_sequential(column)
+
+        # One slot per distinct value plus a last one for missing values,
+        # which code -1 indexes
+        has_missing = bool((codes < 0).any())
+        missing = column.iloc[int(np.argmax(codes < 0))] if has_missing else None
+        originals = uniques + [missing]
+        targets = list(originals)
+        slot_replaced = np.zeros(len(originals), dtype=bool)
+        for slot, original in enumerate(originals):
+            key = value_key(original)
+            if key in self.final_values:
+                target = self.final_values[key]
+                targets[slot] = target
+                slot_replaced[slot] = not _same_value(original, target)
+
+        replaced = slot_replaced[codes]
+        keys = [value_key(original) for original in originals]
+        if not replaced.any():
+            return ValueReplacement(column, replaced, keys, codes)
+
+        if categorical:
+            target_codes, categories = pd.factorize(np.array(targets, dtype=object), use_na_sentinel=True)
+            mapped = pd.Categorical.from_codes(
+                target_codes[codes], categories=pd.Index(list(categories)), ordered=column.cat.ordered
+            )
+        else:
+            mapped = _infer_array(targets if has_missing else targets[:-1], column.dtype).take(codes)
+
+        values = pd.Series(mapped, index=column.index, name=column.name, copy=False)
+        return ValueReplacement(values, replaced, keys, codes)
+
+    def _apply_sequential(self, column: pd.Series) -> ValueReplacement:
+        """Apply the mappings one at a time, for values that cannot be hashed."""
+        values = column
+        matches: Dict[Any, np.ndarray] = {}
+        for mapping in self.value_mappings:
+            if pd.isna(mapping.original_value):
+                matches[MISSING] = values.isna().to_numpy()
+                values = values.fillna(mapping.new_value)
+            else:
+                matches[value_key(mapping.original_value)] = (values == mapping.original_value).to_numpy()
+                values = values.replace(mapping.original_value, mapping.new_value)
+
+        replaced = changed_mask(column, values)
+        matches = {key: mask & replaced for key, mask in matches.items()}
+        return ValueReplacement(values, replaced, list(matches), matches=matches)
+
+
+def changed_mask(before: pd.Series, after: pd.Series) -> np.ndarray:
+    """Rows whose value differs between two aligned Series (every row if the dtype changed)."""
+    if before.dtype != after.dtype:
+        return np.ones(len(after), dtype=bool)
+    equal = before.eq(after)
+    if equal.dtype != bool:
+        # Nullable dtypes compare to <NA> where a value is missing
+        equal = equal.fillna(False).astype(bool)
+    return ~(equal.to_numpy() | (before.isna().to_numpy() & after.isna().to_numpy()))
+
+
+def _fold(value_mappings: List[ValueMapping]) -> Dict[Any, Any]:
+    """Final value of every original value the mappings change, keyed by value_key."""
+    final_values: Dict[Any, Any] = {}
+    # Keys of final_values by the value_key of their current final value
+    sources: Dict[Any, set] = {}
+
+    for mapping in value_mappings:
+        original, new_value = value_key(mapping.original_value), mapping.new_value
+        # Every value currently equal to the original becomes the new value:
+        # values already mapped to it, and the original itself if unmapped
+        keys = sources.pop(original, set())
+        if original not in final_values:
+            keys.add(original)
+        for key in keys:
+            final_values[key] = new_value
+        sources.setdefault(value_key(new_value), set()).update(keys)
+
+    return final_values
+
+
+def _factorize(column: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+    """Codes and distinct values of a column, keeping booleans apart from equal numbers."""
+    if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) in _MIXED_TYPES:
+        # Factorize the keys, then take each distinct value from its first row
+        codes, _ = pd.factorize(column.map(value_key, na_action='ignore'), use_na_sentinel=True)
+        _, first_rows = np.unique(codes[codes >= 0], return_index=True)
+        return codes, list(column.to_numpy()[(codes >= 0).nonzero()[0][first_rows]])
+    codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    return codes, list(uniques)
+
+
+def _same_value(original: Any, target: Any) -> bool:
+    """Whether mapping ``original`` to ``target`` leaves the value unchanged."""
+    if value_key(original) is MISSING or value_key(target) is MISSING:
+        return value_key(original) is value_key(target)
+    if isinstance(original, (bool, np.bool_)) != isinstance(target, (bool, np.bool_)):
+        return False
+    try:
+        return bool(original == target)
+    except (TypeError, ValueError):
+        return False
+
+
+def _infer_array(values: List[Any], dtype: Any) -> Any:
+    """Array of mapped values, in the column's own dtype if it can hold them."""
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        try:
+            return pd.array(values, dtype=dtype)
+        except (TypeError, ValueError):
+            pass
+    return pd.Series(values).array
+
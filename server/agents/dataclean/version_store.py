@@ -0,0 +1,290 @@
+"""
+Column-Sharing Version History for ScioScribe Data Cleaning System.
+
+Every applied transformation saves a new data version, and most
+transformations touch a single column. Instead of a full DataFrame copy per
+version, a version is stored as references to immutable column arrays:
+columns (and the index) that are unchanged since the previously saved version
+are shared with it, and only changed or new columns are stored. The first
+version of an artifact is therefore a full snapshot and each later version
+costs roughly the size of the columns it changed.
+
+Stored arrays are frozen (see cow_frame.py): columns that are frozen already,
+such as those produced by the transformation engine, are referenced without
+a copy, and others are copied once. Versions are rebuilt into a DataFrame
+over the stored arrays on demand; callers can assign columns on it, while
+writing into its columns in place raises.
+
+Under memory pressure the data store can spill versions to disk
+(spill_older / spill_all); a spilled version is read from its file whenever
+it is requested.
+"""
+
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .cow_frame import freeze_array, frame_from_arrays
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VersionSnapshot:
+    """A stored version: shared, never mutated index and column arrays."""
+    index: pd.Index
+    columns: pd.Index
+    arrays: List[Any]  # one ExtensionArray per column, in column order
+
+    @property
+    def shape(self):
+        """Shape of the version's DataFrame."""
+        return (len(self.index), len(self.columns))
+
+
+@dataclass
+class SpilledVersion:
+    """A version written to disk; its snapshot is loaded back on access."""
+    path: str
+
+
+class VersionHistory:
+    """
+    Versions of one artifact's DataFrame, stored as shared column references.
+    """
+
+    def __init__(self, spill_prefix: Optional[str] = None):
+        """
+        Initialize an empty history.
+
+        Args:
+            spill_prefix: Path prefix for spilled version files (required to spill)
+        """
+        self.spill_prefix = spill_prefix
+        self._snapshots: Dict[int, Union[VersionSnapshot, SpilledVersion]] = {}
+        self._latest: Optional[VersionSnapshot] = None
+        self._array_bytes: Dict[int, int] = {}  # id(array) -> deep size, for resident arrays
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __contains__(self, version: int) -> bool:
+        return version in self._snapshots
+
+    def versions(self) -> List[int]:
+        """Stored version numbers in ascending order."""
+        return sorted(self._snapshots)
+
+    def save(self, version: int, dataframe: pd.DataFrame) -> VersionSnapshot:
+        """
+        Store a version, sharing unchanged columns with the last saved version.
+
+        Args:
+            version: Version number (replaces an existing version with that number)
+            dataframe: DataFrame to store; only its frozen columns are
+                referenced after the call
+
+        Returns:
+            The stored snapshot
+        """
+        previous = self._latest
+        index = dataframe.index
+        if previous is not None and previous.index.equals(index):
+            index = previous.index
+        else:
+            index = index.copy()
+
+        reference: Dict[Any, Any] = {}
+        if previous is not None and len(previous.index) == len(dataframe):
+            reference = _arrays_by_label(previous)
+
+        arrays = []
+        for position in range(dataframe.shape[1]):
+            label = dataframe.columns[position]
+            array = dataframe.iloc[:, position].array
+            shared = reference.get(label)
+            if shared is not None and shared.dtype == array.dtype and (
+                _same_data(shared, array) or shared.equals(array)
+            ):
+                arrays.append(shared)
+            else:
+                arrays.append(freeze_array(array))
+
+        snapshot = VersionSnapshot(index=index, columns=dataframe.columns.copy(), arrays=arrays)
+        self._discard_spill_file(version)
+        self._snapshots[version] = snapshot
+        self._latest = snapshot
+        self._forget_unreferenced_sizes()
+        return snapshot
+
+    def get(self, version: int) -> Optional[pd.DataFrame]:
+        """
+        Rebuild a version as a new DataFrame.
+
+        Args:
+            version: Version number
+
+        Returns:
+            DataFrame over the stored read-only columns, or None if the
+            version was never saved
+        """
+        snapshot = self.get_snapshot(version)
+        if snapshot is None:
+            return None
+        return build_frame(snapshot)
+
+    def get_snapshot(self, version: int) -> Optional[VersionSnapshot]:
+        """
+        Stored snapshot of a version, or None.
+
+        A spilled version is read from disk for this call only and stays
+        spilled, so reading old versions does not grow the resident set.
+        """
+        snapshot = self._snapshots.get(version)
+        if isinstance(snapshot, SpilledVersion):
+            with open(snapshot.path, "rb") as f:
+                loaded = pickle.load(f)
+            # Nothing else references the freshly loaded arrays
+            loaded.arrays = [freeze_array(array, adopt=True) for array in loaded.arrays]
+            logger.debug(f"Read spilled version {version} from {snapshot.path}")
+            return loaded
+        return snapshot
+
+    def is_spilled(self, version: int) -> bool:
+        """Whether a version is currently on disk."""
+        return isinstance(self._snapshots.get(version), SpilledVersion)
+
+    def resident_versions(self) -> List[int]:
+        """Version numbers held in memory, in ascending order."""
+        return sorted(v for v, s in self._snapshots.items() if isinstance(s, VersionSnapshot))
+
+    def spilled_count(self) -> int:
+        """Number of versions on disk."""
+        return sum(isinstance(s, SpilledVersion) for s in self._snapshots.values())
+
+    def spill_older(self) -> int:
+        """
+        Spill every resident version except the newest one.
+
+        Returns:
+            Number of versions written to disk
+        """
+        resident = self.resident_versions()
+        return self._spill(resident[:-1])
+
+    def spill_all(self) -> int:
+        """
+        Spill every resident version; the next save starts a new full snapshot.
+
+        Returns:
+            Number of versions written to disk
+        """
+        return self._spill(self.resident_versions())
+
+    def _spill(self, versions: List[int]) -> int:
+        """Write versions to disk and drop them from memory"""
+        if not self.spill_prefix:
+            raise ValueError("VersionHistory has no spill_prefix")
+        if versions:
+            os.makedirs(os.path.dirname(self.spill_prefix) or ".", exist_ok=True)
+        for version in versions:
+            snapshot = self._snapshots[version]
+            path = f"{self.spill_prefix}-v{version}.pkl"
+            with open(path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=5)
+            self._snapshots[version] = SpilledVersion(path)
+            if snapshot is self._latest:
+                self._latest = None
+        self._forget_unreferenced_sizes()
+        return len(versions)
+
+    def discard(self) -> None:
+        """Delete all spill files of this history."""
+        for version in list(self._snapshots):
+            self._discard_spill_file(version)
+
+    def _discard_spill_file(self, version: int) -> None:
+        """Remove the spill file of a version, if it has one"""
+        snapshot = self._snapshots.get(version)
+        if isinstance(snapshot, SpilledVersion):
+            try:
+                os.remove(snapshot.path)
+            except FileNotFoundError:
+                pass
+
+    def _resident_items(self):
+        """Yield the index and arrays of every resident snapshot (with repeats)"""
+        for snapshot in self._snapshots.values():
+            if isinstance(snapshot, VersionSnapshot):
+                yield snapshot.index
+                yield from snapshot.arrays
+
+    def _forget_unreferenced_sizes(self) -> None:
+        """Drop cached sizes of arrays no resident snapshot references"""
+        live = {id(item) for item in self._resident_items()}
+        self._array_bytes = {key: size for key, size in self._array_bytes.items() if key in live}
+
+    def resident_bytes(self) -> int:
+        """Bytes of the distinct index/column arrays held in memory."""
+        return self.memory_usage()["stored_bytes"]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Measure the history's memory.
+
+        Returns:
+            ``stored_bytes``: bytes of the distinct arrays actually held in memory;
+            ``full_copy_bytes``: bytes one full copy per resident version would take
+        """
+        seen = set()
+        stored_bytes = 0
+        full_copy_bytes = 0
+        for item in self._resident_items():
+            key = id(item)
+            if key not in self._array_bytes:
+                self._array_bytes[key] = _nbytes(item)
+            size = self._array_bytes[key]
+            full_copy_bytes += size
+            if key not in seen:
+                seen.add(key)
+                stored_bytes += size
+        return {"stored_bytes": stored_bytes, "full_copy_bytes": full_copy_bytes}
+
+
+def build_frame(snapshot: VersionSnapshot) -> pd.DataFrame:
+    """Build a new DataFrame over a snapshot's frozen arrays (no data is copied)."""
+    return frame_from_arrays(snapshot.index, snapshot.columns, snapshot.arrays)
+
+
+def _arrays_by_label(snapshot: VersionSnapshot) -> Dict[Any, Any]:
+    """Map unique column labels to their arrays (duplicated labels are never shared)."""
+    counts = snapshot.columns.value_counts()
+    return {
+        label: array
+        for label, array in zip(snapshot.columns, snapshot.arrays)
+        if counts[label] == 1
+    }
+
+
+def _same_data(left: Any, right: Any) -> bool:
+    """Whether two column arrays are views of the same memory with the same layout."""
+    left, right = getattr(left, "_ndarray", left), getattr(right, "_ndarray", right)
+    if not isinstance(left, np.ndarray) or not isinstance(right, np.ndarray):
+        return False
+    return (
+        left.__array_interface__["data"] == right.__array_interface__["data"]
+        and left.shape == right.shape
+        and left.strides == right.strides
+    )
+
+
+def _nbytes(item: Any) -> int:
+    """Deep memory usage of an index or column array."""
+    if isinstance(item, pd.Index):
+        return int(item.memory_usage(deep=True))
+    return int(pd.Series(item, copy=False).memory_usage(deep=True, index=False))
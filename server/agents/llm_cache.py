@@ -0,0 +1,354 @@
+"""
+LLM Response Cache for ScioScribe Agents
+
+Many prompts are sent again with identical payloads at low temperature (data
+quality checks on the same summary, plan extraction for the same plan and
+request, header generation for the same plan). This module caches their
+responses, keyed by a SHA-256 hash of the model, messages and parameters:
+
+- an in-memory LRU tier for repeated calls within the process
+- an optional SQLite tier that survives restarts
+- a TTL after which entries are treated as misses
+- hit/miss counters for monitoring
+
+Two entry points use the shared cache:
+
+- wrap_openai_client() wraps an AsyncOpenAI client so that
+  ``client.chat.completions.create`` is served from the cache for
+  non-streaming requests at or below the configured temperature
+- LangChainResponseCache plugs into LangChain chat models through their
+  ``cache`` field (see with_response_cache())
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of LLM responses"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 86400, db_path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entries kept in the in-memory LRU tier
+            ttl_seconds: Age after which an entry is no longer served
+            db_path: SQLite file for the disk tier (None for memory only)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+        if db_path:
+            try:
+                self._open_db(db_path)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache disk tier disabled ({db_path}): {e}")
+                self._db = None
+
+    def _open_db(self, db_path: str) -> None:
+        """Open the SQLite tier and drop expired entries"""
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+    @staticmethod
+    def make_key(namespace: str, payload: Any) -> str:
+        """
+        Build a cache key from a request payload
+
+        Args:
+            namespace: Caller family (e.g. "openai", "langchain"), so formats never collide
+            payload: JSON-serializable model, messages and parameters
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON payload
+        """
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(f"{namespace}:{canonical}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._stats["expired"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if now - created_at <= self.ttl_seconds:
+                        self._remember(key, value, created_at)
+                        self._stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self._stats["expired"] += 1
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_key()
+            value: Response text
+        """
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, value, created_at)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO llm_responses (key, value, created_at) VALUES (?, ?, ?)",
+                        (key, value, created_at)
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to write LLM cache entry to disk: {e}")
+            self._stats["writes"] += 1
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        """Put an entry in the memory tier, evicting the least recently used (lock held)"""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_responses")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Hit/miss counters, hit rate and tier sizes
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["disk_enabled"] = self._db is not None
+        return stats
+
+    def close(self) -> None:
+        """Close the SQLite tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachedChatCompletions:
+    """``chat.completions`` proxy that serves deterministic requests from the cache"""
+
+    def __init__(self, completions: Any, cache: LLMResponseCache, max_temperature: float):
+        self._completions = completions
+        self._cache = cache
+        self._max_temperature = max_temperature
+
+    def _is_cacheable(self, kwargs: Dict[str, Any]) -> bool:
+        """Only single, non-streaming completions at low temperature are reused"""
+        temperature = kwargs.get("temperature")
+        return (
+            temperature is not None
+            and temperature <= self._max_temperature
+            and not kwargs.get("stream")
+            and kwargs.get("n", 1) == 1
+        )
+
+    async def create(self, **kwargs: Any) -> Any:
+        """Create a chat completion, or return the cached response for an identical request"""
+        if not self._is_cacheable(kwargs):
+            return await self._completions.create(**kwargs)
+
+        from openai.types.chat import ChatCompletion
+
+        key = self._cache.make_key("openai", kwargs)
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+
+        response = await self._completions.create(**kwargs)
+        if isinstance(response, ChatCompletion):
+            await asyncio.to_thread(self._cache.set, key, response.model_dump_json())
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._completions, name)
+
+
+class _CachedChat:
+    """``chat`` namespace proxy exposing cached completions"""
+
+    def __init__(self, chat: Any, completions: CachedChatCompletions):
+        self._chat = chat
+        self.completions = completions
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._chat, name)
+
+
+class CachedAsyncOpenAI:
+    """AsyncOpenAI proxy whose chat completions go through the response cache"""
+
+    def __init__(self, client: Any, cache: LLMResponseCache, max_temperature: float):
+        self._client = client
+        self.chat = _CachedChat(client.chat, CachedChatCompletions(client.chat.completions, cache, max_temperature))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class LangChainResponseCache(BaseCache):
+    """LangChain cache backed by an LLMResponseCache"""
+
+    def __init__(self, cache: LLMResponseCache):
+        self.cache = cache
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        return self.cache.make_key("langchain", [prompt, llm_string])
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        """Look up cached generations for a prompt and model configuration"""
+        value = self.cache.get(self._key(prompt, llm_string))
+        if value is None:
+            return None
+        try:
+            with warnings.catch_warnings():
+                # langchain_core.load is marked beta; its format is what LangChain's own caches store
+                warnings.simplefilter("ignore")
+                return loads(value)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        """Store generations for a prompt and model configuration"""
+        self.cache.set(self._key(prompt, llm_string), dumps(list(return_val)))
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove all entries"""
+        self.cache.clear()
+
+
+# Global cache instance
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get the global LLM response cache, created from settings on first use
+
+    Returns:
+        LLMResponseCache instance
+    """
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            settings = get_settings()
+            db_path = settings.llm_cache_path
+            if db_path is None:
+                db_path = os.path.join(settings.temp_dir, "scioscribe_llm_cache.sqlite")
+            _llm_cache = LLMResponseCache(
+                max_entries=settings.llm_cache_max_entries,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+                db_path=db_path or None,
+            )
+        return _llm_cache
+
+
+def wrap_openai_client(client: Any) -> Any:
+    """
+    Route an AsyncOpenAI client's chat completions through the global cache
+
+    Args:
+        client: AsyncOpenAI client
+
+    Returns:
+        Cached client proxy, or the client unchanged if caching is disabled
+    """
+    settings = get_settings()
+    if client is None or not settings.llm_cache_enabled:
+        return client
+    return CachedAsyncOpenAI(client, get_llm_cache(), settings.llm_cache_max_temperature)
+
+
+def with_response_cache(llm: Any) -> Any:
+    """
+    Attach the global cache to a LangChain chat model
+
+    Args:
+        llm: Chat model instance
+
+    Returns:
+        Copy of the model using the cache, or the model unchanged if caching
+        is disabled or the model does not support LangChain caching
+    """
+    if not get_settings().llm_cache_enabled or not hasattr(llm, "model_copy") or not hasattr(llm, "cache"):
+        return llm
+    return llm.model_copy(update={"cache": LangChainResponseCache(get_llm_cache())})
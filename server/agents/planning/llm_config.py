@@ -20,6 +20,7 @@ except ImportError:
     )
 
 from config import get_settings, setup_environment_variables, get_openai_config, validate_required_settings
+from ..llm_cache import LangChainResponseCache, get_llm_cache
 from .debug import StateDebugger, performance_monitor
 
 
@@ -67,7 +68,8 @@ class LLMManager:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         timeout: Optional[int] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        use_cache: bool = False
     ) -> ChatOpenAI:
         """
         Create a configured OpenAI LLM instance.
@@ -78,6 +80,9 @@ class LLMManager:
             max_tokens: Override default max tokens
             timeout: Override default timeout
             max_retries: Override default max retries
+            use_cache: Serve identical requests from the LLM response cache
+                (if caching is enabled); only for deterministic extraction
+                calls, not conversational agents
             
         Returns:
             Configured ChatOpenAI instance
@@ -102,6 +107,10 @@ class LLMManager:
             agent_config = self._get_agent_specific_config(agent_type)
             config.update(agent_config)
             
+            # Deterministic callers opt in to reusing cached responses
+            if use_cache and self.settings.llm_cache_enabled:
+                config["cache"] = LangChainResponseCache(get_llm_cache())
+            
             # Create LLM instance
             llm = ChatOpenAI(**config)
             
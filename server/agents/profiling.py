@@ -0,0 +1,354 @@
+"""
+Shared Profiling Engine for ScioScribe Agents
+
+This module computes per-column statistics for a DataFrame in bulk, shared by
+the analysis agent (DataProfilerNode), the data quality agent and the file
+processing preview:
+
+- non-null counts come from a single ``DataFrame.count`` call
+- numeric statistics (mean, std, min, max, exact distinct counts and optional
+  quantiles) are reduced over 2D arrays of many columns at once instead of
+  column by column; a single sort yields both distinct counts and quantiles
+- categorical columns are factorized once, which yields the null count, the
+  exact distinct count, the first distinct values and the top-k frequencies
+  from the same pass
+- distinct counts of numeric columns in large frames are estimated with a
+  HyperLogLog sketch computed over several columns at a time
+
+Values in the profile are native Python types, ready for JSON serialization.
+"""
+
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Frames with at least this many rows get approximate numeric distinct counts;
+# below it the exact column-wise sort is cheaper than hashing every value
+APPROX_DISTINCT_MIN_ROWS = 5_000_000
+
+# HyperLogLog precision: 2**14 registers, about 0.8% standard error
+HLL_PRECISION = 14
+
+# Upper bound on numeric values converted, sorted or hashed at once
+NUMERIC_CHUNK_VALUES = 8_000_000
+
+
+@dataclass
+class ColumnProfile:
+    """Statistics for a single column"""
+    name: str
+    dtype: str
+    kind: str  # numeric, categorical, other
+    count: int
+    null_count: int
+    distinct_count: int
+    distinct_is_estimate: bool = False
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    quantiles: Dict[str, float] = field(default_factory=dict)
+    first_values: List[Any] = field(default_factory=list)  # first distinct non-null values, in order
+    top_values: List[Tuple[Any, int]] = field(default_factory=list)  # most frequent values with counts
+
+
+@dataclass
+class FrameProfile:
+    """Statistics for a whole DataFrame"""
+    row_count: int
+    column_count: int
+    columns: Dict[str, ColumnProfile]
+
+    def dtypes(self) -> Dict[str, str]:
+        """Column dtypes as strings"""
+        return {name: col.dtype for name, col in self.columns.items()}
+
+    def null_counts(self) -> Dict[str, int]:
+        """Null count per column"""
+        return {name: col.null_count for name, col in self.columns.items()}
+
+    def distinct_counts(self) -> Dict[str, int]:
+        """Distinct (non-null) value count per column"""
+        return {name: col.distinct_count for name, col in self.columns.items()}
+
+    def numeric_stats(self) -> Dict[str, Dict[str, float]]:
+        """``DataFrame.describe()``-style statistics for numeric (non-boolean) columns"""
+        stats = {}
+        for name, col in self.columns.items():
+            if col.kind != "numeric" or col.dtype in ("bool", "boolean"):
+                continue
+            stats[name] = {"count": float(col.count), "mean": col.mean, "std": col.std, "min": col.min}
+            stats[name].update(col.quantiles)
+            stats[name]["max"] = col.max
+        return stats
+
+
+def profile_frame(df: pd.DataFrame,
+                  first_k: int = 10,
+                  top_k: int = 10,
+                  quantiles: Optional[Sequence[float]] = None,
+                  approx_distinct_min_rows: int = APPROX_DISTINCT_MIN_ROWS) -> FrameProfile:
+    """
+    Profile every column of a DataFrame
+
+    Args:
+        df: DataFrame to profile
+        first_k: Number of first distinct values to keep per column
+        top_k: Number of most frequent values to keep per categorical column
+        quantiles: Optional quantiles for numeric columns (e.g. 0.25, 0.5, 0.75)
+        approx_distinct_min_rows: Row count from which numeric distinct counts
+            are estimated with HyperLogLog instead of counted exactly
+
+    Returns:
+        FrameProfile with one ColumnProfile per column
+    """
+    row_count = len(df)
+    labels = list(df.columns)
+    positions = range(len(labels))
+    counts = df.count().to_numpy()
+    dtypes = [str(dtype) for dtype in df.dtypes]
+
+    numeric_positions = [i for i in positions if pd.api.types.is_numeric_dtype(df.dtypes.iloc[i])]
+    numeric_set = set(numeric_positions)
+    categorical_positions = [
+        i for i in positions
+        if i not in numeric_set
+        and (isinstance(df.dtypes.iloc[i], pd.CategoricalDtype) or df.dtypes.iloc[i] == object)
+    ]
+
+    profiles: List[ColumnProfile] = []
+    for i in positions:
+        count = int(counts[i])
+        profiles.append(ColumnProfile(
+            name=labels[i],
+            dtype=dtypes[i],
+            kind="other",
+            count=count,
+            null_count=row_count - count,
+            distinct_count=0,
+        ))
+
+    if numeric_positions:
+        _profile_numeric(df, profiles, numeric_positions, first_k, quantiles, approx_distinct_min_rows)
+
+    for i in categorical_positions:
+        _profile_categorical(df.iloc[:, i], profiles[i], first_k, top_k)
+
+    other_positions = set(positions) - set(numeric_positions) - set(categorical_positions)
+    for i in other_positions:
+        column = df.iloc[:, i]
+        profiles[i].distinct_count = int(column.nunique())
+        profiles[i].first_values = _first_distinct(column, first_k)
+
+    # Keyed by label; a duplicated label keeps its last column, like dict(df.items())
+    return FrameProfile(
+        row_count=row_count,
+        column_count=len(labels),
+        columns={profile.name: profile for profile in profiles},
+    )
+
+
+def _profile_numeric(df: pd.DataFrame,
+                     profiles: List[ColumnProfile],
+                     numeric_positions: List[int],
+                     first_k: int,
+                     quantiles: Optional[Sequence[float]],
+                     approx_distinct_min_rows: int) -> None:
+    """Fill numeric statistics for all numeric columns in bulk"""
+    block = df.iloc[:, numeric_positions]
+    row_count = len(block)
+    approximate = row_count >= approx_distinct_min_rows
+    # Quantiles (like describe) skip boolean columns
+    is_bool = np.array([pd.api.types.is_bool_dtype(dtype) for dtype in block.dtypes], dtype=bool)
+    quantiles = list(quantiles or [])
+
+    # Reduce a few columns at a time as one 2D float array, so memory stays
+    # bounded while every statistic is a single vectorized numpy call
+    columns_per_chunk = max(1, NUMERIC_CHUNK_VALUES // max(row_count, 1))
+    for start in range(0, len(numeric_positions), columns_per_chunk):
+        stop = min(len(numeric_positions), start + columns_per_chunk)
+        values = block.iloc[:, start:stop].to_numpy(dtype=np.float64, na_value=np.nan)
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+
+        with warnings.catch_warnings():
+            # All-null columns and single values yield NaN, as in pandas
+            warnings.simplefilter("ignore", RuntimeWarning)
+            means = np.nanmean(values, axis=0)
+            stds = np.nanstd(values, axis=0, ddof=1)
+            if row_count:
+                mins = np.nanmin(values, axis=0)
+                maxs = np.nanmax(values, axis=0)
+            else:
+                # nanmin/nanmax raise on zero rows instead of returning NaN
+                mins = maxs = np.full(values.shape[1], np.nan)
+
+        # One sort per chunk gives the exact distinct counts and the quantiles
+        ordered = np.sort(values, axis=0) if quantiles or not approximate else None
+        if approximate:
+            distinct = _approx_distinct(values)
+        else:
+            distinct = _sorted_distinct(ordered)
+        quantile_table = _sorted_quantiles(ordered, counts, quantiles) if quantiles else None
+        del values, ordered
+
+        for j in range(stop - start):
+            profile = profiles[numeric_positions[start + j]]
+            profile.kind = "numeric"
+            profile.mean = _to_float(means[j])
+            profile.std = _to_float(stds[j])
+            profile.min = _to_float(mins[j])
+            profile.max = _to_float(maxs[j])
+            if quantile_table is not None and not is_bool[start + j]:
+                profile.quantiles = {
+                    f"{q * 100:g}%": _to_float(quantile_table[qi, j]) for qi, q in enumerate(quantiles)
+                }
+            profile.distinct_count = int(distinct[j])
+            profile.distinct_is_estimate = approximate
+            profile.first_values = _first_distinct(block.iloc[:, start + j], first_k)
+
+
+def _sorted_distinct(ordered: np.ndarray) -> np.ndarray:
+    """Distinct non-null counts per column of a column-wise sorted array (NaN last)"""
+    if len(ordered) == 0:
+        return np.zeros(ordered.shape[1], dtype=np.int64)
+    changes = (ordered[1:] != ordered[:-1]) & ~np.isnan(ordered[1:])
+    return np.count_nonzero(changes, axis=0) + ~np.isnan(ordered[0])
+
+
+def _sorted_quantiles(ordered: np.ndarray, counts: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Linearly interpolated quantiles (pandas' default) from a column-wise sorted array"""
+    table = np.full((len(quantiles), ordered.shape[1]), np.nan)
+    columns = np.flatnonzero(counts)
+    if not len(columns):
+        return table
+    last = counts[columns] - 1
+    for qi, q in enumerate(quantiles):
+        position = q * last
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        low_values = ordered[lower, columns]
+        high_values = ordered[upper, columns]
+        table[qi, columns] = low_values + (high_values - low_values) * (position - lower)
+    return table
+
+
+def _profile_categorical(column: pd.Series, profile: ColumnProfile, first_k: int, top_k: int) -> None:
+    """Fill categorical statistics from a single factorization pass"""
+    codes, uniques = pd.factorize(column, sort=False)
+    profile.kind = "categorical"
+    profile.distinct_count = len(uniques)
+    # factorize returns uniques in order of first appearance
+    profile.first_values = [_to_native(value) for value in uniques[:first_k]]
+
+    if top_k and len(uniques):
+        frequencies = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        k = min(top_k, len(uniques))
+        top = np.argpartition(-frequencies, k - 1)[:k]
+        # Highest count first; ties keep order of first appearance
+        top = top[np.lexsort((top, -frequencies[top]))]
+        profile.top_values = [(_to_native(uniques[c]), int(frequencies[c])) for c in top]
+
+
+def _first_distinct(column: pd.Series, k: int) -> List[Any]:
+    """First `k` distinct non-null values, scanning only as much of the column as needed"""
+    if k <= 0:
+        return []
+    prefix = max(k * 100, 1000)
+    while True:
+        head = column.iloc[:prefix]
+        found = pd.unique(head.dropna() if head.hasnans else head)
+        if len(found) >= k or prefix >= len(column):
+            return [_to_native(value) for value in found[:k]]
+        prefix *= 4
+
+
+def approx_distinct_counts(block: pd.DataFrame, precision: int = HLL_PRECISION) -> np.ndarray:
+    """
+    Estimate distinct non-null counts of numeric columns with HyperLogLog
+
+    Several columns are hashed together per chunk, bounded by NUMERIC_CHUNK_VALUES.
+
+    Args:
+        block: DataFrame of numeric columns
+        precision: log2 of the register count per column
+
+    Returns:
+        Array of estimated distinct counts, one per column
+    """
+    n_rows, n_cols = block.shape
+    columns_per_chunk = max(1, NUMERIC_CHUNK_VALUES // max(n_rows, 1))
+    estimates = [
+        _approx_distinct(block.iloc[:, start:start + columns_per_chunk].to_numpy(dtype=np.float64, na_value=np.nan),
+                         precision)
+        for start in range(0, n_cols, columns_per_chunk)
+    ]
+    return np.concatenate(estimates) if estimates else np.zeros(0, dtype=np.int64)
+
+
+def _approx_distinct(values: np.ndarray, precision: int = HLL_PRECISION) -> np.ndarray:
+    """HyperLogLog distinct counts for each column of a 2D float array"""
+    n_rows, n_cols = values.shape
+    registers = np.zeros((n_cols, 1 << precision), dtype=np.int8)
+    if n_rows == 0 or n_cols == 0:
+        return np.zeros(n_cols, dtype=np.int64)
+
+    # Column-major so each column's values are contiguous after ravel
+    values = np.asfortranarray(values).ravel(order="F")
+    column_index = np.repeat(np.arange(n_cols), n_rows)
+
+    valid = ~np.isnan(values)
+    if not valid.all():
+        values = values[valid]
+        column_index = column_index[valid]
+    # Normalise -0.0 so it hashes like 0.0
+    values = values + 0.0
+
+    _update_registers(registers, column_index, pd.util.hash_array(values), precision)
+    return np.array([_estimate_cardinality(row) for row in registers], dtype=np.int64)
+
+
+def _update_registers(registers: np.ndarray,
+                      column_index: np.ndarray,
+                      hashes: np.ndarray,
+                      precision: int) -> None:
+    """Fold 64-bit hashes into per-column HyperLogLog registers"""
+    remaining_bits = 64 - precision
+    bucket = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+    rest = hashes & np.uint64((1 << remaining_bits) - 1)
+    # Bit length of `rest` via the float exponent (exact: rest < 2**53)
+    _, bit_length = np.frexp(rest.astype(np.float64))
+    rank = (remaining_bits - bit_length + 1).astype(np.int8)
+
+    flat = registers.reshape(-1)
+    np.maximum.at(flat, column_index * registers.shape[1] + bucket, rank)
+
+
+def _estimate_cardinality(registers: np.ndarray) -> int:
+    """HyperLogLog estimate with linear counting for small cardinalities"""
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert a statistic to float (None if it cannot be represented)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_native(value: Any) -> Any:
+    """Convert numpy scalars to native Python values (datetimes to pandas Timestamp/Timedelta)"""
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value)
+    if isinstance(value, np.timedelta64):
+        return pd.Timedelta(value)
+    return value.item() if hasattr(value, 'item') else value
@@ -198,7 +198,7 @@ async def generate_visualization(request: GenerateVisualizationRequest):
         logger.info(f"📈 Dataset: (content)")
         
         # Generate visualization using the specialized agent system
-        result = agent.generate_visualization(
+        result = await agent.agenerate_visualization(
             user_prompt=request.prompt,
             experiment_plan_content=request.plan,
             csv_data_content=request.csv,
@@ -628,26 +628,9 @@ class StreamingAnalysisAgent:
         """Generate visualization with streaming node updates."""
         
         # Initialize state
-        initial_state = {
-            "messages": [],
-            "user_prompt": user_prompt,
-            "experiment_plan_content": experiment_plan_content,
-            "csv_data_content": csv_data_content,
-            "memory": memory or {},
-            "plan_text": "",
-            "structured_plan": {},
-            "data_schema": {},
-            "data_sample": [],
-            "chart_specification": {},
-            "plot_image_path": "",
-            "plot_html_path": "",
-            "plot_png_path": "",
-            "html_content": "",
-            "llm_code_used": "",
-            "warnings": [],
-            "explanation": "",
-            "error_message": ""
-        }
+        initial_state = self.agent._build_initial_state(
+            user_prompt, experiment_plan_content, csv_data_content, memory
+        )
         
         # Stream through the LangGraph execution with node updates
         import asyncio
@@ -8,13 +8,20 @@ including creating, updating, and retrieving experiment records.
 import logging
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from database import Experiment, get_db, init_db, check_db_connection
+from database import (
+    Experiment,
+    init_db,
+    check_db_connection,
+    get_experiment_repository,
+    ExperimentNotFoundError,
+    CSVVersionConflictError,
+    NoPendingChangesError
+)
 
 logger = logging.getLogger(__name__)
 
@@ -108,10 +115,7 @@ def _experiment_to_response(experiment: Experiment) -> ExperimentResponse:
 
 # API Endpoints
 @router.post("/experiments", response_model=ExperimentResponse)
-async def create_experiment(
-    request: CreateExperimentRequest,
-    db: Session = Depends(get_db)
-):
+async def create_experiment(request: CreateExperimentRequest):
     """
     Create a new experiment record.
     
@@ -119,8 +123,8 @@ async def create_experiment(
     and can be updated later using the update endpoints.
     """
     try:
-        # Create new experiment
-        experiment = Experiment(
+        # Create and save new experiment
+        experiment = await get_experiment_repository().create_experiment(
             title=request.title,
             description=request.description,
             experimental_plan=request.experimental_plan,
@@ -128,25 +132,18 @@ async def create_experiment(
             csv_data=request.csv_data
         )
         
-        # Save to database
-        db.add(experiment)
-        db.commit()
-        db.refresh(experiment)
-        
         logger.info(f"Created new experiment: {experiment.id}")
         
         return _experiment_to_response(experiment)
         
     except SQLAlchemyError as e:
         logger.error(f"Database error creating experiment: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error creating experiment: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create experiment: {str(e)}"
@@ -154,18 +151,14 @@ async def create_experiment(
 
 
 @router.get("/experiments/{experiment_id}", response_model=ExperimentResponse)
-async def get_experiment(
-    experiment_id: str,
-    db: Session = Depends(get_db)
-):
+async def get_experiment(experiment_id: str):
     """
     Get a specific experiment by ID.
     
     Retrieves the complete experiment record including all text fields.
     """
     try:
-        # Query experiment by ID
-        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        experiment = await get_experiment_repository().get_experiment(experiment_id)
         
         if not experiment:
             raise HTTPException(
@@ -194,50 +187,31 @@ async def get_experiment(
 
 
 @router.put("/experiments/{experiment_id}/plan", response_model=ExperimentResponse)
-async def update_experiment_plan(
-    experiment_id: str,
-    request: UpdatePlanRequest,
-    db: Session = Depends(get_db)
-):
+async def update_experiment_plan(experiment_id: str, request: UpdatePlanRequest):
     """
     Update the experimental plan text for a specific experiment.
     
     Updates only the experimental_plan field, leaving other fields unchanged.
     """
     try:
-        # Query experiment by ID
-        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-        
-        if not experiment:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Experiment with ID {experiment_id} not found"
-            )
-        
-        # Update the plan
-        experiment.experimental_plan = request.experimental_plan
-        experiment.updated_at = datetime.now()
-        
-        # Save changes
-        db.commit()
-        db.refresh(experiment)
+        experiment = await get_experiment_repository().update_fields(
+            experiment_id, experimental_plan=request.experimental_plan
+        )
         
         logger.info(f"Updated plan for experiment: {experiment_id}")
         
         return _experiment_to_response(experiment)
         
-    except HTTPException:
-        raise
+    except ExperimentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except SQLAlchemyError as e:
         logger.error(f"Database error updating plan for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error updating plan for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update experiment plan: {str(e)}"
@@ -245,50 +219,31 @@ async def update_experiment_plan(
 
 
 @router.put("/experiments/{experiment_id}/html", response_model=ExperimentResponse)
-async def update_experiment_html(
-    experiment_id: str,
-    request: UpdateHtmlRequest,
-    db: Session = Depends(get_db)
-):
+async def update_experiment_html(experiment_id: str, request: UpdateHtmlRequest):
     """
     Update the HTML visualization for a specific experiment.
     
     Updates only the visualization_html field, leaving other fields unchanged.
     """
     try:
-        # Query experiment by ID
-        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-        
-        if not experiment:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Experiment with ID {experiment_id} not found"
-            )
-        
-        # Update the HTML
-        experiment.visualization_html = request.visualization_html
-        experiment.updated_at = datetime.now()
-        
-        # Save changes
-        db.commit()
-        db.refresh(experiment)
+        experiment = await get_experiment_repository().update_fields(
+            experiment_id, visualization_html=request.visualization_html
+        )
         
         logger.info(f"Updated HTML for experiment: {experiment_id}")
         
         return _experiment_to_response(experiment)
         
-    except HTTPException:
-        raise
+    except ExperimentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except SQLAlchemyError as e:
         logger.error(f"Database error updating HTML for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error updating HTML for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update experiment HTML: {str(e)}"
@@ -296,68 +251,34 @@ async def update_experiment_html(
 
 
 @router.put("/experiments/{experiment_id}/csv", response_model=ExperimentResponse)
-async def update_experiment_csv(
-    experiment_id: str,
-    request: UpdateCsvRequest,
-    db: Session = Depends(get_db)
-):
+async def update_experiment_csv(experiment_id: str, request: UpdateCsvRequest):
     """
     Update the CSV data for a specific experiment with version control.
     
     Supports optimistic locking and tracks agent vs user modifications.
     """
     try:
-        # Query experiment by ID with row-level lock
-        experiment = db.query(Experiment).filter(
-            Experiment.id == experiment_id
-        ).with_for_update().first()
-        
-        if not experiment:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Experiment with ID {experiment_id} not found"
-            )
-        
-        # Version check for optimistic locking
-        if request.expected_version is not None and request.expected_version != experiment.csv_version:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Version conflict: expected {request.expected_version}, current {experiment.csv_version}"
-            )
-        
-        # Backup current state for agent updates
-        if request.is_agent_update:
-            experiment.previous_csv = experiment.csv_data
-            experiment.agent_modified_at = datetime.now()
-            experiment.modification_source = 'agent'
-        else:
-            experiment.modification_source = 'user'
-        
-        # Update the CSV data
-        experiment.csv_data = request.csv_data
-        experiment.csv_version += 1
-        experiment.updated_at = datetime.now()
-        
-        # Save changes
-        db.commit()
-        db.refresh(experiment)
-        
-        logger.info(f"Updated CSV data for experiment: {experiment_id} (version: {experiment.csv_version}, source: {experiment.modification_source})")
+        experiment = await get_experiment_repository().update_csv(
+            experiment_id,
+            request.csv_data,
+            is_agent_update=request.is_agent_update,
+            expected_version=request.expected_version
+        )
         
         return _experiment_to_response(experiment)
         
-    except HTTPException:
-        raise
+    except ExperimentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except CSVVersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except SQLAlchemyError as e:
         logger.error(f"Database error updating CSV for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error updating CSV for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update experiment CSV: {str(e)}"
@@ -365,18 +286,14 @@ async def update_experiment_csv(
 
 
 @router.get("/experiments/{experiment_id}/diff")
-async def get_experiment_diff(
-    experiment_id: str,
-    db: Session = Depends(get_db)
-):
+async def get_experiment_diff(experiment_id: str):
     """
     Get CSV differences between current and previous versions.
     
     Returns diff information for experiments modified by agents.
     """
     try:
-        # Query experiment by ID
-        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        experiment = await get_experiment_repository().get_experiment(experiment_id)
         
         if not experiment:
             raise HTTPException(
@@ -413,11 +330,7 @@ async def get_experiment_diff(
 
 
 @router.post("/experiments/{experiment_id}/csv/accept-reject", response_model=ExperimentResponse)
-async def accept_reject_csv_changes(
-    experiment_id: str,
-    request: AcceptRejectChangesRequest,
-    db: Session = Depends(get_db)
-):
+async def accept_reject_csv_changes(experiment_id: str, request: AcceptRejectChangesRequest):
     """
     Accept or reject CSV changes made by an AI agent.
     
@@ -425,57 +338,29 @@ async def accept_reject_csv_changes(
     Reject: Restores the previous CSV and discards agent changes.
     """
     try:
-        # Query experiment by ID with row-level lock
-        experiment = db.query(Experiment).filter(
-            Experiment.id == experiment_id
-        ).with_for_update().first()
-        
-        if not experiment:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Experiment with ID {experiment_id} not found"
-            )
-        
-        # Check if there are changes to accept/reject
-        if not experiment.previous_csv:
-            raise HTTPException(
-                status_code=400,
-                detail="No pending changes to accept or reject"
-            )
+        experiment = await get_experiment_repository().accept_or_reject_csv_changes(
+            experiment_id, accept=request.action == "accept"
+        )
         
         if request.action == "accept":
-            # Accept changes: clear previous version
-            experiment.previous_csv = None
-            experiment.modification_source = 'user'
             logger.info(f"Accepted CSV changes for experiment: {experiment_id}")
-        else:  # reject
-            # Reject changes: restore previous version
-            experiment.csv_data = experiment.previous_csv
-            experiment.previous_csv = None
-            experiment.modification_source = 'user'
-            experiment.csv_version += 1
+        else:
             logger.info(f"Rejected CSV changes for experiment: {experiment_id}")
         
-        experiment.updated_at = datetime.now()
-        
-        # Save changes
-        db.commit()
-        db.refresh(experiment)
-        
         return _experiment_to_response(experiment)
         
-    except HTTPException:
-        raise
+    except ExperimentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NoPendingChangesError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except SQLAlchemyError as e:
         logger.error(f"Database error processing accept/reject for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error processing accept/reject for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process accept/reject: {str(e)}"
@@ -483,50 +368,31 @@ async def accept_reject_csv_changes(
 
 
 @router.put("/experiments/{experiment_id}/title", response_model=ExperimentResponse)
-async def update_experiment_title(
-    experiment_id: str,
-    request: UpdateTitleRequest,
-    db: Session = Depends(get_db)
-):
+async def update_experiment_title(experiment_id: str, request: UpdateTitleRequest):
     """
     Update the title for a specific experiment.
     
     Updates only the title field, leaving other fields unchanged.
     """
     try:
-        # Query experiment by ID
-        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-        
-        if not experiment:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Experiment with ID {experiment_id} not found"
-            )
-        
-        # Update the title
-        experiment.title = request.title
-        experiment.updated_at = datetime.now()
-        
-        # Save changes
-        db.commit()
-        db.refresh(experiment)
+        experiment = await get_experiment_repository().update_fields(
+            experiment_id, title=request.title
+        )
         
         logger.info(f"Updated title for experiment: {experiment_id}")
         
         return _experiment_to_response(experiment)
         
-    except HTTPException:
-        raise
+    except ExperimentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except SQLAlchemyError as e:
         logger.error(f"Database error updating title for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error updating title for experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update experiment title: {str(e)}"
@@ -534,22 +400,14 @@ async def update_experiment_title(
 
 
 @router.get("/experiments", response_model=ExperimentListResponse)
-async def list_experiments(
-    limit: int = 100,
-    offset: int = 0,
-    db: Session = Depends(get_db)
-):
+async def list_experiments(limit: int = 100, offset: int = 0):
     """
     List all experiments with pagination.
     
     Returns a paginated list of all experiments in the database.
     """
     try:
-        # Query experiments with pagination
-        experiments = db.query(Experiment).offset(offset).limit(limit).all()
-        
-        # Get total count
-        total_count = db.query(Experiment).count()
+        experiments, total_count = await get_experiment_repository().list_experiments(limit=limit, offset=offset)
         
         # Convert to response models
         experiment_responses = [_experiment_to_response(exp) for exp in experiments]
@@ -576,28 +434,14 @@ async def list_experiments(
 
 
 @router.delete("/experiments/{experiment_id}")
-async def delete_experiment(
-    experiment_id: str,
-    db: Session = Depends(get_db)
-):
+async def delete_experiment(experiment_id: str):
     """
     Delete a specific experiment by ID.
     
     Permanently removes the experiment from the database.
     """
     try:
-        # Query experiment by ID
-        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-        
-        if not experiment:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Experiment with ID {experiment_id} not found"
-            )
-        
-        # Delete the experiment
-        db.delete(experiment)
-        db.commit()
+        await get_experiment_repository().delete_experiment(experiment_id)
         
         logger.info(f"Deleted experiment: {experiment_id}")
         
@@ -607,18 +451,16 @@ async def delete_experiment(
             "message": "Experiment deleted successfully"
         }
         
-    except HTTPException:
-        raise
+    except ExperimentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except SQLAlchemyError as e:
         logger.error(f"Database error deleting experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Unexpected error deleting experiment {experiment_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to delete experiment: {str(e)}"
@@ -626,7 +468,7 @@ async def delete_experiment(
 
 
 @router.get("/stats", response_model=DatabaseStatsResponse)
-async def get_database_stats(db: Session = Depends(get_db)):
+async def get_database_stats():
     """
     Get database statistics and health information.
     
@@ -634,7 +476,7 @@ async def get_database_stats(db: Session = Depends(get_db)):
     """
     try:
         # Get total experiment count
-        total_experiments = db.query(Experiment).count()
+        total_experiments = await get_experiment_repository().count_experiments()
         
         # Check connection health
         connection_status = "healthy" if check_db_connection() else "unhealthy"
@@ -698,8 +540,7 @@ async def database_health_check():
         # Get basic stats if connection is healthy
         if connection_healthy:
             # Use a simple query to test functionality
-            with next(get_db()) as db:
-                total_experiments = db.query(Experiment).count()
+            total_experiments = await get_experiment_repository().count_experiments()
         else:
             total_experiments = 0
         
@@ -5,6 +5,7 @@ This module provides REST API endpoints for uploading files, managing data artif
 and applying AI-generated suggestions for data cleaning.
 """
 
+import asyncio
 import os
 import uuid
 import tempfile
@@ -14,10 +15,10 @@ from pathlib import Path
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
-import aiofiles
 
 from agents.dataclean.models import (
     DataArtifact,
+    ProcessingResult,
     ProcessingStatus,
     ApplySuggestionRequest,
     UpdateNotesRequest,
@@ -50,14 +51,16 @@ from agents.dataclean.transformation_engine import TransformationEngine
 from agents.dataclean.suggestion_converter import SuggestionConverter
 from agents.dataclean.complete_processor import CompleteFileProcessor
 from agents.dataclean.memory_store import get_data_store
+from agents.dataclean.ingest import save_upload, sample_frame
+from agents.dataclean.excel_ingest import parse_sheet_selection, select_sheets
+from agents.llm_cache import wrap_openai_client
 from config import get_openai_client, validate_openai_config
 
 import logging
 import json
-from fastapi import WebSocket, WebSocketDisconnect, HTTPException, Depends
+from fastapi import WebSocket, WebSocketDisconnect, HTTPException
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from database import get_db
+from database import get_experiment_repository, ExperimentNotFoundError
 from datetime import datetime
 from starlette.websockets import WebSocketState
 
@@ -480,9 +483,12 @@ transformation_engine = TransformationEngine()
 # Initialize the suggestion converter for applying AI suggestions
 suggestion_converter = SuggestionConverter()
 
-# Initialize the EasyOCR processor for better OCR accuracy
+# Initialize the EasyOCR processor for better OCR accuracy; OCR runs on the
+# shared worker pool, which loads the model once per worker (CPU mode for compatibility)
 from agents.dataclean.easyocr_processor import EasyOCRProcessor
-easyocr_processor = EasyOCRProcessor(languages=['en'], gpu=False)  # CPU mode for compatibility
+from agents.dataclean.ocr_service import get_ocr_service
+ocr_service = get_ocr_service()
+easyocr_processor = EasyOCRProcessor(languages=['en'], gpu=False, ocr_service=ocr_service)
 
 # Initialize in-memory data store
 data_store = get_data_store()
@@ -546,10 +552,8 @@ async def process_file_complete(
         temp_dir = tempfile.gettempdir()
         temp_file_path = os.path.join(temp_dir, f"complete_{uuid.uuid4()}_{file.filename}")
         
-        # Save uploaded file
-        async with aiofiles.open(temp_file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # Save uploaded file in fixed-size chunks
+        file_size = await save_upload(file, temp_file_path)
         
         # Create request object
         request = ProcessFileCompleteRequest(
@@ -568,7 +572,7 @@ async def process_file_complete(
         response = await complete_processor.process_file_complete(
             file_path=temp_file_path,
             filename=file.filename,
-            file_size=len(content),
+            file_size=file_size,
             mime_type=file.content_type or "application/octet-stream",
             request=request
         )
@@ -600,7 +604,8 @@ async def process_file_complete(
 async def upload_file(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    experiment_id: str = "demo-experiment"
+    experiment_id: str = "demo-experiment",
+    sheets: Optional[str] = None
 ):
     """
     Upload a file for data cleaning and processing.
@@ -608,9 +613,11 @@ async def upload_file(
     Args:
         file: The uploaded file
         experiment_id: ID of the experiment this data belongs to
+        sheets: For Excel files, sheets to load as separate artifacts:
+            'all' or comma-separated sheet names or positions (default: first sheet only)
         
     Returns:
-        Dict containing the artifact_id and processing status
+        Dict containing the artifact_id (one per sheet if sheets was given) and processing status
     """
     try:
         # Generate unique artifact ID
@@ -631,33 +638,39 @@ async def upload_file(
         temp_dir = tempfile.gettempdir()
         temp_file_path = os.path.join(temp_dir, f"{artifact_id}_{file.filename}")
         
-        # Save uploaded file
-        async with aiofiles.open(temp_file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        
-        # Create file metadata
-        file_metadata = FileMetadata(
-            name=file.filename,
-            path=temp_file_path,
-            size=len(content),
-            mime_type=file.content_type or "application/octet-stream",
-            uploaded_at=datetime.now()
-        )
+        # Save uploaded file in fixed-size chunks
+        file_size = await save_upload(file, temp_file_path)
         
-        # Create data artifact
-        artifact = DataArtifact(
-            artifact_id=artifact_id,
-            experiment_id=experiment_id,
-            owner_id="demo-user",  # Replace with actual user ID
-            status=ProcessingStatus.PROCESSING,
-            original_file=file_metadata,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
+        # Excel sheets requested separately become one artifact each
+        if sheets is not None and file_extension in ['.xlsx', '.xls']:
+            try:
+                sheet_names = await asyncio.to_thread(
+                    select_sheets, temp_file_path, parse_sheet_selection(sheets)
+                )
+            except ValueError as e:
+                os.remove(temp_file_path)
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            artifact_ids = {sheet_name: str(uuid.uuid4()) for sheet_name in sheet_names}
+            for sheet_name, sheet_artifact_id in artifact_ids.items():
+                await data_store.save_data_artifact(_new_upload_artifact(
+                    sheet_artifact_id, experiment_id, file, f"{file.filename} [{sheet_name}]",
+                    temp_file_path, file_size
+                ))
+            
+            # Queue background processing of all sheets together
+            background_tasks.add_task(process_workbook_background, artifact_ids, temp_file_path)
+            
+            return {
+                "artifact_ids": artifact_ids,
+                "status": "processing",
+                "message": f"File uploaded successfully, processing {len(artifact_ids)} sheets in background"
+            }
         
         # Store in memory
-        await data_store.save_data_artifact(artifact)
+        await data_store.save_data_artifact(_new_upload_artifact(
+            artifact_id, experiment_id, file, file.filename, temp_file_path, file_size
+        ))
         
         # Queue background processing
         background_tasks.add_task(process_file_background, artifact_id, temp_file_path)
@@ -668,10 +681,34 @@ async def upload_file(
             "message": "File uploaded successfully, processing in background"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+def _new_upload_artifact(artifact_id: str, experiment_id: str, file: UploadFile, name: str,
+                         file_path: str, file_size: int) -> DataArtifact:
+    """Create the data artifact for an uploaded file (or one of its sheets), still processing."""
+    file_metadata = FileMetadata(
+        name=name,
+        path=file_path,
+        size=file_size,
+        mime_type=file.content_type or "application/octet-stream",
+        uploaded_at=datetime.now()
+    )
+    
+    return DataArtifact(
+        artifact_id=artifact_id,
+        experiment_id=experiment_id,
+        owner_id="demo-user",  # Replace with actual user ID
+        status=ProcessingStatus.PROCESSING,
+        original_file=file_metadata,
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    )
+
+
 @router.get("/data-artifact/{artifact_id}")
 async def get_data_artifact(artifact_id: str):
     """
@@ -1139,17 +1176,12 @@ async def test_ocr_direct(
         temp_dir = tempfile.gettempdir()
         temp_file_path = os.path.join(temp_dir, f"test_ocr_{uuid.uuid4()}_{file.filename}")
         
-        # Save uploaded file
-        async with aiofiles.open(temp_file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        
-        # Use EasyOCR processor
-        ocr_proc = EasyOCRProcessor(languages=['en'], gpu=False)
+        # Save uploaded file in fixed-size chunks
+        file_size = await save_upload(file, temp_file_path)
         
-        # Process the image
+        # Process the image on the shared OCR workers
         start_time = datetime.now()
-        ocr_result = await ocr_proc.process_image(temp_file_path)
+        ocr_result = await easyocr_processor.process_image(temp_file_path)
         processing_time = (datetime.now() - start_time).total_seconds()
         
         # Clean up temporary file
@@ -1162,7 +1194,7 @@ async def test_ocr_direct(
             "processing_time_seconds": processing_time,
             "file_info": {
                 "filename": file.filename,
-                "size_bytes": len(content),
+                "size_bytes": file_size,
                 "format": file_extension
             },
             "ocr_results": {
@@ -1214,12 +1246,11 @@ async def get_ocr_processors():
     try:
         # EasyOCR info
         try:
-            easyocr_proc = EasyOCRProcessor(languages=['en'], gpu=False)
             processor_info = {
                 "name": "easyocr",
                 "description": "Deep learning-based OCR with high accuracy",
-                "supported_languages": await easyocr_proc.get_supported_languages(),
-                "supported_formats": await easyocr_proc.get_supported_formats(),
+                "supported_languages": await easyocr_processor.get_supported_languages(),
+                "supported_formats": await easyocr_processor.get_supported_formats(),
                 "features": [
                     "80+ language support",
                     "GPU acceleration",
@@ -1262,6 +1293,10 @@ async def upload_image(
         Dict containing the artifact_id and processing status
     """
     try:
+        # Turn uploads away while the OCR queue is full
+        if ocr_service.queue_full():
+            raise HTTPException(status_code=503, detail="OCR queue is full, please retry later")
+        
         # Generate unique artifact ID
         artifact_id = str(uuid.uuid4())
         
@@ -1282,10 +1317,8 @@ async def upload_image(
         temp_dir = tempfile.gettempdir()
         temp_file_path = os.path.join(temp_dir, f"{artifact_id}_{file.filename}")
         
-        # Save uploaded file
-        async with aiofiles.open(temp_file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # Save uploaded file in fixed-size chunks
+        file_size = await save_upload(file, temp_file_path)
         
         # Validate image file
         if not await easyocr_processor.validate_image_file(temp_file_path):
@@ -1296,7 +1329,7 @@ async def upload_image(
         file_metadata = FileMetadata(
             name=file.filename,
             path=temp_file_path,
-            size=len(content),
+            size=file_size,
             mime_type=file.content_type or "application/octet-stream",
             uploaded_at=datetime.now()
         )
@@ -1324,6 +1357,8 @@ async def upload_image(
             "message": "Image uploaded successfully, OCR processing in background"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         # Clean up temporary file if it exists
         if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
@@ -1457,11 +1492,8 @@ async def export_cleaned_data_as_csv(artifact_id: str):
         raise HTTPException(status_code=404, detail="No data available for export")
     
     try:
-        # Clean the DataFrame for CSV export
-        df_export = df.copy()
-        
-        # Handle any remaining NaN values
-        df_export = df_export.fillna('')
+        # Clean the DataFrame for CSV export, handling any remaining NaN values
+        df_export = df.fillna('')
         
         # Convert DataFrame to CSV string
         csv_buffer = io.StringIO()
@@ -1732,90 +1764,10 @@ async def process_file_background(artifact_id: str, file_path: str):
         # Step 1: Process the file
         result = await file_processor.process_file(file_path, artifact.original_file.mime_type)
         
-        if result.success and result.data_preview:
-            print(f"File processing completed for artifact {artifact_id}")
-            
-            # Step 2: AI-powered data quality analysis (if available)
-            if quality_agent and openai_client:
-                try:
-                    # Convert data preview back to DataFrame for AI analysis
-                    sample_data = result.data_preview['sample_rows']
-                    if sample_data:
-                        # Create a small DataFrame from sample data for analysis
-                        import pandas as pd
-                        df_sample = pd.DataFrame(sample_data)
-                        
-                        # Store full DataFrame for Phase 2.5 transformations
-                        # Read the full file again for transformations
-                        try:
-                            if file_path.endswith('.csv'):
-                                full_df = pd.read_csv(file_path)
-                            elif file_path.endswith(('.xlsx', '.xls')):
-                                full_df = pd.read_excel(file_path)
-                            else:
-                                full_df = df_sample
-                            
-                            # Save DataFrame to memory
-                            await data_store.save_dataframe(artifact_id, full_df)
-                            print(f"Stored full DataFrame for transformations: {full_df.shape}")
-                        except Exception as df_error:
-                            print(f"Could not store full DataFrame: {str(df_error)}")
-                            # Fall back to sample data
-                            await data_store.save_dataframe(artifact_id, df_sample)
-                        
-                        print(f"Starting AI quality analysis for artifact {artifact_id}")
-                        
-                        # Analyze data quality issues
-                        quality_issues = await quality_agent.analyze_data(df_sample)
-                        print(f"Found {len(quality_issues)} quality issues")
-                        
-                        # Generate AI suggestions
-                        suggestions = await quality_agent.generate_suggestions(quality_issues, df_sample)
-                        print(f"Generated {len(suggestions)} AI suggestions")
-                        
-                        # Update artifact with AI-generated suggestions
-                        artifact.suggestions = suggestions
-                        
-                        # Calculate quality score based on number of distinct issues found
-                        total_rows = df_sample.shape[0]
-                        num_issues = len(quality_issues)
-                        # Score based on issue density with gradual penalty: 0.05 per issue, min score 0.1
-                        quality_score = max(0.1, 1.0 - (num_issues * 0.05))
-                        artifact.quality_score = round(quality_score, 2)
-                        
-                        print(f"Quality score: {artifact.quality_score}")
-                        
-                except Exception as ai_error:
-                    print(f"AI analysis failed for artifact {artifact_id}: {str(ai_error)}")
-                    # Continue without AI suggestions - still mark as pending review
-                    
-            else:
-                print("OpenAI not configured - skipping AI analysis")
-                
-            # Update artifact status
-            artifact.status = ProcessingStatus.PENDING_REVIEW
-            artifact.updated_at = datetime.now()
-            await data_store.update_data_artifact(artifact)
-            
-            print(f"Processing completed for artifact {artifact_id}")
-            
-        else:
-            # Handle processing error
-            artifact.status = ProcessingStatus.ERROR
-            artifact.error_message = result.error_message or "File processing failed"
-            artifact.updated_at = datetime.now()
-            await data_store.update_data_artifact(artifact)
-            print(f"File processing failed for artifact {artifact_id}: {artifact.error_message}")
+        await _complete_artifact_processing(artifact, result)
             
     except Exception as e:
-        # Handle unexpected errors
-        print(f"Unexpected error processing artifact {artifact_id}: {str(e)}")
-        artifact = await data_store.get_data_artifact(artifact_id)
-        if artifact:
-            artifact.status = ProcessingStatus.ERROR
-            artifact.error_message = f"Processing failed: {str(e)}"
-            artifact.updated_at = datetime.now()
-            await data_store.update_data_artifact(artifact)
+        await _mark_artifact_failed(artifact_id, e)
     
     finally:
         # Clean up temporary file
@@ -1824,6 +1776,123 @@ async def process_file_background(artifact_id: str, file_path: str):
             print(f"Cleaned up temporary file: {file_path}")
 
 
+async def process_workbook_background(artifact_ids: Dict[str, str], file_path: str):
+    """
+    Background task for processing the sheets of an uploaded workbook as separate artifacts.
+    
+    Args:
+        artifact_ids: Data artifact ID for each sheet, by sheet name
+        file_path: Path to the uploaded workbook
+    """
+    try:
+        # Step 1: Read all sheets in parallel
+        try:
+            results = await file_processor.process_workbook(file_path, list(artifact_ids))
+        except Exception as e:
+            for artifact_id in artifact_ids.values():
+                await _mark_artifact_failed(artifact_id, e)
+            return
+        
+        for sheet_name, artifact_id in artifact_ids.items():
+            try:
+                artifact = await data_store.get_data_artifact(artifact_id)
+                if not artifact:
+                    print(f"Artifact {artifact_id} not found for background processing")
+                    continue
+                
+                print(f"Processing sheet '{sheet_name}' for artifact {artifact_id}")
+                await _complete_artifact_processing(artifact, results[sheet_name])
+                
+            except Exception as e:
+                await _mark_artifact_failed(artifact_id, e)
+    
+    finally:
+        # Clean up temporary file
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            print(f"Cleaned up temporary file: {file_path}")
+
+
+async def _complete_artifact_processing(artifact: DataArtifact, result: ProcessingResult):
+    """
+    Store a processed file's DataFrame, run AI analysis on it and update its artifact.
+    
+    Args:
+        artifact: Data artifact of the file (or sheet)
+        result: Result of processing the file (or sheet)
+    """
+    artifact_id = artifact.artifact_id
+    
+    if result.success and result.data_preview:
+        print(f"File processing completed for artifact {artifact_id}")
+        
+        # Store the parsed DataFrame for Phase 2.5 transformations
+        full_df = result.dataframe
+        await data_store.save_dataframe(artifact_id, full_df)
+        print(f"Stored full DataFrame for transformations: {full_df.shape}")
+        
+        # Step 2: AI-powered data quality analysis (if available)
+        if quality_agent and openai_client:
+            try:
+                # Analyze a representative sample of the parsed DataFrame
+                df_sample = sample_frame(full_df)
+                if not df_sample.empty:
+                    print(f"Starting AI quality analysis for artifact {artifact_id}")
+                    
+                    # Analyze data quality issues
+                    quality_issues = await quality_agent.analyze_data(df_sample)
+                    print(f"Found {len(quality_issues)} quality issues")
+                    
+                    # Generate AI suggestions
+                    suggestions = await quality_agent.generate_suggestions(quality_issues, df_sample)
+                    print(f"Generated {len(suggestions)} AI suggestions")
+                    
+                    # Update artifact with AI-generated suggestions
+                    artifact.suggestions = suggestions
+                    
+                    # Calculate quality score based on number of distinct issues found
+                    total_rows = df_sample.shape[0]
+                    num_issues = len(quality_issues)
+                    # Score based on issue density with gradual penalty: 0.05 per issue, min score 0.1
+                    quality_score = max(0.1, 1.0 - (num_issues * 0.05))
+                    artifact.quality_score = round(quality_score, 2)
+                    
+                    print(f"Quality score: {artifact.quality_score}")
+                    
+            except Exception as ai_error:
+                print(f"AI analysis failed for artifact {artifact_id}: {str(ai_error)}")
+                # Continue without AI suggestions - still mark as pending review
+                
+        else:
+            print("OpenAI not configured - skipping AI analysis")
+            
+        # Update artifact status
+        artifact.status = ProcessingStatus.PENDING_REVIEW
+        artifact.updated_at = datetime.now()
+        await data_store.update_data_artifact(artifact)
+        
+        print(f"Processing completed for artifact {artifact_id}")
+        
+    else:
+        # Handle processing error
+        artifact.status = ProcessingStatus.ERROR
+        artifact.error_message = result.error_message or "File processing failed"
+        artifact.updated_at = datetime.now()
+        await data_store.update_data_artifact(artifact)
+        print(f"File processing failed for artifact {artifact_id}: {artifact.error_message}")
+
+
+async def _mark_artifact_failed(artifact_id: str, error: Exception):
+    """Mark an artifact as failed after an unexpected processing error."""
+    print(f"Unexpected error processing artifact {artifact_id}: {str(error)}")
+    artifact = await data_store.get_data_artifact(artifact_id)
+    if artifact:
+        artifact.status = ProcessingStatus.ERROR
+        artifact.error_message = f"Processing failed: {str(error)}"
+        artifact.updated_at = datetime.now()
+        await data_store.update_data_artifact(artifact)
+
+
 async def process_image_background(artifact_id: str, image_path: str):
     """
     Background task for processing uploaded images with EasyOCR.
@@ -1929,8 +1998,7 @@ async def process_image_background(artifact_id: str, image_path: str):
 @router.post("/csv-conversation/save-cleaned-data")
 async def save_cleaned_data(
     session_id: str,
-    cleaned_csv: str,
-    db: Session = Depends(get_db)
+    cleaned_csv: str
 ):
     """
     Save cleaned CSV data to the database for persistent storage.
@@ -1939,27 +2007,8 @@ async def save_cleaned_data(
     for validation, download, or further analysis.
     """
     try:
-        from database import Experiment
-        
         # Create or update experiment with cleaned CSV data
-        experiment = db.query(Experiment).filter(Experiment.id == session_id).first()
-        
-        if not experiment:
-            # Create new experiment record for this session
-            experiment = Experiment(
-                id=session_id,
-                title=f"Cleaned Data Session {session_id}",
-                description="Data cleaning session with applied transformations",
-                csv_data=cleaned_csv
-            )
-            db.add(experiment)
-        else:
-            # Update existing experiment with cleaned data
-            experiment.csv_data = cleaned_csv
-            experiment.updated_at = datetime.now()
-        
-        db.commit()
-        db.refresh(experiment)
+        experiment = await get_experiment_repository().save_cleaned_csv(session_id, cleaned_csv)
         
         logger.info(f"Saved cleaned CSV data for session {session_id}")
         
@@ -1972,7 +2021,6 @@ async def save_cleaned_data(
         
     except Exception as e:
         logger.error(f"Error saving cleaned data for session {session_id}: {str(e)}")
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to save cleaned data: {str(e)}"
@@ -1980,20 +2028,15 @@ async def save_cleaned_data(
 
 
 @router.get("/csv-conversation/get-cleaned-data/{session_id}")
-async def get_cleaned_data(
-    session_id: str,
-    db: Session = Depends(get_db)
-):
+async def get_cleaned_data(session_id: str):
     """
     Retrieve cleaned CSV data from the database.
     
     Returns the cleaned CSV data for the specified session if it exists.
     """
     try:
-        from database import Experiment
-        
         # Query experiment by session ID
-        experiment = db.query(Experiment).filter(Experiment.id == session_id).first()
+        experiment = await get_experiment_repository().get_experiment(session_id)
         
         if not experiment or not experiment.csv_data:
             raise HTTPException(
@@ -2021,23 +2064,19 @@ async def get_cleaned_data(
 
 
 @router.get("/csv-conversation/download-cleaned-data/{session_id}")
-async def download_cleaned_data(
-    session_id: str,
-    db: Session = Depends(get_db)
-):
+async def download_cleaned_data(session_id: str):
     """
     Download cleaned CSV data as a file.
     
     Returns the cleaned CSV data as a downloadable file attachment.
     """
     try:
-        from database import Experiment
         from fastapi.responses import Response
         
-        # Query experiment by session ID
-        experiment = db.query(Experiment).filter(Experiment.id == session_id).first()
+        # Only the CSV column is needed for the download
+        csv_data = await get_experiment_repository().get_csv(session_id)
         
-        if not experiment or not experiment.csv_data:
+        if not csv_data:
             raise HTTPException(
                 status_code=404,
                 detail=f"No cleaned data found for session {session_id}"
@@ -2051,7 +2090,7 @@ async def download_cleaned_data(
         }
         
         return Response(
-            content=experiment.csv_data,
+            content=csv_data,
             media_type="text/csv",
             headers=headers
         )
@@ -2080,8 +2119,8 @@ async def generate_headers_from_plan(request: GenerateHeadersRequest) -> Generat
         Generated headers and CSV header row
     """
     try:
-        # Verify OpenAI client is configured
-        openai_client = get_openai_client()
+        # Verify OpenAI client is configured; header generation is served from the LLM cache
+        openai_client = wrap_openai_client(get_openai_client())
         if not openai_client:
             raise HTTPException(
                 status_code=500, 
@@ -2154,26 +2193,10 @@ async def generate_headers_from_plan(request: GenerateHeadersRequest) -> Generat
         # If experiment_id provided, update the experiment's CSV data
         if request.experiment_id:
             try:
-                # Import here to avoid circular imports
-                from database import get_db, Experiment
-                from sqlalchemy.orm import Session
-                
-                # Get database session
-                db_gen = get_db()
-                db: Session = next(db_gen)
-                
-                try:
-                    # Find and update experiment
-                    experiment = db.query(Experiment).filter(Experiment.id == request.experiment_id).first()
-                    if experiment:
-                        experiment.csv_data = csv_data
-                        experiment.updated_at = datetime.now()
-                        db.commit()
-                        print(f"Updated experiment {request.experiment_id} with generated headers")
-                    else:
-                        print(f"Experiment {request.experiment_id} not found, skipping database update")
-                finally:
-                    db.close()
+                await get_experiment_repository().update_fields(request.experiment_id, csv_data=csv_data)
+                print(f"Updated experiment {request.experiment_id} with generated headers")
+            except ExperimentNotFoundError:
+                print(f"Experiment {request.experiment_id} not found, skipping database update")
             except Exception as e:
                 print(f"Failed to update experiment database: {str(e)}")
                 # Don't fail the whole request if database update fails
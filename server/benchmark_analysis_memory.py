@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for analysis data loading.
+
+Measures peak RSS while the analysis pipeline loads and profiles a CSV of the
+maximum accepted size (MAX_CSV_SIZE_MB) up to the point the renderer hands the
+data to the sandbox. Two modes run in separate processes:
+
+- legacy: the previous behaviour, where the input loader, data profiler and
+  renderer each parse the CSV text independently
+- handle: the current nodes, which parse once and share a DatasetHandle
+
+Usage (from the server directory):
+    python benchmark_analysis_memory.py --size-mb 50
+"""
+
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+
+
+def build_csv(size_mb: float) -> str:
+    """Build a mixed numeric/text CSV string just under the requested size."""
+    header = "sample_id,temperature,pressure,concentration,operator,condition\n"
+    row = "S{0:08d},{1:.3f},{2:.2f},{3:.5f},operator_{4},condition_{5}\n"
+    target = int(size_mb * 1024 * 1024)
+    rows = []
+    size = len(header)
+    i = 0
+    while True:
+        line = row.format(i, 20 + (i % 50) * 0.1, 101.3 + (i % 7), (i % 1000) / 1000, i % 12, i % 5)
+        if size + len(line) > target:
+            break
+        rows.append(line)
+        size += len(line)
+        i += 1
+    return header + "".join(rows)
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter (Linux), so building the input is not counted."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in megabytes."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_legacy(csv_data: str) -> dict:
+    """Replicate the old per-node parsing."""
+    import pandas as pd
+    from agents.analysis.dataset import DatasetHandle
+
+    # InputLoaderNode: parse to validate, then discard
+    df = pd.read_csv(io.StringIO(csv_data))
+    assert not df.empty
+    del df
+
+    # DataProfilerNode: parse again and profile (same statistics as today)
+    df = pd.read_csv(io.StringIO(csv_data))
+    schema = DatasetHandle(df).summary()["columns"]
+    sample = df.head(5).to_dict('records')
+    del df
+
+    # RendererNode._gather_ingredients: parse a third time, kept for the sandbox
+    df = pd.read_csv(io.StringIO(csv_data))
+    snapshot = {"dtypes": df.dtypes.astype(str).to_dict(), "sample_values": df.head(3).to_dict('records')}
+    return {"columns": len(schema), "sample": len(sample), "snapshot": len(snapshot), "rows": len(df)}
+
+
+def run_handle(csv_data: str) -> dict:
+    """Run the current input loader, data profiler and renderer ingredient steps."""
+    from agents.analysis.nodes import InputLoaderNode, DataProfilerNode, RendererNode
+
+    state = {
+        "experiment_plan_content": "benchmark plan",
+        "csv_data_content": csv_data,
+        "error_message": "",
+        "user_prompt": "plot temperature",
+        "chart_specification": {"chart_type": "scatter"},
+    }
+    state.update(InputLoaderNode().process(state))
+    state.update(DataProfilerNode().process(state))
+    renderer_state = RendererNode.__new__(RendererNode)._build_initial_state(state)
+    dataset = renderer_state["ingredients"]["dataset"]
+    return {"columns": len(state["data_schema"]["columns"]), "rows": dataset.row_count}
+
+
+def child(mode: str, size_mb: float) -> None:
+    """Run one mode and print its measurements as JSON."""
+    # Import everything up front so both modes start from the same baseline
+    import agents.analysis.nodes  # noqa: F401
+
+    csv_data = build_csv(size_mb)
+    reset_peak_rss()
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    result = run_legacy(csv_data) if mode == "legacy" else run_handle(csv_data)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+        "seconds": elapsed,
+        "rows": result["rows"],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=50.0, help="CSV size in megabytes")
+    parser.add_argument("--child", choices=["legacy", "handle"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.size_mb)
+        return
+
+    print("🧠 Analysis Data Loading Memory Benchmark")
+    print("=" * 50)
+    print(f"CSV size: {args.size_mb:.0f} MB")
+    print()
+
+    results = {}
+    for mode in ("legacy", "handle"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--size-mb", str(args.size_mb)],
+            capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        results[mode] = json.loads(output)
+        r = results[mode]
+        print(f"  {mode:<7} peak RSS={r['peak_mb']:8.1f} MB   "
+              f"(+{r['peak_mb'] - r['baseline_mb']:6.1f} MB over CSV text)   "
+              f"time={r['seconds']:6.2f} s   rows={r['rows']}")
+
+    saved = results["legacy"]["peak_mb"] - results["handle"]["peak_mb"]
+    print(f"\nPeak RSS saved: {saved:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CSV ingestion with the bounded-prefix sniffer.
+
+Writes a long CSV (many rows, few columns) and a wide CSV (few rows, many
+columns), both latin-1 encoded and semicolon separated, and parses each two
+ways:
+
+- the former path: chardet over the whole file, then pd.read_csv with each
+  candidate separator until one gives more than one column
+- the current path: read_csv_file(), which sniffs encoding and dialect from
+  a bounded prefix and parses once, in chunks
+
+Checks that both give the same frame and times them. Also times the CSV
+string path (parse_csv_text) against trying the separators in turn, and
+first checks that numeric header names (years, time points, wavelengths)
+stay the header on both paths, and that a column whose type changes far
+down the file gets the type a single parse would give it.
+
+Usage (from the server directory):
+    python benchmark_csv_sniffer.py --rows 1000000 --columns 2000
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import chardet
+import numpy as np
+import pandas as pd
+
+from agents.dataclean.frame_cache import parse_csv_text
+from agents.dataclean.ingest import read_csv_chunked, read_csv_file
+
+SEPARATORS = [',', ';', '\t']
+
+
+def build_long(rows: int) -> pd.DataFrame:
+    """An instrument export: sample labels with accents, readings, counts."""
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "sample": rng.choice(["Contrôle", "Traité", "Placébo", "Référence"], rows),
+        "reading": rng.normal(10, 2, rows).round(4),
+        "count": rng.integers(0, 500, rows),
+        "note": rng.choice(["ok", "ré-essai", "débordement"], rows),
+    })
+
+
+def build_wide(rows: int, columns: int) -> pd.DataFrame:
+    """A plate reader export: one column per well, one row per time point."""
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame(rng.normal(size=(rows, columns)).round(4),
+                      columns=[f"puits_{number}_é" for number in range(columns)])
+    df.insert(0, "échantillon", [f"t{row}" for row in range(rows)])
+    return df
+
+
+def former_read(path: str) -> pd.DataFrame:
+    """Full-file chardet, then one full parse per separator tried."""
+    with open(path, 'rb') as f:
+        encoding = chardet.detect(f.read())['encoding'] or 'utf-8'
+    for separator in SEPARATORS:
+        df = pd.read_csv(path, encoding=encoding, sep=separator)
+        if len(df.columns) > 1:
+            return df
+    return pd.read_csv(path, encoding=encoding)
+
+
+def former_parse_text(csv_text: str) -> pd.DataFrame:
+    """One full parse per separator tried."""
+    for separator in SEPARATORS:
+        df = pd.read_csv(io.StringIO(csv_text), sep=separator)
+        if len(df.columns) > 1:
+            return df
+    return pd.read_csv(io.StringIO(csv_text))
+
+
+def check_numeric_headers():
+    """Files whose header names are numbers keep their first row as header."""
+    samples = [
+        "sample,2020,2021\nA,1.5,2.5\nB,3.5,4.5\n",
+        "time,1,2,3\n0.0,0.1,0.2,0.3\n0.5,0.4,0.5,0.6\n",
+        "400,450,500\n0.12,0.34,0.56\n0.21,0.43,0.65\n",
+    ]
+    for csv_text in samples:
+        header = csv_text.split("\n", 1)[0].split(",")
+        assert list(parse_csv_text(csv_text).columns) == header
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write(csv_text)
+        try:
+            df = read_csv_file(path)
+        finally:
+            os.remove(path)
+        assert list(df.columns) == header and len(df) == 2
+    print("  numeric header names kept on file and text paths")
+
+
+def check_mixed_types():
+    """Columns parsed to different types in different chunks match a single parse."""
+    rows = 3000
+    lines = ["id,flag,reading,code"]
+    for row in range(rows):
+        sample_id = "S-1" if row == 2500 else str(row)          # text after two numeric chunks
+        flag = "" if row < 1500 else str(row % 2 == 0)           # empty, then booleans with gaps
+        reading = "" if row == 10 else str(row)                  # integers with one gap
+        code = "007" if row < 1200 else "X7"                     # numeric-looking, then text
+        lines.append(f"{sample_id},{flag},{reading},{code}")
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    try:
+        expected = pd.read_csv(path, low_memory=False)
+        result = read_csv_chunked(path, "utf-8", chunk_rows=1000)
+    finally:
+        os.remove(path)
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["id"].map(type).eq(str).all() and result["code"].iloc[0] == "007"
+    print("  column types consistent across chunks")
+
+
+def timed(function, *args):
+    """Run a function, returning its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(label: str, df: pd.DataFrame):
+    """Write a frame as latin-1 semicolon CSV and time both read paths."""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        df.to_csv(path, sep=';', index=False, encoding='latin-1')
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        expected, former_seconds = timed(former_read, path)
+        result, sniffed_seconds = timed(read_csv_file, path)
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"  {label:<5} file  {size_mb:7.1f} MB   former {former_seconds:8.2f} s   "
+              f"sniffed {sniffed_seconds:8.2f} s   ({former_seconds / sniffed_seconds:.1f}x)")
+
+        with open(path, encoding='latin-1') as f:
+            csv_text = f.read()
+        expected, former_seconds = timed(former_parse_text, csv_text)
+        result, sniffed_seconds = timed(parse_csv_text, csv_text)
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"  {label:<5} text  {size_mb:7.1f} MB   former {former_seconds:8.2f} s   "
+              f"sniffed {sniffed_seconds:8.2f} s   ({former_seconds / sniffed_seconds:.1f}x)")
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000, help="Rows of the long CSV")
+    parser.add_argument("--columns", type=int, default=1000, help="Columns of the wide CSV")
+    parser.add_argument("--wide-rows", type=int, default=2000, help="Rows of the wide CSV")
+    args = parser.parse_args()
+
+    print("🔎 CSV Sniffer Benchmark")
+    print("=" * 50)
+    print(f"long: {args.rows} rows x 4 columns, wide: {args.wide_rows} rows x {args.columns + 1} columns")
+    print()
+
+    check_numeric_headers()
+    check_mixed_types()
+    run("long", build_long(args.rows))
+    run("wide", build_wide(args.wide_rows, args.columns))
+
+
+if __name__ == "__main__":
+    main()
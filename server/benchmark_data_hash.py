@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the data hash recorded with every data version.
+
+Compares the former hash (``to_string`` of the whole frame, then MD5), timed
+on a slice and extrapolated to the full frame, with hash_frame:
+
+- cold: every column hashed (the first version of an artifact)
+- incremental: one column replaced, as a transformation does; the other
+  columns are shared with the previous version and their digests are cached
+- unchanged: the same frame hashed again
+
+First checks that columns holding lists and dicts hash, and that changing
+one of those values changes the hash.
+
+Usage (from the server directory):
+    python benchmark_data_hash.py --rows 1000000 --columns 20
+"""
+
+import argparse
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from agents.dataclean.cow_frame import derive_frame, freeze_frame
+from agents.dataclean.frame_hash import get_column_hash_cache, hash_frame, xxhash
+from benchmark_frame_copies import build_frame
+
+
+def timed(function, *args):
+    """Run a function, returning its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def legacy_hash(df) -> str:
+    """The former data hash."""
+    return hashlib.md5(df.to_string().encode()).hexdigest()
+
+
+def check_unhashable_values():
+    """Columns of lists and dicts hash, and a changed value changes the hash."""
+    df = pd.DataFrame({
+        "tags": [["a", "b"], [], ["c"]],
+        "meta": [{"unit": "mg"}, {"unit": "g"}, None],
+        "value": [1.0, 2.0, 3.0],
+    })
+    changed = df.copy()
+    changed.at[2, "tags"] = ["d"]
+    assert hash_frame(df) == hash_frame(df.copy())
+    assert hash_frame(df) != hash_frame(changed)
+    assert hash_frame(df.set_index("tags")) != hash_frame(changed.set_index("tags"))
+    print("  columns of lists and dicts hash ✓")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=20, help="Number of columns")
+    parser.add_argument("--legacy-rows", type=int, default=20000,
+                        help="Rows the former hash is timed on (it is extrapolated to --rows)")
+    args = parser.parse_args()
+
+    print("🔐 Data Version Hash Benchmark")
+    print("=" * 50)
+    print(f"frame: {args.rows} rows x {args.columns} columns, "
+          f"digest: {'xxh3-128' if xxhash is not None else 'blake2b (xxhash not installed)'}")
+    print()
+
+    check_unhashable_values()
+    df = freeze_frame(build_frame(args.rows, args.columns), adopt=True)
+
+    legacy_rows = min(args.legacy_rows, args.rows)
+    _, seconds = timed(legacy_hash, df.iloc[:legacy_rows])
+    print(f"  to_string + md5:     {seconds * args.rows / legacy_rows:8.3f} s "
+          f"(extrapolated from {legacy_rows} rows)")
+
+    cold_hash, seconds = timed(hash_frame, df)
+    print(f"  hash_frame cold:     {seconds:8.3f} s")
+
+    changed = derive_frame(df)
+    changed["m1"] = np.round(changed["m1"], 2)
+    changed = freeze_frame(changed, adopt=True)
+    changed_hash, seconds = timed(hash_frame, changed)
+    print(f"  one column changed:  {seconds:8.3f} s")
+
+    again_hash, seconds = timed(hash_frame, changed)
+    print(f"  unchanged frame:     {seconds:8.3f} s")
+
+    assert changed_hash != cold_hash and again_hash == changed_hash
+    stats = get_column_hash_cache().get_stats()
+    print(f"\ncache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the data store backends.
+
+Times the operations the data cleaning flow performs on every upload and
+transformation (save/get artifact, save/get DataFrame, save/get data version)
+against:
+
+- memory: MemoryDataStore (no memory budget, so nothing is spilled)
+- sqlite: PersistentDataStore in a temporary directory
+
+Each operation is repeated and the median latency is reported. A second
+PersistentDataStore opened on the same directory checks that the data is
+visible to another instance, as it would be to another worker or after a
+restart, and that frames keep their dtypes (object columns of numbers
+included) through it.
+
+Usage (from the server directory):
+    python benchmark_data_store.py --rows 100000 --columns 12 --repeat 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from agents.dataclean.memory_store import MemoryDataStore
+from agents.dataclean.models import DataArtifact, FileMetadata, ProcessingStatus
+from agents.dataclean.persistent_store import PersistentDataStore
+
+
+def build_frame(rows: int, columns: int) -> pd.DataFrame:
+    """Build a frame of numeric measurements plus a few text columns."""
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame(rng.normal(size=(rows, columns - 2)), columns=[f"m{i}" for i in range(columns - 2)])
+    df["sample"] = [f"S{i:07d}" for i in range(rows)]
+    df["condition"] = rng.choice(["control", "treated"], rows)
+    return df
+
+
+def build_artifact() -> DataArtifact:
+    """Build an artifact like the ones created for an upload."""
+    now = datetime.now()
+    return DataArtifact(
+        artifact_id=str(uuid.uuid4()),
+        experiment_id="benchmark",
+        owner_id="benchmark",
+        status=ProcessingStatus.READY_FOR_ANALYSIS,
+        original_file=FileMetadata(name="data.csv", path="/tmp/data.csv", size=0,
+                                   mime_type="text/csv", uploaded_at=now),
+        created_at=now,
+        updated_at=now
+    )
+
+
+async def timed(repeat: int, operation) -> float:
+    """Median latency of an async operation in milliseconds."""
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        await operation(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run_backend(store, df: pd.DataFrame, repeat: int) -> dict:
+    """Time each operation against one store."""
+    artifact = build_artifact()
+    artifact_id = artifact.artifact_id
+    return {
+        "save_data_artifact": await timed(repeat, lambda i: store.save_data_artifact(artifact)),
+        "get_data_artifact": await timed(repeat, lambda i: store.get_data_artifact(artifact_id)),
+        "save_dataframe": await timed(repeat, lambda i: store.save_dataframe(artifact_id, df)),
+        "get_dataframe": await timed(repeat, lambda i: store.get_dataframe(artifact_id)),
+        "save_data_version": await timed(repeat, lambda i: store.save_data_version(artifact_id, i, df)),
+        "get_data_version": await timed(repeat, lambda i: store.get_data_version(artifact_id, i)),
+        "artifact_id": artifact_id,
+    }
+
+
+async def main_async(args) -> None:
+    df = build_frame(args.rows, args.columns)
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+
+    print("💾 Data Store Backend Latency Benchmark")
+    print("=" * 50)
+    print(f"frame: {args.rows} rows x {args.columns} columns ({frame_mb:.1f} MB), "
+          f"median of {args.repeat} runs")
+
+    with tempfile.TemporaryDirectory() as root:
+        stores = {
+            "memory": MemoryDataStore(max_memory_bytes=0),
+            "sqlite": PersistentDataStore(root),
+        }
+        results = {name: await run_backend(store, df, args.repeat) for name, store in stores.items()}
+
+        print(f"\n{'operation':<20}" + "".join(f"{name:>12}" for name in stores))
+        for operation in results["memory"]:
+            if operation == "artifact_id":
+                continue
+            print(f"{operation:<20}" + "".join(f"{results[name][operation]:>9.2f} ms" for name in stores))
+
+        reopened = PersistentDataStore(root)
+        restored = await reopened.get_dataframe(results["sqlite"]["artifact_id"])
+        assert restored is not None and restored.shape == df.shape
+        mixed = pd.DataFrame({"reading": pd.Series([1.5, 2.5, None], dtype=object), "label": ["a", "b", None]})
+        await stores["sqlite"].save_dataframe("dtypes", mixed)
+        pd.testing.assert_frame_equal(await reopened.get_dataframe("dtypes"), mixed)
+        stats = await reopened.get_storage_stats()
+        print(f"\nsqlite store reopened: {stats['versions_count']} versions, "
+              f"{(stats['dataframes_disk_bytes'] + stats['versions_disk_bytes']) / 1024 ** 2:.1f} MB "
+              f"of {stats['frame_format']} files")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=12, help="Number of columns")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per operation")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
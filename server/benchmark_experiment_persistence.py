@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CSV conversation persistence.
+
+Compares the per-turn cost of persisting and loading cleaned CSV data through
+the HTTP API (the old loopback path used by CSVConversationGraph) against
+calling the in-process ExperimentRepository directly.
+
+An analyze turn does one load; an apply turn does one save plus one versioned
+CSV update. By default the HTTP path runs against the database router mounted
+in-process, which is a lower bound for the real loopback cost. Pass --url to
+measure against a running server over TCP instead.
+
+Usage (from the server directory):
+    python benchmark_experiment_persistence.py --size-mb 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# Use a throwaway database unless one is explicitly configured
+_tmp_dir = tempfile.mkdtemp(prefix="scioscribe-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+
+import httpx
+from fastapi import FastAPI
+
+from api.database import router as database_router
+from database import init_db, get_experiment_repository
+
+
+def build_csv(size_mb: float) -> str:
+    """Build a CSV string of roughly the requested size."""
+    header = "sample_id,temperature,pressure,concentration,operator,notes\n"
+    row = "S{0:08d},{1:.3f},{2:.2f},{3:.5f},operator_{4},measurement note for row {0}\n"
+    target = int(size_mb * 1024 * 1024)
+    rows = []
+    size = len(header)
+    i = 0
+    while size < target:
+        line = row.format(i, 20 + (i % 50) * 0.1, 101.3 + (i % 7), (i % 1000) / 1000, i % 12)
+        rows.append(line)
+        size += len(line)
+        i += 1
+    return header + "".join(rows)
+
+
+async def time_call(coro_factory, repeats: int) -> list:
+    """Run a coroutine factory repeatedly and return latencies in milliseconds."""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await coro_factory()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name: str, latencies: list) -> float:
+    """Print and return the median latency."""
+    median = statistics.median(latencies)
+    print(f"  {name:<34} p50={median:8.1f} ms   max={max(latencies):8.1f} ms")
+    return median
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=10.0, help="CSV size in megabytes")
+    parser.add_argument("--repeats", type=int, default=10, help="Iterations per measurement")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (e.g. http://localhost:8000)")
+    args = parser.parse_args()
+
+    print("📊 CSV Persistence Benchmark")
+    print("=" * 50)
+
+    init_db()
+    repository = get_experiment_repository()
+    csv_data = build_csv(args.size_mb)
+    print(f"CSV size: {len(csv_data) / (1024 * 1024):.1f} MB, repeats: {args.repeats}")
+
+    experiment = await repository.create_experiment(title="benchmark", csv_data=csv_data)
+    experiment_id = experiment.id
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=120)
+        print(f"HTTP path: {args.url} (TCP loopback)")
+    else:
+        app = FastAPI()
+        app.include_router(database_router)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+        print("HTTP path: in-process ASGI transport (lower bound)")
+
+    async with client:
+        print("\nHTTP API:")
+        http_load = summarize("load (GET experiment)", await time_call(
+            lambda: client.get(f"/api/database/experiments/{experiment_id}"), args.repeats))
+        http_save = summarize("save (PUT csv, agent update)", await time_call(
+            lambda: client.put(f"/api/database/experiments/{experiment_id}/csv",
+                               json={"csv_data": csv_data, "is_agent_update": True}), args.repeats))
+
+    print("\nIn-process repository:")
+    repo_load = summarize("load (get_csv)", await time_call(
+        lambda: repository.get_csv(experiment_id), args.repeats))
+    repo_save = summarize("save (update_csv, agent update)", await time_call(
+        lambda: repository.update_csv(experiment_id, csv_data, is_agent_update=True), args.repeats))
+
+    # Analyze turn = 1 load, apply turn = 2 saves (cleaned-data save + versioned update)
+    print("\nPer-turn latency saved:")
+    print(f"  analyze turn: {http_load - repo_load:8.1f} ms")
+    print(f"  apply turn:   {2 * (http_save - repo_save):8.1f} ms")
+
+    await repository.delete_experiment(experiment_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Parity check and benchmark for the lazy Polars transformation engine.
+
+Runs transformation pipelines on the same frame with pandas (the engine's
+column chains) and as a lazy Polars plan (lazy_engine.py), checks that both
+give the same frame, and times them. The pipelines cover every operation the
+lazy engine supports, on float, integer and text columns with missing
+values:
+
+- value replacement chains (including missing keys and values)
+- missing value fills by value, mean, median, mode, forward and backward
+- type conversion to float
+- text, phone and email standardization
+- IQR outlier removal between column transformations
+
+Needs the optional polars package.
+
+Usage (from the server directory):
+    python benchmark_lazy_engine.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from agents.dataclean import lazy_engine
+from agents.dataclean.memory_store import MemoryDataStore
+from agents.dataclean.models import CustomTransformation, TransformationAction, ValueMapping
+from agents.dataclean.transformation_engine import TransformationEngine
+from agents.dataclean.transformation_pipeline import TransformationPipeline
+
+
+def build_frame(rows: int) -> pd.DataFrame:
+    """An instrument export: readings, counts, sample labels, contacts."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "reading": rng.normal(10, 2, rows),
+        "count": rng.integers(0, 50, rows),
+        "sample": rng.choice([" Control", "control ", "TREATED", "treated", "Placebo", None], rows),
+        "email": rng.choice([" A@Lab.org", "b@lab.ORG ", None], rows),
+        "phone": rng.choice(["(555) 010-2000", "555.010.3000", None], rows),
+        "untouched": rng.normal(size=rows),
+    })
+    df.loc[::17, "reading"] = np.nan
+    df.loc[::101, "reading"] = 500.0
+    return df
+
+
+def transformation(column: str, action: TransformationAction, mappings=(), **parameters) -> CustomTransformation:
+    """A transformation as the suggestion converter creates it."""
+    return CustomTransformation(
+        transformation_id=str(uuid.uuid4()),
+        column=column,
+        action=action,
+        value_mappings=[ValueMapping(original_value=original, new_value=new) for original, new in mappings],
+        parameters=parameters,
+        description=f"{action.value} on {column}",
+        created_by="benchmark",
+        created_at=pd.Timestamp.now().to_pydatetime()
+    )
+
+
+def build_pipelines() -> dict:
+    """Pipelines exercising every supported operation."""
+    replace, fill = TransformationAction.REPLACE_VALUES, TransformationAction.FILL_MISSING
+    standardize = TransformationAction.STANDARDIZE_FORMAT
+    return {
+        "cleaning batch": [
+            transformation("sample", standardize, format_type="text", case="lower"),
+            transformation("sample", replace, [("treated", "treatment"), (None, "unknown")]),
+            transformation("reading", fill, strategy="median"),
+            transformation("count", replace, [(0, 1), (1, 2)]),
+            transformation("email", standardize, format_type="email"),
+            transformation("phone", standardize, format_type="phone"),
+        ],
+        "fills": [
+            transformation("reading", fill, strategy="mean"),
+            transformation("sample", fill, strategy="mode"),
+            transformation("email", fill, strategy="forward"),
+            transformation("phone", fill, strategy="backward"),
+            transformation("count", TransformationAction.CONVERT_TYPE, target_type="float"),
+        ],
+        "outliers": [
+            # An int key on a float column, as suggestions often give it
+            transformation("reading", replace, [(500, None)]),
+            transformation("reading", TransformationAction.REMOVE_OUTLIERS, method="iqr"),
+            transformation("reading", fill, strategy="value", fill_value=0.0),
+            transformation("sample", standardize, format_type="text", case="upper"),
+        ],
+    }
+
+
+async def run_pandas(engine: TransformationEngine, df: pd.DataFrame, pipeline: TransformationPipeline):
+    working_df, applied, failed = await engine._run_pipeline_stages(df, pipeline)
+    assert not failed, failed
+    return working_df
+
+
+def timed(function, *args):
+    """Run a function, returning its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of rows")
+    args = parser.parse_args()
+
+    print("🐻 Lazy Polars Engine Parity and Benchmark")
+    print("=" * 50)
+    if not lazy_engine.is_available():
+        print("polars is not installed (pip install polars)")
+        return
+
+    df = build_frame(args.rows)
+    engine = TransformationEngine()
+    engine.data_store = MemoryDataStore(max_memory_bytes=0)
+    print(f"{args.rows} rows")
+    print()
+
+    for name, transformations in build_pipelines().items():
+        pipeline = TransformationPipeline(transformations)
+        assert lazy_engine.supports(df, pipeline), name
+        expected, pandas_seconds = timed(lambda: asyncio.run(run_pandas(engine, df, pipeline)))
+        result, polars_seconds = timed(lazy_engine.execute, df, pipeline)
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"  {name:<15} identical   pandas {pandas_seconds:7.3f} s   polars {polars_seconds:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the OCR service.
+
+Draws synthetic table images (a header row and rows of sample readings in a
+grid) and runs OCR on all of them two ways:
+
+- the former path: one EasyOCR reader in this process, one image at a time
+- the current path: OCRService, submitting every image at once to a pool of
+  worker processes that each loaded the model at startup
+
+Reports images per second for both and checks that they detect the same
+text. Model loading is excluded from both timings (the service is warmed up
+with one image first). Needs easyocr and Pillow.
+
+Usage (from the server directory):
+    python benchmark_ocr_service.py --images 16 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import easyocr
+import numpy as np
+from PIL import Image, ImageDraw
+
+from agents.dataclean.ocr_service import OCRService
+
+
+def draw_table(path: str, rows: int, seed: int) -> None:
+    """A lab results table: sample label, reading and count per row."""
+    rng = np.random.default_rng(seed)
+    header = ["Sample", "Reading", "Count"]
+    cell_width, cell_height = 180, 40
+    image = Image.new("RGB", (cell_width * len(header) + 40, cell_height * (rows + 1) + 40), "white")
+    draw = ImageDraw.Draw(image)
+    for row in range(rows + 1):
+        if row == 0:
+            cells = header
+        else:
+            cells = [
+                str(rng.choice(["Control", "Treated", "Placebo"])),
+                f"{rng.normal(10, 2):.2f}",
+                str(rng.integers(0, 500)),
+            ]
+        for column, text in enumerate(cells):
+            x, y = 20 + column * cell_width, 20 + row * cell_height
+            draw.rectangle([x, y, x + cell_width, y + cell_height], outline="black")
+            draw.text((x + 10, y + 12), text, fill="black")
+    image.save(path)
+
+
+def texts(results) -> list:
+    """Detected strings of a readtext result, in order."""
+    return [text for _, text, _ in results]
+
+
+async def run_service(paths, workers: int):
+    """OCR on all images through the service; returns results and seconds (model load excluded)."""
+    service = OCRService(languages=["en"], gpu=False, workers=workers,
+                         queue_size=len(paths), timeout=300)
+    try:
+        # Warm every worker so model loading is not timed
+        await asyncio.gather(*(service.readtext(paths[0]) for _ in range(workers)))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.readtext(path) for path in paths))
+        return results, time.perf_counter() - start
+    finally:
+        await service.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=16, help="Number of table images")
+    parser.add_argument("--rows", type=int, default=12, help="Table rows per image")
+    parser.add_argument("--workers", type=int, default=4, help="OCR worker processes")
+    args = parser.parse_args()
+
+    print("🖼️ OCR Service Throughput Benchmark")
+    print("=" * 50)
+    print(f"{args.images} images x {args.rows} rows, {args.workers} workers")
+    print()
+
+    directory = tempfile.mkdtemp(prefix="ocr_benchmark_")
+    try:
+        paths = []
+        for number in range(args.images):
+            path = os.path.join(directory, f"table_{number}.png")
+            draw_table(path, args.rows, number)
+            paths.append(path)
+
+        reader = easyocr.Reader(["en"], gpu=False, verbose=False)
+        start = time.perf_counter()
+        expected = [reader.readtext(np.array(Image.open(path))) for path in paths]
+        sequential_seconds = time.perf_counter() - start
+
+        results, service_seconds = asyncio.run(run_service(paths, args.workers))
+        assert [texts(result) for result in results] == [texts(result) for result in expected]
+
+        print(f"  in-process  {args.images / sequential_seconds:6.2f} images/s   ({sequential_seconds:.1f} s)")
+        print(f"  service     {args.images / service_seconds:6.2f} images/s   ({service_seconds:.1f} s, "
+              f"{sequential_seconds / service_seconds:.1f}x)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared profiling engine.
+
+Profiles a wide instrument-style export (mostly numeric channels plus a few
+text columns) with the previous column-by-column DataProfilerNode loop and
+with agents.profiling.profile_frame, and reports the time of each. First
+checks that a frame with zero rows profiles to NaN statistics.
+
+Usage (from the server directory):
+    python benchmark_profiling.py --rows 20000 --columns 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from agents.profiling import profile_frame
+
+
+def build_frame(rows: int, columns: int) -> pd.DataFrame:
+    """Build a wide frame: numeric channels with gaps, plus a few text columns."""
+    rng = np.random.default_rng(42)
+    numeric = rng.normal(size=(rows, columns - 5))
+    numeric[rng.random(numeric.shape) < 0.01] = np.nan
+    df = pd.DataFrame(numeric, columns=[f"channel_{i:03d}" for i in range(columns - 5)])
+    for i in range(5):
+        df[f"label_{i}"] = rng.choice([f"state_{j}" for j in range(20)], size=rows)
+    return df
+
+
+def legacy_profile(df: pd.DataFrame) -> dict:
+    """The previous per-column DataProfilerNode statistics."""
+    data_schema = {"columns": {}, "row_count": len(df), "column_count": len(df.columns)}
+    for col in df.columns:
+        col_info = {
+            "type": str(df[col].dtype),
+            "non_null_count": df[col].count(),
+            "null_count": df[col].isnull().sum(),
+            "unique_count": df[col].nunique()
+        }
+        if pd.api.types.is_numeric_dtype(df[col]):
+            col_info.update({
+                "mean": float(df[col].mean()),
+                "std": float(df[col].std()),
+                "min": float(df[col].min()),
+                "max": float(df[col].max()),
+            })
+        elif df[col].dtype == 'object':
+            col_info["unique_values"] = df[col].unique().tolist()[:10]
+        data_schema["columns"][col] = col_info
+    return data_schema
+
+
+def check_empty_frame():
+    """Numeric columns of a zero-row frame get NaN statistics instead of raising."""
+    empty = build_frame(10, 8).iloc[:0]
+    profile = profile_frame(empty, quantiles=[0.25, 0.5, 0.75])
+    for name in empty.columns[:3]:
+        column = profile.columns[name]
+        assert column.kind == "numeric" and column.count == 0 and column.distinct_count == 0
+        assert all(np.isnan(value) for value in (column.mean, column.std, column.min, column.max))
+        assert all(np.isnan(value) for value in column.quantiles.values())
+    print("  zero-row frame profiled with NaN statistics")
+
+
+def best_of(func, repeats: int) -> float:
+    """Best wall time of several runs, in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=500, help="Number of columns")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    df = build_frame(args.rows, args.columns)
+    print("📈 Profiling Engine Benchmark")
+    print("=" * 50)
+    print(f"rows: {args.rows}, columns: {args.columns}")
+    print()
+
+    check_empty_frame()
+
+    legacy = best_of(lambda: legacy_profile(df), args.repeats)
+    bulk = best_of(lambda: profile_frame(df), args.repeats)
+    bulk_approx = best_of(lambda: profile_frame(df, approx_distinct_min_rows=0), args.repeats)
+
+    print(f"  per-column loop:          {legacy:9.1f} ms")
+    print(f"  profile_frame (exact):    {bulk:9.1f} ms   ({legacy / bulk:.1f}x)")
+    print(f"  profile_frame (HLL):      {bulk_approx:9.1f} ms   ({legacy / bulk_approx:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark for concurrent LLM calls in DataQualityAgent.
+
+Runs analyze_data and generate_suggestions against a stubbed AsyncOpenAI client
+whose chat completions sleep to simulate network latency, once in sequential
+mode, in concurrent mode, and in concurrent mode with batched suggestions.
+Sequential wall time is the sum of the call latencies; concurrent wall time
+approaches the slowest call (or, for many suggestions, the sum divided by the
+concurrency limit). Batching cuts the number of suggestion calls to one per
+batch of issues.
+
+Usage (from the server directory):
+    python benchmark_quality_concurrency.py --llm-latency 0.5 --concurrency 4 --batch-size 10
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from agents.dataclean.quality_agent import DataQualityAgent
+
+
+class SleepingCompletions:
+    """Stand-in for client.chat.completions: sleeps, then answers with canned JSON."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def create(self, model, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        suggestion = {
+            "action": "standardize_values",
+            "confidence": 0.8,
+            "risk_level": "low",
+            "explanation": "Stub suggestion"
+        }
+        if "one object per issue" in prompt:
+            numbers = [int(n) for n in re.findall(r"Issue (\d+):", prompt)]
+            content = json.dumps([dict(suggestion, issue=n) for n in numbers])
+        elif "suggestion" in prompt:
+            content = json.dumps(suggestion)
+        else:
+            content = json.dumps([{
+                "column": "condition",
+                "issue_type": "inconsistent_values",
+                "description": "Mixed capitalization",
+                "severity": "medium",
+                "affected_rows": 10
+            }])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def build_client(latency: float) -> SimpleNamespace:
+    """Build an object shaped like AsyncOpenAI around the stub completions."""
+    return SimpleNamespace(chat=SimpleNamespace(completions=SleepingCompletions(latency)))
+
+
+def build_frame(rows: int = 500) -> pd.DataFrame:
+    """Build a small dataset with missing values, outliers and inconsistent labels."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "temperature": rng.normal(25, 2, rows),
+        "pressure": rng.normal(101, 1, rows),
+        "yield": rng.normal(50, 5, rows),
+        "condition": rng.choice(["Control", "control", "Treated", "treated "], rows),
+        "operator": rng.choice(["A", "B", None], rows),
+    })
+    df.loc[::40, "temperature"] = 90.0
+    df.loc[::25, "pressure"] = np.nan
+    return df
+
+
+async def run_mode(concurrent: bool, batch_size: int, latency: float, concurrency: int, df: pd.DataFrame) -> dict:
+    """Run one analysis plus suggestions and time each phase."""
+    client = build_client(latency)
+    agent = DataQualityAgent(client, concurrent=concurrent, max_concurrency=concurrency,
+                             call_timeout=latency * 20, suggestion_batch_size=batch_size)
+
+    start = time.perf_counter()
+    issues = await agent.analyze_data(df)
+    analysis = time.perf_counter() - start
+
+    start = time.perf_counter()
+    suggestions = await agent.generate_suggestions(issues, df)
+    suggestion_time = time.perf_counter() - start
+
+    return {
+        "analysis": analysis,
+        "suggestions": suggestion_time,
+        "issues": len(issues),
+        "suggestion_count": len(suggestions),
+        "calls": client.chat.completions.calls,
+    }
+
+
+async def main_async(args) -> None:
+    df = build_frame()
+    print("⚡ Data Quality Agent Concurrency Benchmark")
+    print("=" * 50)
+    print(f"LLM latency: {args.llm_latency:.2f} s, concurrency limit: {args.concurrency}")
+
+    modes = (
+        ("sequential", False, 1),
+        ("concurrent", True, 1),
+        (f"concurrent, batches of {args.batch_size}", True, args.batch_size),
+    )
+    for name, concurrent, batch_size in modes:
+        r = await run_mode(concurrent, batch_size, args.llm_latency, args.concurrency, df)
+        print(f"\n{name}:")
+        print(f"  analyze_data:         {r['analysis']:6.2f} s   ({r['issues']} issues)")
+        print(f"  generate_suggestions: {r['suggestions']:6.2f} s   ({r['suggestion_count']} suggestions)")
+        print(f"  LLM calls:            {r['calls']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Simulated latency per LLM call (seconds)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent LLM calls")
+    parser.add_argument("--batch-size", type=int, default=10, help="Issues per batched suggestion call")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the analysis sandbox.
+
+Compares render latency of the cold path (a fresh interpreter per attempt,
+re-importing plotly/pandas/numpy) against the warm sandbox worker pool, using
+a typical generated draw_chart function. Reports p50 and p99 latency, and
+checks that a job tampering with plotly does not affect the next job.
+
+With --handoff-rows, also compares how a large dataset reaches a warm worker:
+as CSV text parsed in the worker, or as the parent's DataFrame through shared
+memory.
+
+Usage (from the server directory):
+    python benchmark_sandbox_pool.py --runs 50 --rows 5000
+    python benchmark_sandbox_pool.py --runs 10 --handoff-rows 1000000
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import pandas as pd
+
+from agents.analysis.nodes.sandbox_runner import SandboxRunnerNode
+from agents.analysis.sandbox_pool import SandboxWorkerPool
+
+DRAW_CHART_CODE = '''
+def draw_chart(df):
+    fig = px.scatter(df, x="temperature", y="yield", color="catalyst",
+                     title="Yield vs Temperature by Catalyst")
+    fig.update_layout(template="plotly_white")
+    html_content = fig.to_html(include_plotlyjs="cdn", full_html=False)
+    return fig, html_content
+'''
+
+
+# Aggregates first so the figure stays small and data transfer dominates
+AGGREGATE_CHART_CODE = '''
+def draw_chart(df):
+    summary = df.groupby(["temperature", "catalyst"], as_index=False)["yield"].mean()
+    fig = px.line(summary, x="temperature", y="yield", color="catalyst")
+    html_content = fig.to_html(include_plotlyjs="cdn", full_html=False)
+    return fig, html_content
+'''
+
+
+# Clobbers module state that a long-lived worker would otherwise carry forward
+SABOTAGE_CODE = '''
+import plotly.io as pio
+pio.templates.default = "plotly_dark"
+px.defaults.width = 123
+px.scatter = None
+
+def draw_chart(df):
+    raise RuntimeError("sabotage")
+'''
+
+
+def build_csv(rows: int) -> str:
+    """Build a small experiment CSV."""
+    lines = ["temperature,yield,catalyst"]
+    lines += [f"{20 + i % 40},{(i * 7) % 100 / 10:.1f},{'ABC'[i % 3]}" for i in range(rows)]
+    return "\n".join(lines) + "\n"
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(name: str, execute, runs: int) -> list:
+    """Run `execute` repeatedly and print latency percentiles in milliseconds."""
+    latencies = []
+    failures = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = execute()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not result["success"]:
+            failures += 1
+
+    print(f"  {name:<12} p50={statistics.median(latencies):8.1f} ms   "
+          f"p99={percentile(latencies, 99):8.1f} ms   max={max(latencies):8.1f} ms   "
+          f"failed={failures}/{runs}")
+    return latencies
+
+
+def check_isolation(pool: SandboxWorkerPool, csv_data: str) -> None:
+    """Check that state changed by one job is gone in the next job."""
+    sabotaged = pool.execute(SABOTAGE_CODE, csv_data)
+    assert not sabotaged["success"], "sabotage job should fail"
+
+    result = pool.execute(DRAW_CHART_CODE, csv_data)
+    assert result["success"], result["error"]
+    assert "plotly_dark" not in result["html_content"], "template leaked between jobs"
+    assert '"width":123' not in result["html_content"].replace(" ", ""), "px.defaults leaked between jobs"
+    print("isolation check: module and plotly state reset between jobs ✓")
+
+
+def compare_handoff(rows: int, runs: int):
+    """Compare CSV text against shared-memory DataFrame handoff to a warm worker."""
+    csv_data = build_csv(rows)
+    df = pd.read_csv(io.StringIO(csv_data))
+
+    print("🧪 Sandbox Data Handoff Benchmark")
+    print("=" * 50)
+    print(f"runs: {runs}, rows: {rows}, CSV size: {len(csv_data) / (1024 * 1024):.1f} MB")
+    print()
+
+    pool = SandboxWorkerPool(size=1, max_jobs_per_worker=runs * 2 + 1, timeout=60)
+    pool.start()
+    pool.wait_until_warm()
+    try:
+        csv_text = measure("CSV text", lambda: pool.execute(AGGREGATE_CHART_CODE, csv_data), runs)
+        shared = measure("shared mem", lambda: pool.execute(AGGREGATE_CHART_CODE, csv_data, df), runs)
+        print(f"\np50 speedup: {statistics.median(csv_text) / statistics.median(shared):.1f}x")
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=30, help="Renders per path")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows in the test CSV")
+    parser.add_argument("--max-jobs", type=int, default=50, help="Jobs per worker before recycling")
+    parser.add_argument("--handoff-rows", type=int, default=0, help="Rows for the CSV vs shared-memory comparison")
+    args = parser.parse_args()
+
+    if args.handoff_rows:
+        compare_handoff(args.handoff_rows, args.runs)
+        return
+
+    csv_data = build_csv(args.rows)
+    node = SandboxRunnerNode()
+
+    print("🧪 Sandbox Render Latency Benchmark")
+    print("=" * 50)
+    print(f"runs: {args.runs}, rows: {args.rows}, jobs per worker: {args.max_jobs}")
+
+    print()
+    cold = measure("cold spawn", lambda: node._execute_cold(DRAW_CHART_CODE, csv_data), args.runs)
+
+    # Two workers so a recycled worker's replacement warms up while the other serves
+    pool = SandboxWorkerPool(size=2, max_jobs_per_worker=args.max_jobs, timeout=5)
+    pool.start()
+    pool.wait_until_warm()
+    try:
+        warm = measure("warm pool", lambda: pool.execute(DRAW_CHART_CODE, csv_data), args.runs)
+        print(f"\np50 speedup: {statistics.median(cold) / statistics.median(warm):.1f}x")
+        check_isolation(pool, csv_data)
+        print(f"pool stats: {pool.get_stats()}")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for applying a batch of suggestions as one transformation pipeline.
+
+Applies the same batch of transformations to a frame twice:
+
+- sequential: one TransformationEngine.apply_transformation() call per
+  transformation, each saving a before and an after version and hashing
+  the new frame
+- pipeline: one TransformationEngine.apply_pipeline() call, which fuses the
+  batch into column chains, runs them side by side and records one version
+
+The batch fills missing values in several numeric columns and standardizes
+a text column with a chain of value replacements (fused into one pass) and
+a case change. Both runs must produce the same frame.
+
+Usage (from the server directory):
+    python benchmark_transformation_pipeline.py --rows 1000000 --columns 20 --transformations 12
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import pandas as pd
+
+from agents.dataclean.memory_store import MemoryDataStore
+from agents.dataclean.models import CustomTransformation, TransformationAction, ValueMapping
+from agents.dataclean.transformation_engine import TransformationEngine
+from agents.dataclean.transformation_pipeline import TransformationPipeline
+from benchmark_frame_copies import build_frame
+
+
+def transformation(column: str, action: TransformationAction, mappings=(), **parameters) -> CustomTransformation:
+    """A transformation as the suggestion converter creates it."""
+    return CustomTransformation(
+        transformation_id=str(uuid.uuid4()),
+        column=column,
+        action=action,
+        value_mappings=list(mappings),
+        parameters=parameters,
+        description=f"{action.value} on {column}",
+        created_by="benchmark",
+        created_at=pd.Timestamp.now().to_pydatetime()
+    )
+
+
+def build_batch(count: int, columns: int) -> list:
+    """Text standardization on "condition", then missing value fills on numeric columns."""
+    batch = [
+        transformation("condition", TransformationAction.REPLACE_VALUES,
+                       [ValueMapping(original_value="Control", new_value="control")]),
+        transformation("condition", TransformationAction.REPLACE_VALUES,
+                       [ValueMapping(original_value="treated", new_value="Treated")]),
+        transformation("condition", TransformationAction.REPLACE_VALUES,
+                       [ValueMapping(original_value=None, new_value="unknown")]),
+        transformation("condition", TransformationAction.STANDARDIZE_FORMAT, format_type="text", case="lower"),
+    ]
+    for position in range(max(0, count - len(batch))):
+        batch.append(transformation(f"m{position % (columns - 1)}", TransformationAction.FILL_MISSING,
+                                    strategy="median"))
+    return batch[:count]
+
+
+def new_engine() -> TransformationEngine:
+    """An engine with its own unbounded in-memory store."""
+    engine = TransformationEngine()
+    engine.data_store = MemoryDataStore(max_memory_bytes=0)
+    return engine
+
+
+async def run_sequential(df: pd.DataFrame, batch: list) -> pd.DataFrame:
+    engine = new_engine()
+    for item in batch:
+        df, _ = await engine.apply_transformation(df, item, "benchmark", "benchmark")
+    return df
+
+
+async def run_pipeline(df: pd.DataFrame, batch: list) -> pd.DataFrame:
+    engine = new_engine()
+    result = await engine.apply_pipeline(df, TransformationPipeline(batch), "benchmark", "benchmark")
+    assert not result.failed and len(result.data_version.transformations_applied) == len(batch)
+    return result.dataframe
+
+
+async def main_async(args) -> None:
+    df = build_frame(args.rows, args.columns)
+    batch = build_batch(args.transformations, args.columns)
+
+    print("🧬 Transformation Pipeline Benchmark")
+    print("=" * 50)
+    print(f"frame: {args.rows} rows x {args.columns} columns, {len(batch)} transformations")
+    print()
+
+    timings = {}
+    results = {}
+    for label, runner in (("sequential", run_sequential), ("pipeline", run_pipeline)):
+        start = time.perf_counter()
+        results[label] = await runner(df, batch)
+        timings[label] = time.perf_counter() - start
+        print(f"  {label:<11} {timings[label]:7.2f} s")
+
+    pd.testing.assert_frame_equal(results["sequential"], results["pipeline"])
+    print(f"\nsame result, {timings['sequential'] / timings['pipeline']:.1f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=20, help="Number of columns")
+    parser.add_argument("--transformations", type=int, default=12, help="Transformations in the batch")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
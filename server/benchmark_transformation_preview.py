@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for transformation previews.
+
+Times TransformationEngine.create_transformation_preview for frames of
+increasing length, for the single-column actions used by suggestions
+(replace values, fill missing, standardize text), against applying the
+transformation to a copy of the whole frame as previews used to do.
+Previews transform the target column only (value-wise actions only its
+distinct values), so they should grow with one column, not the whole frame.
+
+Checks that every preview counts exactly the rows the full apply changes and
+shows the values it writes.
+
+Usage (from the server directory):
+    python benchmark_transformation_preview.py --rows 10000 100000 1000000 --columns 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import pandas as pd
+
+from agents.dataclean.transformation_engine import TransformationEngine
+from agents.dataclean.value_mapping import changed_mask
+from benchmark_frame_copies import build_frame, build_transformation
+
+
+async def time_median(function, repeat: int):
+    """Median latency of an async call in milliseconds, and its last result."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+async def main_async(args) -> None:
+    engine = TransformationEngine()
+
+    print("🔍 Transformation Preview Latency Benchmark")
+    print("=" * 50)
+    print(f"{args.columns} columns, median of {args.repeat} runs")
+
+    for rows in args.rows:
+        df = build_frame(rows, args.columns)
+        print(f"\n{rows} rows:")
+        for step in range(3):
+            transformation = build_transformation(step)
+            column = transformation.column
+            preview_ms, preview = await time_median(
+                lambda: engine.create_transformation_preview(df, transformation), args.repeat
+            )
+            full_ms, applied = await time_median(
+                lambda: engine._apply_transformation_to_dataframe(df.copy(), transformation), args.repeat
+            )
+
+            assert preview.affected_rows == int(changed_mask(df[column], applied[column]).sum())
+            shown = pd.DataFrame(preview.after_sample)[column]
+            pd.testing.assert_series_equal(
+                shown, applied[column].head(len(shown)).reset_index(drop=True), check_dtype=False
+            )
+            print(f"  {transformation.action.value:<20} preview {preview_ms:8.1f} ms   "
+                  f"full apply {full_ms:8.1f} ms   ({preview.affected_rows} affected)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000], help="Frame lengths")
+    parser.add_argument("--columns", type=int, default=20, help="Number of columns")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per preview")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for REPLACE_VALUES transformations with many value mappings.
+
+Builds a text column with many variant spellings of a few canonical values
+(as a suggestion standardizing a categorical column produces) and times:
+
+- sequential: one replace() call per mapping, as value replacement used to
+  run, plus one equality scan per mapping to count affected rows
+- compiled: CompiledValueMapping, one pass for the new column, the replaced
+  rows and the per-value counts
+
+for the column as object dtype and as a categorical column, and checks that
+both give the same values. First checks that booleans and the numbers they
+equal (True == 1) are mapped separately.
+
+Usage (from the server directory):
+    python benchmark_value_replacement.py --rows 200000 --variants 500
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from agents.dataclean.models import ValueMapping
+from agents.dataclean.value_mapping import CompiledValueMapping, value_key
+
+
+def build_column(rows: int, variants: int) -> tuple:
+    """A column of variant spellings and the mappings to their canonical values."""
+    canonical = ["control", "treated", "placebo", "baseline", "follow-up"]
+    spellings = [f"{canonical[i % len(canonical)]}_{i}" for i in range(variants)]
+    rng = np.random.default_rng(5)
+    column = pd.Series(rng.choice(spellings + canonical, rows), name="condition")
+    mappings = [ValueMapping(original_value=spelling, new_value=spelling.split("_")[0]) for spelling in spellings]
+    return column, mappings
+
+
+def sequential(column: pd.Series, mappings) -> tuple:
+    """Mappings applied one replace() at a time, counts from one scan per mapping."""
+    values = column
+    counts = {}
+    for mapping in mappings:
+        counts[mapping.original_value] = int((column == mapping.original_value).sum())
+        with warnings.catch_warnings():
+            # replace() renaming categories is deprecated, but is what the engine did
+            warnings.simplefilter("ignore", FutureWarning)
+            values = values.replace(mapping.original_value, mapping.new_value)
+    return values, counts
+
+
+def compiled(column: pd.Series, mappings) -> tuple:
+    """Mappings folded into one dictionary and applied in one pass."""
+    replacement = CompiledValueMapping(mappings).apply(column)
+    return replacement.values, replacement.replaced_counts()
+
+
+def check_booleans():
+    """A mapping of True leaves 1 alone, and a mapping of 1 leaves True alone."""
+    column = pd.Series([True, 1, 1.0, False, 0, None], dtype=object)
+    mappings = [ValueMapping(original_value=True, new_value="yes"), ValueMapping(original_value=0, new_value="zero")]
+    replacement = CompiledValueMapping(mappings).apply(column)
+    assert replacement.values.tolist() == ["yes", 1, 1.0, False, "zero", None]
+    assert replacement.replaced_counts() == {value_key(True): 1, 0: 1}
+    print("  booleans mapped apart from equal numbers")
+
+
+def timed(function, *args):
+    """Run a function, returning its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="Number of rows")
+    parser.add_argument("--variants", type=int, default=500, help="Variant spellings (value mappings)")
+    args = parser.parse_args()
+
+    print("🔁 Value Replacement Benchmark")
+    print("=" * 50)
+    print(f"{args.rows} rows, {args.variants} value mappings")
+    print()
+
+    check_booleans()
+
+    column, mappings = build_column(args.rows, args.variants)
+    for label, data in (("object", column), ("category", column.astype("category"))):
+        (expected, expected_counts), sequential_seconds = timed(sequential, data, mappings)
+        (values, counts), compiled_seconds = timed(compiled, data, mappings)
+        assert values.astype(object).equals(expected.astype(object))
+        assert counts == {key: count for key, count in expected_counts.items() if count}
+        print(f"  {label:<9} sequential {sequential_seconds:8.3f} s   compiled {compiled_seconds:8.3f} s   "
+              f"({sequential_seconds / compiled_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for data version history.
+
+Replays the way TransformationEngine.apply_transformation stores versions
+(the pre-transformation state, then the transformed frame) for a series of
+single-column transformations, and measures the memory held by:
+
+- legacy: the previous MemoryDataStore behaviour, one full DataFrame copy per
+  version (plus empty placeholder frames)
+- shared: MemoryDataStore with column-sharing VersionHistory
+
+Memory is traced with tracemalloc, which includes numpy buffers. Save time is
+measured in a separate untraced run, since tracing slows allocations down.
+
+Usage (from the server directory):
+    python benchmark_version_store.py --rows 500000 --columns 20 --transformations 10
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from agents.dataclean.memory_store import MemoryDataStore
+
+
+class LegacyVersionStore:
+    """The previous save_data_version/get_data_version storage."""
+
+    def __init__(self):
+        self.memory_versions: Dict[str, List[pd.DataFrame]] = {}
+
+    async def save_data_version(self, artifact_id: str, version: int, dataframe: pd.DataFrame) -> bool:
+        versions = self.memory_versions.setdefault(artifact_id, [])
+        while len(versions) <= version:
+            versions.append(pd.DataFrame())
+        versions[version] = dataframe.copy()
+        return True
+
+    async def get_data_version(self, artifact_id: str, version: int):
+        versions = self.memory_versions.get(artifact_id, [])
+        return versions[version].copy() if 0 <= version < len(versions) else None
+
+
+def build_frame(rows: int, columns: int) -> pd.DataFrame:
+    """Build a frame of numeric measurements plus a few text columns."""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.normal(size=(rows, columns - 2)), columns=[f"m{i}" for i in range(columns - 2)])
+    df["sample"] = [f"S{i:07d}" for i in range(rows)]
+    df["condition"] = rng.choice(["control", "Control", "treated"], rows)
+    return df
+
+
+def transform(df: pd.DataFrame, step: int) -> pd.DataFrame:
+    """A single-column transformation, like the engine's replace/convert/fill actions."""
+    result = df.copy()
+    if step % 3 == 0:
+        result["condition"] = result["condition"].str.lower()
+    else:
+        column = f"m{step % (df.shape[1] - 2)}"
+        result[column] = result[column].round(2)
+    return result
+
+
+async def replay(store, df: pd.DataFrame, transformations: int) -> float:
+    """Apply transformations, saving versions like apply_transformation; returns seconds."""
+    start = time.perf_counter()
+    current = df
+    for step in range(1, transformations + 1):
+        await store.save_data_version("artifact", step - 1, current)
+        current = transform(current, step)
+        await store.save_data_version("artifact", step, current)
+    return time.perf_counter() - start
+
+
+async def measure(name: str, store_factory, df: pd.DataFrame, transformations: int) -> dict:
+    """Replay against a store, timing it and measuring the memory it keeps."""
+    seconds = await replay(store_factory(), df, transformations)
+
+    store = store_factory()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await replay(store, df, transformations)
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    restored = await store.get_data_version("artifact", 1)
+    get_ms = (time.perf_counter() - start) * 1000
+    assert restored is not None and restored.shape == df.shape
+    return {"name": name, "held": held, "seconds": seconds, "get_ms": get_ms}
+
+
+async def main_async(args) -> None:
+    df = build_frame(args.rows, args.columns)
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    versions = args.transformations + 1
+
+    print("🗂️ Data Version Store Memory Benchmark")
+    print("=" * 50)
+    print(f"frame: {args.rows} rows x {args.columns} columns ({frame_mb:.1f} MB), "
+          f"{args.transformations} transformations, {versions} versions")
+    print()
+
+    shared_stores = []
+
+    def shared_store():
+        shared_stores.append(MemoryDataStore())
+        return shared_stores[-1]
+
+    for name, factory in (("legacy", LegacyVersionStore), ("shared", shared_store)):
+        r = await measure(name, factory, df, args.transformations)
+        print(f"  {name:<7} held={r['held'] / 1024 ** 2:8.1f} MB   "
+              f"per version={r['held'] / versions / 1024 ** 2:7.1f} MB   "
+              f"save time={r['seconds']:5.2f} s   get_data_version={r['get_ms']:6.1f} ms")
+
+    stats = await shared_stores[-1].get_storage_stats()
+    print(f"\nget_storage_stats: versions_memory_bytes={stats['versions_memory_bytes'] / 1024 ** 2:.1f} MB, "
+          f"versions_full_copy_bytes={stats['versions_full_copy_bytes'] / 1024 ** 2:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=20, help="Number of columns")
+    parser.add_argument("--transformations", type=int, default=10, help="Transformations to apply")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
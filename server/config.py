@@ -89,6 +89,40 @@ class Settings(BaseSettings):
         default=".csv,.xlsx,.xls,.png,.jpg,.jpeg,.pdf",
         description="Allowed file types for upload"
     )
+    upload_chunk_bytes: int = Field(
+        default=1024 * 1024,  # 1MB
+        description="Chunk size for copying uploads to disk"
+    )
+    encoding_sniff_bytes: int = Field(
+        default=64 * 1024,  # 64KB
+        description="Bytes from the start of a CSV file used to detect its encoding and dialect"
+    )
+    csv_chunk_rows: int = Field(
+        default=100000,
+        description="Rows parsed at a time when ingesting CSV files"
+    )
+    excel_engine: str = Field(
+        default="auto",
+        description="Excel reader: 'auto' (calamine when python-calamine is installed), 'default' (openpyxl/xlrd) or 'calamine'"
+    )
+    excel_max_workers: int = Field(
+        default=4,
+        description="Worker processes reading the sheets of a workbook in parallel (1 for sequential)"
+    )
+    
+    # OCR Configuration
+    ocr_workers: int = Field(
+        default=2,
+        description="OCR worker processes, each with its own copy of the EasyOCR model"
+    )
+    ocr_queue_size: int = Field(
+        default=32,
+        description="Images that can wait for an OCR worker before uploads are turned away"
+    )
+    ocr_timeout: float = Field(
+        default=120.0,
+        description="Time limit for OCR on one image (seconds)"
+    )
     
     # Temporary Storage
     temp_dir: str = Field(
@@ -96,6 +130,38 @@ class Settings(BaseSettings):
         description="Temporary directory for file processing"
     )
     
+    # Data Store Configuration
+    datastore_backend: str = Field(
+        default="memory",
+        description="Data store backend: 'memory' (per process) or 'sqlite' (persistent, shared by workers)"
+    )
+    datastore_path: str = Field(
+        default="./database/datastore",
+        description="Directory of the sqlite data store (database plus frame files)"
+    )
+    datastore_max_memory_mb: int = Field(
+        default=2048,
+        description="Memory budget for stored DataFrames and versions (MB, 0 for unbounded)"
+    )
+    datastore_spill_dir: str = Field(
+        default="",
+        description="Directory for DataFrames and versions spilled from memory (default: temp_dir/scioscribe_datastore)"
+    )
+    
+    # Transformation Configuration
+    transformation_max_workers: int = Field(
+        default=4,
+        description="Worker threads applying the independent column transformations of a batch (1 for sequential)"
+    )
+    transformation_engine: str = Field(
+        default="pandas",
+        description="Engine for transformation batches: 'pandas' or 'polars' (lazy, multithreaded; needs polars)"
+    )
+    lazy_engine_min_rows: int = Field(
+        default=1000000,
+        description="Minimum rows for a transformation batch to run on the polars engine"
+    )
+    
     # LangGraph Configuration
     max_execution_time: int = Field(
         default=300,
@@ -106,6 +172,50 @@ class Settings(BaseSettings):
         description="Maximum iterations for agent loops"
     )
     
+    # Data Quality Agent Configuration
+    quality_concurrent_analysis: bool = Field(
+        default=True,
+        description="Run independent data quality LLM calls concurrently"
+    )
+    quality_max_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent LLM calls per data quality analysis"
+    )
+    quality_llm_timeout: float = Field(
+        default=30.0,
+        description="Timeout for each data quality check or suggestion call (seconds)"
+    )
+    quality_suggestion_batch_size: int = Field(
+        default=10,
+        description="Quality issues per suggestion LLM call (1 requests each suggestion separately)"
+    )
+    quality_sample_rows: int = Field(
+        default=1000,
+        description="Rows sampled from an uploaded file for background quality analysis"
+    )
+    
+    # LLM Response Cache Configuration
+    llm_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse responses to identical low-temperature LLM requests"
+    )
+    llm_cache_max_temperature: float = Field(
+        default=0.3,
+        description="Highest request temperature whose OpenAI responses are cached"
+    )
+    llm_cache_ttl_seconds: int = Field(
+        default=24 * 60 * 60,
+        description="Age after which cached LLM responses expire (seconds)"
+    )
+    llm_cache_max_entries: int = Field(
+        default=512,
+        description="Responses kept in the in-memory LLM cache tier"
+    )
+    llm_cache_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for the persistent LLM cache tier (default: temp_dir/scioscribe_llm_cache.sqlite, empty for memory only)"
+    )
+    
     # Logging Configuration
     log_level: str = Field(
         default="INFO",
@@ -136,6 +246,79 @@ class Settings(BaseSettings):
             raise ValueError('Max tokens must be positive')
         return v
     
+    @field_validator('quality_max_concurrency')
+    def validate_quality_max_concurrency(cls, v):
+        """Validate quality agent concurrency is positive."""
+        if v <= 0:
+            raise ValueError('Quality agent concurrency must be positive')
+        return v
+    
+    @field_validator('quality_suggestion_batch_size')
+    def validate_quality_suggestion_batch_size(cls, v):
+        """Validate suggestion batch size is positive."""
+        if v <= 0:
+            raise ValueError('Suggestion batch size must be positive')
+        return v
+    
+    @field_validator('quality_sample_rows')
+    def validate_quality_sample_rows(cls, v):
+        """Validate quality analysis sample size is positive."""
+        if v <= 0:
+            raise ValueError('Quality sample size must be positive')
+        return v
+    
+    @field_validator('upload_chunk_bytes', 'encoding_sniff_bytes', 'csv_chunk_rows')
+    def validate_ingest_chunk_sizes(cls, v):
+        """Validate ingestion chunk sizes are positive."""
+        if v <= 0:
+            raise ValueError('Ingestion chunk sizes must be positive')
+        return v
+    
+    @field_validator('excel_engine')
+    def validate_excel_engine(cls, v):
+        """Validate Excel reader engine is supported."""
+        valid_engines = {'auto', 'default', 'calamine'}
+        if v.lower() not in valid_engines:
+            raise ValueError(f'Excel engine must be one of: {valid_engines}')
+        return v.lower()
+    
+    @field_validator('excel_max_workers')
+    def validate_excel_workers(cls, v):
+        """Validate Excel worker count is positive."""
+        if v <= 0:
+            raise ValueError('Excel worker count must be positive')
+        return v
+    
+    @field_validator('ocr_workers', 'ocr_queue_size', 'ocr_timeout')
+    def validate_ocr_settings(cls, v):
+        """Validate OCR worker count, queue size and timeout are positive."""
+        if v <= 0:
+            raise ValueError('OCR worker count, queue size and timeout must be positive')
+        return v
+    
+    @field_validator('transformation_max_workers')
+    def validate_transformation_max_workers(cls, v):
+        """Validate transformation worker count is positive."""
+        if v <= 0:
+            raise ValueError('Transformation worker count must be positive')
+        return v
+    
+    @field_validator('transformation_engine')
+    def validate_transformation_engine(cls, v):
+        """Validate transformation engine is supported."""
+        valid_engines = {'pandas', 'polars'}
+        if v.lower() not in valid_engines:
+            raise ValueError(f'Transformation engine must be one of: {valid_engines}')
+        return v.lower()
+    
+    @field_validator('datastore_backend')
+    def validate_datastore_backend(cls, v):
+        """Validate data store backend is supported."""
+        valid_backends = {'memory', 'sqlite'}
+        if v.lower() not in valid_backends:
+            raise ValueError(f'Data store backend must be one of: {valid_backends}')
+        return v.lower()
+    
     @field_validator('log_level')
     def validate_log_level(cls, v):
         """Validate log level is valid."""
@@ -227,8 +410,7 @@ def get_openai_client():
     
     try:
         from openai import AsyncOpenAI
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
-        return client
+        return AsyncOpenAI(api_key=settings.openai_api_key)
     except Exception as e:
         print(f"Failed to initialize OpenAI client: {e}")
         return None
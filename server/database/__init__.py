@@ -6,6 +6,13 @@ Simple database setup for storing experiments.
 
 from .models import Base, Experiment
 from .database import engine, SessionLocal, get_db, init_db, create_tables, get_session, check_db_connection
+from .repository import (
+    ExperimentRepository,
+    ExperimentNotFoundError,
+    CSVVersionConflictError,
+    NoPendingChangesError,
+    get_experiment_repository
+)
 
 __all__ = [
     "Base",
@@ -16,5 +23,10 @@ __all__ = [
     "init_db",
     "create_tables",
     "get_session",
-    "check_db_connection"
+    "check_db_connection",
+    "ExperimentRepository",
+    "ExperimentNotFoundError",
+    "CSVVersionConflictError",
+    "NoPendingChangesError",
+    "get_experiment_repository"
 ] 
\ No newline at end of file
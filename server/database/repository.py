@@ -0,0 +1,342 @@
+"""
+In-process experiment repository for ScioScribe.
+
+This module provides async access to experiment records for both the API
+routers and the agents running inside the same process, so agents no longer
+call back into the server over HTTP to read or persist CSV data.
+
+All database work runs on a single dedicated worker thread using the shared
+``SessionLocal`` factory. This keeps blocking SQLite I/O off the event loop
+while serializing access to the single pooled connection.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from .database import SessionLocal
+from .models import Experiment
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExperimentNotFoundError(LookupError):
+    """Raised when an experiment does not exist."""
+
+    def __init__(self, experiment_id: str):
+        self.experiment_id = experiment_id
+        super().__init__(f"Experiment with ID {experiment_id} not found")
+
+
+class CSVVersionConflictError(Exception):
+    """Raised when an optimistic-locking CSV version check fails."""
+
+    def __init__(self, expected_version: int, current_version: int):
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(f"Version conflict: expected {expected_version}, current {current_version}")
+
+
+class NoPendingChangesError(Exception):
+    """Raised when accepting or rejecting agent changes that do not exist."""
+
+
+class ExperimentRepository:
+    """
+    Async repository for experiment records.
+
+    Returned Experiment instances are detached from their session and fully
+    loaded, so they can be read safely after the call returns.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        """
+        Initialize the repository.
+
+        Args:
+            session_factory: SQLAlchemy session factory shared with the routers
+        """
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="experiment-repo")
+
+    async def _run(self, operation: Callable[[Session], T]) -> T:
+        """Run a database operation in its own session on the worker thread."""
+        def _execute() -> T:
+            session = self.session_factory()
+            try:
+                result = operation(session)
+                session.commit()
+                return result
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _execute)
+
+    @staticmethod
+    def _detach(session: Session, experiment: Experiment) -> Experiment:
+        """Flush, refresh and detach an experiment so it outlives its session."""
+        session.flush()
+        session.refresh(experiment)
+        session.expunge(experiment)
+        return experiment
+
+    @staticmethod
+    def _get_or_raise(session: Session, experiment_id: str, for_update: bool = False) -> Experiment:
+        """Load an experiment or raise ExperimentNotFoundError."""
+        query = session.query(Experiment).filter(Experiment.id == experiment_id)
+        if for_update:
+            query = query.with_for_update()
+        experiment = query.first()
+        if not experiment:
+            raise ExperimentNotFoundError(experiment_id)
+        return experiment
+
+    # === Read Operations ===
+
+    async def get_experiment(self, experiment_id: str) -> Optional[Experiment]:
+        """
+        Get an experiment by ID.
+
+        Args:
+            experiment_id: ID of the experiment
+
+        Returns:
+            Experiment if found, None otherwise
+        """
+        def _get(session: Session) -> Optional[Experiment]:
+            experiment = session.query(Experiment).filter(Experiment.id == experiment_id).first()
+            if experiment is not None:
+                session.expunge(experiment)
+            return experiment
+
+        return await self._run(_get)
+
+    async def get_csv(self, experiment_id: str) -> Optional[str]:
+        """
+        Get only the CSV data of an experiment.
+
+        Args:
+            experiment_id: ID of the experiment (or conversation session)
+
+        Returns:
+            CSV string if the experiment exists and has data, None otherwise
+        """
+        def _get_csv(session: Session) -> Optional[str]:
+            row = session.query(Experiment.csv_data).filter(Experiment.id == experiment_id).first()
+            return row[0] if row else None
+
+        return await self._run(_get_csv)
+
+    async def list_experiments(self, limit: int = 100, offset: int = 0) -> Tuple[List[Experiment], int]:
+        """
+        List experiments with pagination.
+
+        Args:
+            limit: Maximum number of experiments to return
+            offset: Number of experiments to skip
+
+        Returns:
+            Tuple of (experiments, total count)
+        """
+        def _list(session: Session) -> Tuple[List[Experiment], int]:
+            experiments = session.query(Experiment).offset(offset).limit(limit).all()
+            total_count = session.query(Experiment).count()
+            for experiment in experiments:
+                session.expunge(experiment)
+            return experiments, total_count
+
+        return await self._run(_list)
+
+    async def count_experiments(self) -> int:
+        """Get the total number of experiments."""
+        return await self._run(lambda session: session.query(Experiment).count())
+
+    # === Write Operations ===
+
+    async def create_experiment(self, **fields: Any) -> Experiment:
+        """
+        Create a new experiment.
+
+        Args:
+            **fields: Experiment column values
+
+        Returns:
+            The created experiment
+        """
+        def _create(session: Session) -> Experiment:
+            experiment = Experiment(**fields)
+            session.add(experiment)
+            return self._detach(session, experiment)
+
+        return await self._run(_create)
+
+    async def update_fields(self, experiment_id: str, **fields: Any) -> Experiment:
+        """
+        Update plain fields of an experiment (plan, HTML, title, ...).
+
+        Args:
+            experiment_id: ID of the experiment
+            **fields: Column values to set
+
+        Returns:
+            The updated experiment
+
+        Raises:
+            ExperimentNotFoundError: If the experiment does not exist
+        """
+        def _update(session: Session) -> Experiment:
+            experiment = self._get_or_raise(session, experiment_id)
+            for name, value in fields.items():
+                setattr(experiment, name, value)
+            experiment.updated_at = datetime.now()
+            return self._detach(session, experiment)
+
+        return await self._run(_update)
+
+    async def update_csv(
+        self,
+        experiment_id: str,
+        csv_data: str,
+        is_agent_update: bool = False,
+        expected_version: Optional[int] = None
+    ) -> Experiment:
+        """
+        Update the CSV data of an experiment with version control.
+
+        Agent updates keep the previous CSV so the user can accept or reject them.
+
+        Args:
+            experiment_id: ID of the experiment
+            csv_data: New CSV data
+            is_agent_update: Whether the update comes from an AI agent
+            expected_version: Expected CSV version for optimistic locking
+
+        Returns:
+            The updated experiment
+
+        Raises:
+            ExperimentNotFoundError: If the experiment does not exist
+            CSVVersionConflictError: If expected_version does not match
+        """
+        def _update_csv(session: Session) -> Experiment:
+            experiment = self._get_or_raise(session, experiment_id, for_update=True)
+
+            # Version check for optimistic locking
+            if expected_version is not None and expected_version != experiment.csv_version:
+                raise CSVVersionConflictError(expected_version, experiment.csv_version)
+
+            # Backup current state for agent updates
+            if is_agent_update:
+                experiment.previous_csv = experiment.csv_data
+                experiment.agent_modified_at = datetime.now()
+                experiment.modification_source = 'agent'
+            else:
+                experiment.modification_source = 'user'
+
+            experiment.csv_data = csv_data
+            experiment.csv_version += 1
+            experiment.updated_at = datetime.now()
+            return self._detach(session, experiment)
+
+        experiment = await self._run(_update_csv)
+        logger.info(f"Updated CSV data for experiment: {experiment_id} (version: {experiment.csv_version}, source: {experiment.modification_source})")
+        return experiment
+
+    async def accept_or_reject_csv_changes(self, experiment_id: str, accept: bool) -> Experiment:
+        """
+        Accept or reject pending agent CSV changes.
+
+        Args:
+            experiment_id: ID of the experiment
+            accept: True to keep the agent changes, False to restore the previous CSV
+
+        Returns:
+            The updated experiment
+
+        Raises:
+            ExperimentNotFoundError: If the experiment does not exist
+            NoPendingChangesError: If there are no agent changes to review
+        """
+        def _accept_reject(session: Session) -> Experiment:
+            experiment = self._get_or_raise(session, experiment_id, for_update=True)
+
+            if not experiment.previous_csv:
+                raise NoPendingChangesError("No pending changes to accept or reject")
+
+            if not accept:
+                # Reject changes: restore previous version
+                experiment.csv_data = experiment.previous_csv
+                experiment.csv_version += 1
+
+            experiment.previous_csv = None
+            experiment.modification_source = 'user'
+            experiment.updated_at = datetime.now()
+            return self._detach(session, experiment)
+
+        return await self._run(_accept_reject)
+
+    async def save_cleaned_csv(self, session_id: str, cleaned_csv: str) -> Experiment:
+        """
+        Create or update the experiment record holding a session's cleaned CSV.
+
+        Args:
+            session_id: Conversation session ID, used as the experiment ID
+            cleaned_csv: Cleaned CSV data
+
+        Returns:
+            The created or updated experiment
+        """
+        def _save(session: Session) -> Experiment:
+            experiment = session.query(Experiment).filter(Experiment.id == session_id).first()
+            if not experiment:
+                # Create new experiment record for this session
+                experiment = Experiment(
+                    id=session_id,
+                    title=f"Cleaned Data Session {session_id}",
+                    description="Data cleaning session with applied transformations",
+                    csv_data=cleaned_csv
+                )
+                session.add(experiment)
+            else:
+                experiment.csv_data = cleaned_csv
+                experiment.updated_at = datetime.now()
+            return self._detach(session, experiment)
+
+        return await self._run(_save)
+
+    async def delete_experiment(self, experiment_id: str) -> None:
+        """
+        Delete an experiment.
+
+        Args:
+            experiment_id: ID of the experiment
+
+        Raises:
+            ExperimentNotFoundError: If the experiment does not exist
+        """
+        def _delete(session: Session) -> None:
+            session.delete(self._get_or_raise(session, experiment_id))
+
+        await self._run(_delete)
+
+
+# Global instance
+_experiment_repository = None
+
+
+def get_experiment_repository() -> ExperimentRepository:
+    """Get the global experiment repository instance."""
+    global _experiment_repository
+    if _experiment_repository is None:
+        _experiment_repository = ExperimentRepository()
+    return _experiment_repository
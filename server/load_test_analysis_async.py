@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Load test for the async analysis pipeline.
+
+Runs N concurrent visualization requests against AnalysisAgent with a stubbed
+LLM that sleeps to simulate network latency, and compares the blocking path
+(generate_visualization called from a coroutine, as the API used to do) with
+agenerate_visualization. While requests run, a heartbeat task measures how
+long the event loop is blocked, which is what other HTTP/WebSocket clients
+would see.
+
+Usage (from the server directory):
+    python load_test_analysis_async.py --concurrency 8 --llm-latency 0.3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from agents.analysis.agent import AnalysisAgent
+
+CSV_DATA = "temperature,yield,catalyst\n" + "".join(
+    f"{20 + i % 40},{(i * 7) % 100 / 10:.1f},{'ABC'[i % 3]}\n" for i in range(2000)
+)
+EXPERIMENT_PLAN = "Study the effect of temperature and catalyst on reaction yield."
+
+
+class SleepingLLM:
+    """Stand-in for the chat model: blocks like a real HTTP call, returns nothing useful."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, messages, **kwargs):
+        time.sleep(self.latency)
+        return SimpleNamespace(content="{}")
+
+
+def build_agent(latency: float) -> AnalysisAgent:
+    """Build an AnalysisAgent around the stub LLM without touching any provider."""
+    agent = AnalysisAgent.__new__(AnalysisAgent)
+    agent.model_provider = "stub"
+    agent.model_name = "sleeping-llm"
+    agent.llm = SleepingLLM(latency)
+    agent._init_nodes()
+    agent.graph = agent._build_graph()
+    return agent
+
+
+async def heartbeat(stop: asyncio.Event, interval: float, lags: list):
+    """Record how late each tick fires; lateness is time the loop was blocked."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run_scenario(name: str, agent: AnalysisAgent, concurrency: int, use_async: bool):
+    """Run concurrent requests and report wall time and event loop lag."""
+    async def one_request(i: int):
+        if use_async:
+            return await agent.agenerate_visualization(f"Plot yield vs temperature ({i})", EXPERIMENT_PLAN, CSV_DATA)
+        return agent.generate_visualization(f"Plot yield vs temperature ({i})", EXPERIMENT_PLAN, CSV_DATA)
+
+    stop = asyncio.Event()
+    lags = []
+    monitor = asyncio.create_task(heartbeat(stop, 0.01, lags))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+
+    print(f"\n{name}:")
+    print(f"  wall time:          {elapsed:8.2f} s for {concurrency} requests")
+    print(f"  event loop lag p50: {statistics.median(lags):8.1f} ms")
+    print(f"  event loop lag max: {max(lags):8.1f} ms")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent requests")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Simulated seconds per LLM call")
+    args = parser.parse_args()
+
+    print("⚡ Analysis Pipeline Load Test")
+    print("=" * 50)
+
+    agent = build_agent(args.llm_latency)
+    blocking = await run_scenario("Blocking (graph.invoke on the event loop)", agent, args.concurrency, use_async=False)
+    concurrent = await run_scenario("Async (graph.ainvoke with node executors)", agent, args.concurrency, use_async=True)
+
+    print(f"\nSpeedup: {blocking / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,6 +5,7 @@ This is the entry point for the ScioScribe backend API, including
 experiment planning, data cleaning, analysis, and other AI agent functionality.
 """
 
+import asyncio
 import logging
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -87,8 +88,30 @@ async def startup_event():
         logger.error(f"Database startup error: {e}")
         logger.warning("Server starting without database - some features may not work")
 
+    # Warm up the analysis sandbox workers in the background
+    try:
+        from agents.analysis.sandbox_pool import get_sandbox_pool
+        get_sandbox_pool()
+    except Exception as e:
+        logger.warning(f"Sandbox worker pool not started: {e}")
+
     logger.info("=== ScioScribe API server startup complete ===")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release worker pools on application shutdown."""
+    from agents.analysis.executors import shutdown_node_executors
+    from agents.analysis.sandbox_pool import shutdown_sandbox_pool
+    from agents.dataclean.excel_ingest import shutdown_pool as shutdown_excel_pool
+    from agents.dataclean.ocr_service import get_ocr_service
+    from agents.dataclean.transformation_engine import shutdown_transformation_executor
+    shutdown_node_executors(wait=False)
+    shutdown_sandbox_pool()
+    shutdown_excel_pool(wait=False)
+    shutdown_transformation_executor(wait=False)
+    await get_ocr_service().shutdown()
+    logger.info("=== ScioScribe API server shutdown complete ===")
+
 @app.get("/")
 async def root():
     """Root endpoint for health check."""
@@ -107,8 +130,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    from agents.llm_cache import get_llm_cache
+    # The stats count the SQLite tier's rows, so they are read off the event loop
     return {
-        "status": "healthy"
+        "status": "healthy",
+        "llm_cache": await asyncio.to_thread(lambda: get_llm_cache().get_stats())
     }
 
 # Global exception handler